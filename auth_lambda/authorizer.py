@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+API Gateway TOKEN authorizer for application sessions
+Expects "Authorization: Bearer <session_id>.<session_token>" as returned by
+the auth callback, and passes the session's userId to the backend Lambdas in
+the authorizer context. Verified sessions are cached per warm container
+until shortly before they expire, so most requests don't touch DynamoDB.
+"""
+
+import os
+import hmac
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from handler import hash_token, sessions_table
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuration from environment
+SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', '1024'))
+# Cached sessions are dropped this many seconds before they expire
+SESSION_CACHE_MARGIN = int(os.environ.get('SESSION_CACHE_MARGIN', '60'))
+# ... and at most this long after they were cached, so a deleted (revoked)
+# session stops working in warm containers within this time
+SESSION_CACHE_TTL = int(os.environ.get('SESSION_CACHE_TTL', '300'))
+
+
+class SessionCache:
+    """Least-recently-used verified sessions by session_id: (token_hash, user_id, expires_at)"""
+    
+    def __init__(self, size: int, margin: int, ttl: int):
+        self.size = size
+        self.margin = margin
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+    
+    def get(self, session_id: str) -> Optional[Tuple[str, str, int]]:
+        entry = self.entries.get(session_id)
+        if entry is None:
+            return None
+        session, valid_until = entry
+        if time.time() >= valid_until:
+            del self.entries[session_id]
+            return None
+        self.entries.move_to_end(session_id)
+        return session
+    
+    def put(self, session_id: str, token_hash: str, user_id: str, expires_at: int) -> None:
+        valid_until = min(expires_at - self.margin, time.time() + self.ttl)
+        self.entries[session_id] = ((token_hash, user_id, expires_at), valid_until)
+        self.entries.move_to_end(session_id)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+
+session_cache = SessionCache(SESSION_CACHE_SIZE, SESSION_CACHE_MARGIN, SESSION_CACHE_TTL)
+
+
+def parse_token(authorization: str) -> Optional[Tuple[str, str]]:
+    """(session_id, session_token) from the Authorization header, or None"""
+    scheme, _, credentials = (authorization or '').partition(' ')
+    session_id, _, session_token = credentials.strip().partition('.')
+    if scheme.lower() != 'bearer' or not session_id or not session_token:
+        return None
+    return session_id, session_token
+
+
+def load_session(session_id: str) -> Optional[Tuple[str, str, int]]:
+    """(token_hash, user_id, expires_at) of an unexpired session, or None"""
+    cached = session_cache.get(session_id)
+    if cached:
+        return cached
+    
+    item = sessions_table.get_item(
+        Key={'session_id': session_id},
+        ProjectionExpression='token_hash, user_id, expires_at'
+    ).get('Item')
+    # TTL deletes lag expiry, so expired items may still be returned
+    if not item or int(item['expires_at']) <= time.time():
+        return None
+    
+    session = (item['token_hash'], item['user_id'], int(item['expires_at']))
+    session_cache.put(session_id, *session)
+    return session
+
+
+def verify_session(session_id: str, session_token: str) -> Optional[str]:
+    """userId of the session if the token matches, else None"""
+    session = load_session(session_id)
+    if not session:
+        return None
+    
+    token_hash, user_id, _ = session
+    if not hmac.compare_digest(hash_token(session_token), token_hash):
+        return None
+    return user_id
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Allow the request with userId in context, or reject it with 401"""
+    credentials = parse_token(event.get('authorizationToken', ''))
+    user_id = verify_session(*credentials) if credentials else None
+    if not user_id:
+        logger.info("Rejected request with invalid or expired session")
+        # API Gateway maps this exact message to 401
+        raise Exception('Unauthorized')
+    
+    return {
+        'principalId': user_id,
+        'policyDocument': {
+            'Version': '2012-10-17',
+            'Statement': [{
+                'Action': 'execute-api:Invoke',
+                'Effect': 'Allow',
+                'Resource': api_resource(event['methodArn'])
+            }]
+        },
+        'context': {'userId': user_id}
+    }
+
+
+def api_resource(method_arn: str) -> str:
+    """Every method of the stage, so API Gateway's own policy cache applies across routes"""
+    # arn:aws:execute-api:region:account:api-id/stage/METHOD/path
+    api_arn, _, path = method_arn.partition('/')
+    stage = path.split('/')[0]
+    return f"{api_arn}/{stage}/*"
@@ -8,11 +8,14 @@ import logging
 from typing import Dict, Any, Optional
 from botocore.exceptions import ClientError
 
+from user_store import SCHEMA_VERSION
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Constants
+# Expired sessions are removed by DynamoDB TTL on expires_at (and optionally session_sweeper.py)
 SESSION_EXPIRY_HOURS = 24
 SESSION_EXPIRY_SECONDS = SESSION_EXPIRY_HOURS * 60 * 60
 
@@ -43,32 +46,6 @@ def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
-def cleanup_expired_sessions(user_id: str, current_time: int) -> None:
-    """Remove expired sessions for a user."""
-    try:
-        # Query for user's sessions
-        response = sessions_table.query(
-            IndexName='user-id-index',  # Assuming this GSI exists
-            KeyConditionExpression='user_id = :user_id',
-            FilterExpression='expires_at < :current_time',
-            ExpressionAttributeValues={
-                ':user_id': user_id,
-                ':current_time': current_time
-            }
-        )
-        
-        # Delete expired sessions
-        for item in response.get('Items', []):
-            sessions_table.delete_item(
-                Key={'session_id': item['session_id']}
-            )
-            logger.info(f"Deleted expired session: {item['session_id']}")
-            
-    except ClientError as e:
-        logger.warning(f"Session cleanup failed for user {user_id}: {e}")
-        # Don't fail the auth process if cleanup fails
-
-
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Handle OAuth callback and create user session.
@@ -91,56 +68,29 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Create or update user in database
         now = int(time.time())
         
-        try:
-            # Try to update existing user (preserve created_at and preferences)
-            users_table.update_item(
-                Key={'user_id': user_id},
-                UpdateExpression='SET email = :email, #name = :name, last_login = :last_login',
-                ExpressionAttributeNames={'#name': 'name'},  # 'name' is a reserved keyword
-                ExpressionAttributeValues={
-                    ':email': email,
-                    ':name': name,
-                    ':last_login': now
-                }
-            )
+        # One upsert creates or updates the user; createdAt and preferences are only set on create
+        response = users_table.update_item(
+            Key={'userId': user_id},
+            UpdateExpression=(
+                'SET email = :email, #name = :name, lastLogin = :last_login, '
+                'createdAt = if_not_exists(createdAt, :last_login), '
+                'preferences = if_not_exists(preferences, :preferences), '
+                'schemaVersion = if_not_exists(schemaVersion, :schema)'
+            ),
+            ExpressionAttributeNames={'#name': 'name'},  # 'name' is a reserved keyword
+            ExpressionAttributeValues={
+                ':email': email,
+                ':name': name,
+                ':last_login': now,
+                ':preferences': {},
+                ':schema': SCHEMA_VERSION
+            },
+            ReturnValues='UPDATED_OLD'
+        )
+        if response.get('Attributes'):
             logger.info(f"Updated existing user: {user_id}")
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ValidationException':
-                # User doesn't exist, create new one
-                try:
-                    users_table.put_item(
-                        Item={
-                            'user_id': user_id,
-                            'email': email,
-                            'name': name,
-                            'created_at': now,
-                            'last_login': now,
-                            'preferences': {}
-                        },
-                        ConditionExpression='attribute_not_exists(user_id)'
-                    )
-                    logger.info(f"Created new user: {user_id}")
-                except ClientError as ce:
-                    if ce.response['Error']['Code'] == 'ConditionalCheckFailedException':
-                        # Race condition: user was created between update and put
-                        logger.info(f"User created concurrently, updating: {user_id}")
-                        users_table.update_item(
-                            Key={'user_id': user_id},
-                            UpdateExpression='SET email = :email, #name = :name, last_login = :last_login',
-                            ExpressionAttributeNames={'#name': 'name'},
-                            ExpressionAttributeValues={
-                                ':email': email,
-                                ':name': name,
-                                ':last_login': now
-                            }
-                        )
-                    else:
-                        raise ce
-            else:
-                raise e
-
-        # Clean up expired sessions for this user
-        cleanup_expired_sessions(user_id, now)
+        else:
+            logger.info(f"Created new user: {user_id}")
         
         # Create session
         session_id = secrets.token_urlsafe(32)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Background cleanup of expired sessions
+DynamoDB TTL on expires_at deletes expired sessions for free, but can lag
+by a day or two; run this on a schedule (e.g. EventBridge rate(1 hour)) to
+delete them sooner with batched writes, off the login path
+"""
+
+import os
+import boto3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE', 'codelearn-sessions-dev')
+
+# Configuration from environment
+# Scan segments swept concurrently (one thread each); raise for large tables
+SWEEP_SEGMENTS = int(os.environ.get('SWEEP_SEGMENTS', '1'))
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Delete sessions whose expires_at has passed"""
+    now = int(time.time())
+    
+    with ThreadPoolExecutor(max_workers=SWEEP_SEGMENTS) as pool:
+        deleted = sum(pool.map(lambda segment: sweep_segment(now, segment), range(SWEEP_SEGMENTS)))
+    
+    print(f"Swept {deleted} expired sessions")
+    return {'deleted': deleted}
+
+
+def sweep_segment(now: int, segment: int) -> int:
+    """Delete the expired sessions in one scan segment"""
+    # Resources aren't thread-safe, so each segment gets its own session
+    sessions_table = boto3.session.Session().resource('dynamodb').Table(SESSIONS_TABLE)
+    return delete_sessions(sessions_table, list_expired_sessions(sessions_table, now, segment))
+
+
+def list_expired_sessions(sessions_table: Any, now: int, segment: int) -> List[str]:
+    """Session ids in one scan segment that expired before now"""
+    scan_params = {
+        'Segment': segment,
+        'TotalSegments': SWEEP_SEGMENTS,
+        'ProjectionExpression': 'session_id',
+        'FilterExpression': 'expires_at < :now',
+        'ExpressionAttributeValues': {':now': now}
+    }
+    session_ids = []
+    
+    while True:
+        response = sessions_table.scan(**scan_params)
+        session_ids.extend(item['session_id'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return session_ids
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def delete_sessions(sessions_table: Any, session_ids: List[str]) -> int:
+    """Delete sessions with BatchWriteItem (25 per request, unprocessed items retried)"""
+    with sessions_table.batch_writer() as batch:
+        for session_id in session_ids:
+            batch.delete_item(Key={'session_id': session_id})
+    
+    return len(session_ids)
@@ -117,6 +117,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'lesson': lesson_content.get('lesson', ''),
                 'challenge': lesson_content.get('challenge', ''),
                 'tests': lesson_content.get('tests', []),
+                'runner': lesson_content.get('runner', 'pytest'),
                 'cached': was_cached
             })
         }
@@ -124,8 +124,7 @@ fresh_install() {
         --attribute-definitions AttributeName=lessonKey,AttributeType=S \
         --key-schema AttributeName=lessonKey,KeyType=HASH \
         --billing-mode PAY_PER_REQUEST \
-        --time-to-live-specification Enabled=true,AttributeName=ttl \
-        --region $AWS_REGION > /dev/null 2>&1
+        --region $AWS_REGION > /dev/null
     
     aws dynamodb create-table \
         --table-name $USERS_TABLE \
@@ -137,18 +136,31 @@ fresh_install() {
     
     aws dynamodb create-table \
         --table-name $PROGRESS_TABLE \
-        --attribute-definitions AttributeName=userId,AttributeType=S AttributeName=lessonId,AttributeType=S \
+        --attribute-definitions AttributeName=userId,AttributeType=S AttributeName=lessonId,AttributeType=S AttributeName=completedAt,AttributeType=N \
         --key-schema AttributeName=userId,KeyType=HASH AttributeName=lessonId,KeyType=RANGE \
+        --global-secondary-indexes '[{"IndexName":"CompletedIndex","KeySchema":[{"AttributeName":"userId","KeyType":"HASH"},{"AttributeName":"completedAt","KeyType":"RANGE"}],"Projection":{"ProjectionType":"INCLUDE","NonKeyAttributes":["topic","language","status","completed","attempts","firstAttemptSuccess"]}}]' \
         --billing-mode PAY_PER_REQUEST \
         --region $AWS_REGION > /dev/null 2>&1
     
     aws dynamodb create-table \
         --table-name $SESSIONS_TABLE \
-        --attribute-definitions AttributeName=sessionId,AttributeType=S \
-        --key-schema AttributeName=sessionId,KeyType=HASH \
-        --time-to-live-specification Enabled=true,AttributeName=expiresAt \
+        --attribute-definitions AttributeName=session_id,AttributeType=S \
+        --key-schema AttributeName=session_id,KeyType=HASH \
         --billing-mode PAY_PER_REQUEST \
-        --region $AWS_REGION > /dev/null 2>&1
+        --region $AWS_REGION > /dev/null
+    
+    # create-table can't enable TTL; it is set once the tables are active. TTL is
+    # the only cleanup of expired sessions (session_sweeper.py is optional)
+    aws dynamodb wait table-exists --table-name $LESSON_CACHE_TABLE --region $AWS_REGION
+    aws dynamodb update-time-to-live \
+        --table-name $LESSON_CACHE_TABLE \
+        --time-to-live-specification Enabled=true,AttributeName=ttl \
+        --region $AWS_REGION > /dev/null
+    aws dynamodb wait table-exists --table-name $SESSIONS_TABLE --region $AWS_REGION
+    aws dynamodb update-time-to-live \
+        --table-name $SESSIONS_TABLE \
+        --time-to-live-specification Enabled=true,AttributeName=expires_at \
+        --region $AWS_REGION > /dev/null
     
     print_success "DynamoDB tables created"
     
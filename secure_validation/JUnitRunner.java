@@ -0,0 +1,307 @@
+import java.io.File;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.file.DirectoryStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.security.MessageDigest;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.HexFormat;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import javax.tools.Diagnostic;
+import javax.tools.DiagnosticCollector;
+import javax.tools.FileObject;
+import javax.tools.ForwardingJavaFileManager;
+import javax.tools.JavaCompiler;
+import javax.tools.JavaFileManager;
+import javax.tools.JavaFileObject;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.ToolProvider;
+import org.junit.runner.Description;
+import org.junit.runner.JUnitCore;
+import org.junit.runner.notification.Failure;
+import org.junit.runner.notification.RunListener;
+
+/**
+ * JUnit runner for one submission, started by java_runner.py
+ *
+ * Usage: java JUnitRunner <TestClass>[,<TestClass>...] [harness cache dirs]
+ * Every *.java file in the working directory is compiled in-process with
+ * javac, the test classes run in a class loader of their own, and the
+ * result is the last line on stdout:
+ * {"test_results": [{"name": ..., "passed": ..., "error": ...}]}
+ *
+ * Compiled test classes are looked up in the harness cache dirs (separated
+ * by ':'), keyed by a hash of the test sources and the JVM version. On a hit
+ * only the student's sources are compiled; if the cached classes don't link
+ * against this solution (LinkageError) everything is compiled from source
+ * instead. On a miss the result says "harness_missing": true.
+ *
+ * This runner never writes to the cache. java_runner.py builds harnesses in
+ * a sandbox of their own, where no student code runs:
+ *     java JUnitRunner --build-harness <TestClass>[,<TestClass>...] <outdir>
+ * compiles every source but copies only the classes generated from the test
+ * sources to outdir, and prints the harness key.
+ */
+public class JUnitRunner {
+
+    static final int MAX_ERROR_LENGTH = 1000;
+
+    public static void main(String[] args) throws Exception {
+        PrintStream protocol = System.out;
+        // Student output must never corrupt the result line
+        PrintStream discard = new PrintStream(OutputStream.nullOutputStream());
+        System.setOut(discard);
+        System.setErr(discard);
+
+        Path workdir = Paths.get("").toAbsolutePath();
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        if (args[0].equals("--build-harness")) {
+            protocol.println(buildHarness(compiler, workdir, args[1].split(","), Paths.get(args[2])));
+            protocol.flush();
+            return;
+        }
+
+        List<Path> cacheRoots = new ArrayList<>();
+        if (args.length > 1) {
+            for (String root : args[1].split(File.pathSeparator)) {
+                if (!root.isEmpty()) {
+                    cacheRoots.add(Paths.get(root));
+                }
+            }
+        }
+        protocol.println(run(compiler, workdir, args[0].split(","), cacheRoots));
+        protocol.flush();
+        // Threads the tests left running must not keep the JVM alive
+        Runtime.getRuntime().halt(0);
+    }
+
+    static String run(JavaCompiler compiler, Path workdir, String[] testClasses, List<Path> cacheRoots) {
+        try {
+            Path harness = findHarness(cacheRoots, harnessKey(workdir, testClasses));
+
+            if (harness != null) {
+                Path classes = Files.createDirectories(workdir.resolve("solution-classes"));
+                String compileError = compile(compiler, workdir, classes, List.of(testClasses), harness, null);
+                if (compileError != null) {
+                    return results(List.of(result("compilation_error", false, compileError)));
+                }
+                List<String> results = runTests(testClasses, classes, harness);
+                if (results != null) {
+                    return results(results);
+                }
+            }
+
+            Path classes = Files.createDirectories(workdir.resolve("classes"));
+            String compileError = compile(compiler, workdir, classes, List.of(), null, null);
+            if (compileError != null) {
+                return results(List.of(result("compilation_error", false, compileError)));
+            }
+
+            List<String> results = runTests(testClasses, classes, null);
+            return results(results, harness == null && !cacheRoots.isEmpty());
+        } catch (Throwable e) {
+            return results(List.of(result("execution_error", false, e.toString())));
+        }
+    }
+
+    static Path findHarness(List<Path> cacheRoots, String key) {
+        for (Path root : cacheRoots) {
+            if (Files.isDirectory(root.resolve(key))) {
+                return root.resolve(key);
+            }
+        }
+        return null;
+    }
+
+    /** Copy the classes compiled from the test sources to outdir and return their key */
+    static String buildHarness(JavaCompiler compiler, Path workdir, String[] testClasses, Path outdir)
+            throws Exception {
+        Path classes = Files.createDirectories(workdir.resolve("classes"));
+        Map<String, String> sourceOf = new HashMap<>();
+        String compileError = compile(compiler, workdir, classes, List.of(), null, sourceOf);
+        if (compileError != null) {
+            throw new IllegalStateException(compileError);
+        }
+
+        List<String> testSources = new ArrayList<>();
+        for (String testClass : testClasses) {
+            testSources.add(testClass + ".java");
+        }
+        Files.createDirectories(outdir);
+        for (Map.Entry<String, String> output : sourceOf.entrySet()) {
+            // Nested and anonymous classes (Outer$Inner) share their top-level class's source
+            String className = output.getKey();
+            if (testSources.contains(output.getValue()) && !className.contains(".")) {
+                Files.copy(classes.resolve(className + ".class"), outdir.resolve(className + ".class"));
+            }
+        }
+        return harnessKey(workdir, testClasses);
+    }
+
+    /** Results for every test class, or null if cached harness classes failed to link */
+    static List<String> runTests(String[] testClasses, Path classes, Path harness) throws Exception {
+        URL[] urls = harness == null
+            ? new URL[] {classes.toUri().toURL()}
+            : new URL[] {classes.toUri().toURL(), harness.toUri().toURL()};
+
+        List<String> results = new ArrayList<>();
+        List<Throwable> errors = new ArrayList<>();
+        try (URLClassLoader loader = new URLClassLoader(urls, JUnitRunner.class.getClassLoader())) {
+            for (String testClass : testClasses) {
+                results.addAll(runTestClass(loader.loadClass(testClass), errors));
+            }
+        } catch (LinkageError e) {
+            if (harness != null) {
+                return null;
+            }
+            throw e;
+        }
+
+        if (harness != null && errors.stream().anyMatch(e -> e instanceof LinkageError)) {
+            return null;
+        }
+        return results;
+    }
+
+    /** Compile workdir's sources; sourceOf, if given, maps each generated class to its source file name */
+    static String compile(JavaCompiler compiler, Path workdir, Path classes, List<String> skipClasses,
+                          Path harness, Map<String, String> sourceOf) throws Exception {
+        List<File> sources = new ArrayList<>();
+        try (DirectoryStream<Path> files = Files.newDirectoryStream(workdir, "*.java")) {
+            for (Path file : files) {
+                String className = file.getFileName().toString().replace(".java", "");
+                if (!skipClasses.contains(className)) {
+                    sources.add(file.toFile());
+                }
+            }
+        }
+
+        String classpath = System.getProperty("java.class.path");
+        if (harness != null) {
+            classpath += File.pathSeparator + harness;
+        }
+
+        DiagnosticCollector<JavaFileObject> diagnostics = new DiagnosticCollector<>();
+        try (StandardJavaFileManager fileManager = compiler.getStandardFileManager(diagnostics, null, null)) {
+            JavaFileManager outputs = new ForwardingJavaFileManager<JavaFileManager>(fileManager) {
+                @Override
+                public JavaFileObject getJavaFileForOutput(Location location, String className,
+                                                           JavaFileObject.Kind kind, FileObject sibling)
+                        throws IOException {
+                    if (sourceOf != null && sibling != null) {
+                        sourceOf.put(className, new File(sibling.getName()).getName());
+                    }
+                    return super.getJavaFileForOutput(location, className, kind, sibling);
+                }
+            };
+            // -proc:none: nothing on the classpath runs during compilation
+            List<String> options = Arrays.asList(
+                "-d", classes.toString(), "-cp", classpath, "-nowarn", "-proc:none");
+            boolean compiled = compiler.getTask(null, outputs, diagnostics, options, null,
+                fileManager.getJavaFileObjectsFromFiles(sources)).call();
+            if (compiled) {
+                return null;
+            }
+        }
+
+        for (Diagnostic<? extends JavaFileObject> diagnostic : diagnostics.getDiagnostics()) {
+            if (diagnostic.getKind() == Diagnostic.Kind.ERROR) {
+                String source = diagnostic.getSource() == null ? "" : new File(diagnostic.getSource().getName()).getName();
+                return source + ":" + diagnostic.getLineNumber() + ": " + diagnostic.getMessage(null);
+            }
+        }
+        return "Compilation failed";
+    }
+
+    /** Cache key: the test sources plus the JVM that compiled them */
+    static String harnessKey(Path workdir, String[] testClasses) throws Exception {
+        MessageDigest digest = MessageDigest.getInstance("SHA-256");
+        digest.update(System.getProperty("java.vm.version").getBytes());
+        String[] sorted = testClasses.clone();
+        Arrays.sort(sorted);
+        for (String testClass : sorted) {
+            digest.update(testClass.getBytes());
+            digest.update(Files.readAllBytes(workdir.resolve(testClass + ".java")));
+        }
+        return HexFormat.of().formatHex(digest.digest()).substring(0, 32);
+    }
+
+    static List<String> runTestClass(Class<?> testClass, List<Throwable> errors) {
+        Map<String, String> outcomes = new LinkedHashMap<>();
+        JUnitCore junit = new JUnitCore();
+        junit.addListener(new RunListener() {
+            @Override
+            public void testStarted(Description description) {
+                outcomes.put(testName(description), null);
+            }
+
+            @Override
+            public void testFailure(Failure failure) {
+                errors.add(failure.getException());
+                String message = failure.getMessage();
+                outcomes.put(testName(failure.getDescription()),
+                    message == null ? failure.getException().getClass().getSimpleName() : message);
+            }
+        });
+        junit.run(testClass);
+
+        List<String> results = new ArrayList<>();
+        for (Map.Entry<String, String> outcome : outcomes.entrySet()) {
+            results.add(result(outcome.getKey(), outcome.getValue() == null, outcome.getValue()));
+        }
+        return results;
+    }
+
+    static String testName(Description description) {
+        // Class-level failures (e.g. no runnable methods) have no method name
+        String method = description.getMethodName();
+        return method == null ? description.getDisplayName() : method;
+    }
+
+    static String results(List<String> results) {
+        return results(results, false);
+    }
+
+    static String results(List<String> results, boolean harnessMissing) {
+        return "{\"test_results\": [" + String.join(", ", results) + "]"
+            + (harnessMissing ? ", \"harness_missing\": true" : "") + "}";
+    }
+
+    static String result(String name, boolean passed, String error) {
+        // Keeps each reply line small however large the failure message is
+        if (error != null && error.length() > MAX_ERROR_LENGTH) {
+            error = error.substring(0, MAX_ERROR_LENGTH);
+        }
+        return "{\"name\": " + quote(name) + ", \"passed\": " + passed
+            + ", \"error\": " + (error == null ? "null" : quote(error)) + "}";
+    }
+
+    static String quote(String value) {
+        StringBuilder quoted = new StringBuilder("\"");
+        for (char c : value.toCharArray()) {
+            switch (c) {
+                case '"': quoted.append("\\\""); break;
+                case '\\': quoted.append("\\\\"); break;
+                case '\n': quoted.append("\\n"); break;
+                case '\r': quoted.append("\\r"); break;
+                case '\t': quoted.append("\\t"); break;
+                default:
+                    if (c < 0x20) {
+                        quoted.append(String.format("\\u%04x", (int) c));
+                    } else {
+                        quoted.append(c);
+                    }
+            }
+        }
+        return quoted.append('"').toString();
+    }
+}
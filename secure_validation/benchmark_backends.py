@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark execution backends on the same submission
+Usage: python3 benchmark_backends.py [runs] [backend ...]
+Backends are those in validation_lambda/execution_backends.py; the remote
+ones need the same environment as the validation Lambda (bucket, project,
+cluster) and AWS credentials
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'validation_lambda'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import execution_backends
+from benchmark_validation import SAMPLE_INPUT
+
+
+def benchmark(backend: execution_backends.ExecutionBackend, runs: int) -> list:
+    """Time end-to-end execution on one backend, returning seconds per run"""
+    timings = []
+    
+    for run in range(runs):
+        execution_id = f"benchmark_{backend.name}_{int(time.time())}_{run}"
+        execution_data = dict(SAMPLE_INPUT, language='python', runner='pytest', knownPassing=[])
+        
+        start = time.perf_counter()
+        results = backend.execute(execution_id, execution_data)
+        timings.append(time.perf_counter() - start)
+        
+        if not all(r.get('passed') for r in results):
+            print(f"⚠️  {backend.name}: unexpected failures {results}")
+    
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    names = sys.argv[2:] or ['local']
+    
+    print(f"Backend benchmark ({runs} runs per backend)")
+    print("=" * 50)
+    
+    for name in names:
+        timings = sorted(benchmark(execution_backends.BACKENDS[name], runs))
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<12} mean {statistics.mean(timings):6.2f}s  "
+              f"p50 {statistics.median(timings):6.2f}s  "
+              f"p95 {p95:6.2f}s")
+    
+    # What 'auto' routing would pick after these runs
+    print(f"Fastest: {min(names, key=execution_backends.router.latency.get)}")
+
+
+if __name__ == '__main__':
+    main()
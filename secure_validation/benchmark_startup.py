@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark container startup: time from process start to first test result
+Usage: python3 benchmark_startup.py [runs]
+Run inside the validator image; every stage starts a fresh interpreter, as
+a new container (or a subprocess-mode test) does
+"""
+
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from benchmark_validation import SAMPLE_INPUT
+from validator_script import encode_payload
+
+HOT_MODULES = ['boto3', 'botocore', 'pytest', '_pytest', 'pluggy', 'pytest_jsonreport']
+
+
+def time_command(command: list, env: dict, runs: int) -> list:
+    """Seconds per run of command in a fresh process"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def missing_bytecode() -> list:
+    """Hot modules that would be compiled from source on every start"""
+    missing = []
+    for name in HOT_MODULES:
+        spec = importlib.util.find_spec(name)
+        if spec and spec.origin and spec.origin.endswith('.py'):
+            if not os.path.exists(importlib.util.cache_from_source(spec.origin)):
+                missing.append(name)
+    return missing
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'test_startup.py')
+        with open(test_file, 'w') as f:
+            f.write('def test_startup():\n    assert True\n')
+        
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+        validator_env = dict(env, EXECUTION_ID='startup-benchmark', S3_BUCKET='unused',
+                             EXECUTION_PAYLOAD=encode_payload(SAMPLE_INPUT),
+                             RESULTS_EXPORT_FILE=os.path.join(tmpdir, 'results.b64'))
+        
+        stages = [
+            ('interpreter', [sys.executable, '-c', 'pass'], env),
+            ('import boto3', [sys.executable, '-c', 'import boto3; boto3.client("s3")'], env),
+            ('pytest 1 test', [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', test_file], env),
+            ('validator run', [sys.executable, 'validator_script.py'], validator_env)
+        ]
+        
+        print(f"Startup benchmark ({runs} runs per stage)")
+        print("=" * 50)
+        
+        for name, command, stage_env in stages:
+            timings = sorted(time_command(command, stage_env, runs))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{name:<14} mean {statistics.mean(timings) * 1000:7.1f}ms  "
+                  f"p50 {statistics.median(timings) * 1000:7.1f}ms  "
+                  f"p95 {p95 * 1000:7.1f}ms")
+    
+    missing = missing_bytecode()
+    if missing:
+        print(f"⚠️  No precompiled bytecode for: {', '.join(missing)}")
+
+
+if __name__ == '__main__':
+    main()
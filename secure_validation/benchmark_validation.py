@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark validator execution modes on the same submission
+Usage: python3 benchmark_validation.py [runs]
+Run inside the validator image so timings reflect the container
+"""
+
+import os
+import statistics
+import sys
+import time
+
+# validator_script creates its S3 client at import time, and only preloads
+# the fork server when started in that mode
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['EXECUTION_MODE'] = 'forkserver'
+
+import validator_script
+
+SAMPLE_INPUT = {
+    'code': 'def count_vowels(text):\n    return sum(1 for c in text.lower() if c in "aeiou")\n',
+    'tests': [
+        "def test_basic_vowel_count():\n    assert count_vowels('hello') == 2\n    assert count_vowels('PYTHON') == 1",
+        "def test_empty_string():\n    assert count_vowels('') == 0\n    assert count_vowels('xyz') == 0",
+        "def test_mixed_case():\n    assert count_vowels('AeIoU') == 5\n    assert count_vowels('tEst') == 1"
+    ]
+}
+
+
+def benchmark(mode: str, runs: int) -> list:
+    """Time run_validation in one execution mode, returning seconds per run"""
+    validator_script.EXECUTION_MODE = mode
+    timings = []
+    
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = validator_script.run_validation(SAMPLE_INPUT)
+        timings.append(time.perf_counter() - start)
+        
+        if not all(r['passed'] for r in results['test_results']):
+            print(f"⚠️  {mode}: unexpected failures {results['test_results']}")
+    
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    
+    print(f"Validator benchmark ({runs} runs per mode)")
+    print("=" * 50)
+    
+    for mode in ['subprocess', 'forkserver']:
+        timings = sorted(benchmark(mode, runs))
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{mode:<12} mean {statistics.mean(timings) * 1000:7.1f}ms  "
+              f"p50 {statistics.median(timings) * 1000:7.1f}ms  "
+              f"p95 {p95 * 1000:7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Fork-server test execution for the validator container
+pytest and the result collector are imported once, in a server process
+started by preload(); each submission runs in a resource-limited child
+forked from it instead of paying interpreter startup, plugin discovery
+and pytest import on every run.
+
+The server is a separate process, started with exec and a minimal
+environment so its children never see the validator's payloads or
+credentials. It never starts a thread, so its children can't inherit a
+lock (logging, imports, malloc) held by another thread at fork time.
+Worker threads send it requests over a Unix socket, accepted only from
+the validator's own user; closing the connection kills the child. Each
+child drops to its submission's uid (see sandbox.py) before running tests.
+
+A forked child starts with the parent's memory mapped (and counted in
+its RSS and wait4 ru_maxrss), so it reports its own peak as the growth of
+VmHWM over the RSS it had at fork.
+"""
+
+import importlib
+import json
+import os
+import select
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+from typing import Dict, Any, List, Optional
+
+import pytest
+from _pytest.config import default_plugins
+
+import simple_runner
+from limited_process import usage_from_rusage, OutputLimitExceeded, OUTPUT_LIMIT_BYTES
+from resource_limits import apply_child_limits, drop_privileges, prctl, PR_SET_DUMPABLE
+
+# cacheprovider would write .pytest_cache into the submission tmpdir
+PYTEST_ARGS = ['-q', '-p', 'no:cacheprovider', '--tb=short']
+
+
+class ResultCollector:
+    """Lightweight pytest plugin replacing pytest-json-report"""
+    
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+    
+    def pytest_collectreport(self, report) -> None:
+        if report.failed:
+            # Keep only the 'E   ...' lines; the traceback is pytest internals
+            lines = [l for l in report.longreprtext.splitlines() if l.startswith('E ')]
+            self.results.append({
+                'name': 'collection_error',
+                'passed': False,
+                'error': '\n'.join(lines) or report.longreprtext
+            })
+    
+    def pytest_runtest_logreport(self, report) -> None:
+        # One entry per test: the call phase, or setup when setup itself failed
+        if report.when == 'call' or (report.when == 'setup' and not report.passed):
+            self.results.append({
+                'name': report.nodeid.split('::')[-1],
+                'passed': report.passed,
+                'error': report.longreprtext if report.failed else None
+            })
+
+
+# Everything the server and its children see; nothing from the validator's environment
+SERVER_ENV = {
+    'PATH': os.environ.get('PATH', ''),
+    'PYTHONDONTWRITEBYTECODE': '1',
+    'PYTEST_DISABLE_PLUGIN_AUTOLOAD': '1'
+}
+
+
+def preload() -> None:
+    """Start the fork server ahead of the first submission"""
+    start()
+
+
+_address: Optional[str] = None
+_server: Optional[subprocess.Popen] = None
+
+
+def start() -> None:
+    """Start the server process that forks the test children"""
+    global _address, _server
+    address = f'\0codelearn-fork-server-{os.getpid()}'  # Abstract namespace: no file
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(address)
+    listener.listen(64)
+    # The server exits when the validator does and this pipe reaches EOF
+    lifeline_read, lifeline_write = os.pipe()
+    
+    try:
+        _server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), str(listener.fileno()), str(lifeline_read)],
+            env=SERVER_ENV,
+            stdin=subprocess.DEVNULL,
+            pass_fds=(listener.fileno(), lifeline_read)
+        )
+    finally:
+        os.close(lifeline_read)
+        listener.close()
+    _address = address
+
+
+def run_tests(tmpdir: str, test_file: str, timeout: int = 30,
+              runner: str = 'pytest', uid: Optional[int] = None) -> Dict[str, Any]:
+    """Run a test file in a forked child, as uid if given; raises TimeoutError past the deadline
+    
+    Returns {'test_results': [...], 'usage': {...}} like the subprocess runners.
+    Safe to call from any thread.
+    """
+    started = time.monotonic()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(_address)
+        request = {'tmpdir': tmpdir, 'test_file': test_file, 'runner': runner, 'timeout': timeout,
+                   'uid': uid}
+        conn.sendall(json.dumps(request).encode() + b'\n')
+        # Leaving the block closes the connection, which kills a child still running
+        output = _read_until(conn.fileno(), started + timeout)
+    
+    if output is None:
+        raise TimeoutError('Test execution timeout')
+    
+    # One JSON message per line: the child's results (if it got that far),
+    # then the server's accounting once it has reaped the child
+    messages = {}
+    for line in output.splitlines():
+        messages.update(json.loads(line))
+    
+    usage = {
+        'cpu_seconds': messages.get('cpu_seconds', 0),
+        'peak_rss_kb': messages.get('peak_rss_kb'),
+        'wall_seconds': round(time.monotonic() - started, 3)
+    }
+    if 'test_results' not in messages:
+        # Child was killed (rlimit, crash) before reporting
+        return {
+            'test_results': [{
+                'name': 'execution_error',
+                'passed': False,
+                'error': 'Test process terminated unexpectedly'
+            }],
+            'usage': usage
+        }
+    return {'test_results': messages['test_results'], 'usage': usage}
+
+
+def _serve(listener: socket.socket, lifeline_fd: int) -> None:
+    """Server loop: fork a child per request and report its CPU time; never returns"""
+    try:
+        # SIGCHLD wakes select through this pipe, so children are reaped at once
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        signal.alarm(0)
+        
+        children: Dict[int, socket.socket] = {}
+        while True:
+            connections = {conn.fileno(): pid for pid, conn in children.items()}
+            ready, _, _ = select.select([listener, lifeline_fd, wakeup_read] + list(connections), [], [])
+            
+            if lifeline_fd in ready:
+                for pid in children:
+                    os.kill(pid, signal.SIGKILL)
+                return
+            
+            if wakeup_read in ready:
+                os.read(wakeup_read, 4096)
+            
+            if listener in ready:
+                conn, _ = listener.accept()
+                if peer_uid(conn) != os.getuid():
+                    # Abstract sockets have no permissions; student code could connect too
+                    conn.close()
+                else:
+                    request = json.loads(conn.makefile('rb').readline())
+                    pid = os.fork()
+                    if pid == 0:
+                        _run_child(request['tmpdir'], request['test_file'], conn.fileno(),
+                                   request['runner'], request['timeout'], request['uid'])
+                    children[pid] = conn
+            
+            # The worker closed its end (deadline or output limit): stop the test
+            for fd in ready:
+                if fd in connections and connections[fd] in children:
+                    os.kill(connections[fd], signal.SIGKILL)
+            
+            _reap(children)
+    finally:
+        os._exit(0)
+
+
+def peer_uid(conn: socket.socket) -> int:
+    """uid of the process at the other end of a Unix socket"""
+    credentials = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    return struct.unpack('3i', credentials)[1]
+
+
+def _reap(children: Dict[int, socket.socket]) -> None:
+    """Send each exited child's CPU time to its worker and close the connection"""
+    while children:
+        pid, _, rusage = os.wait4(-1, os.WNOHANG)
+        if not pid:
+            return
+        conn = children.pop(pid)
+        try:
+            # Not peak RSS: this process's memory is inherited too (see module docstring)
+            cpu = usage_from_rusage(rusage, 0)['cpu_seconds']
+            conn.sendall(json.dumps({'cpu_seconds': cpu}).encode() + b'\n')
+        except OSError:
+            pass  # Worker already gave up on it
+        conn.close()
+
+
+def _run_child(tmpdir: str, test_file: str, write_fd: int, runner: str, timeout: int,
+               uid: Optional[int]) -> None:
+    """Child side of the fork; never returns"""
+    status = 1
+    try:
+        baseline_kb = start_peak_tracking()
+        # Keep only the connection to the worker: the listener and other
+        # workers' connections would otherwise stay open until this child exits
+        os.closerange(3, write_fd)
+        os.closerange(write_fd + 1, os.sysconf('SC_OPEN_MAX'))
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.chdir(tmpdir)
+        sys.path.insert(0, tmpdir)
+        sys.dont_write_bytecode = True
+        os.environ.update({'HOME': tmpdir, 'TMPDIR': tmpdir})
+        apply_child_limits(cpu_seconds=timeout)
+        if uid is not None:
+            drop_privileges(uid)
+            # Changing uid made this process non-dumpable; its own /proc entries
+            # (and those of no other submission) become readable to it again
+            prctl(PR_SET_DUMPABLE, 1)
+        
+        # Student output must not corrupt the result stream or the container log
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        
+        if runner == 'simple':
+            results = simple_runner.run_tests(test_file, timeout)
+        else:
+            collector = ResultCollector()
+            pytest.main([test_file, '--rootdir', tmpdir] + PYTEST_ARGS, plugins=[collector])
+            results = collector.results
+        
+        with os.fdopen(write_fd, 'w') as f:
+            f.write(json.dumps({'test_results': results, 'peak_rss_kb': peak_growth_kb(baseline_kb)}) + '\n')
+        status = 0
+    finally:
+        os._exit(status)
+
+
+def start_peak_tracking() -> int:
+    """Reset this process's VmHWM to its current RSS and return that RSS in KB"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass  # VmHWM then still starts at the RSS inherited with the fork
+    return proc_status_kb('VmRSS')
+
+
+def peak_growth_kb(baseline_kb: int) -> int:
+    """Peak RSS above the baseline: what this child allocated itself"""
+    return max(0, proc_status_kb('VmHWM') - baseline_kb)
+
+
+def proc_status_kb(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1])
+    return 0
+
+
+def _read_until(fd: int, deadline: float, limit: int = OUTPUT_LIMIT_BYTES):
+    """Read the connection to EOF, or return None if the deadline passes
+    
+    Raises OutputLimitExceeded once more than limit bytes have arrived.
+    """
+    chunks = []
+    received = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            return None
+        
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b''.join(chunks).decode()
+        received += len(chunk)
+        if received > limit:
+            raise OutputLimitExceeded(f'Output exceeded {limit} bytes')
+        chunks.append(chunk)
+
+
+def main():
+    """Server entry point (see start()): import pytest's built-in plugins, then serve"""
+    listener_fd, lifeline_fd = int(sys.argv[1]), int(sys.argv[2])
+    for name in default_plugins:
+        importlib.import_module(f'_pytest.{name}')
+    _serve(socket.socket(fileno=listener_fd), lifeline_fd)
+
+
+if __name__ == '__main__':
+    main()
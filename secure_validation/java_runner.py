@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+JUnit runner for Java lessons
+Each submission gets a JVM of its own running JUnitRunner, which compiles
+the solution and tests with javac in-process and runs them. It runs like
+the other test processes: under run_limited's rlimits and timeout, as the
+submission's uid, with a minimal environment. The JVM's own reservations
+are capped so it starts under the address-space limit.
+
+Compiled test classes (harnesses) are shared through HARNESS_CACHE_DIR.
+Student JVMs only read it; on a miss the validator compiles the harness
+again in a sandbox of its own, where no student code runs, keeps only the
+classes generated from the test sources and publishes them itself.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import sandbox
+from limited_process import run_limited
+
+JUNIT_CLASSPATH = os.environ.get(
+    'JUNIT_CLASSPATH', '/usr/share/java/junit4.jar:/usr/share/java/hamcrest-core.jar'
+)
+# Compiled from JUnitRunner.java at image build time
+RUNNER_CLASSES = os.environ.get('JAVA_RUNNER_CLASSES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'java'))
+# Heap, class space, code cache and metaspace sized to fit JVM_MEMORY_BYTES;
+# the defaults reserve over 1GB of address space before main() runs
+JVM_OPTIONS = ['-Xmx192m', '-XX:CompressedClassSpaceSize=64m', '-XX:ReservedCodeCacheSize=32m',
+               '-XX:MaxMetaspaceSize=128m', '-Xss512k', '-XX:+UseSerialGC', '-XX:TieredStopAtLevel=1',
+               '-XX:-UsePerfData', '-Xshare:auto']
+JVM_MEMORY_BYTES = 1024 * 1024 * 1024
+# Class data sharing archive written at image build (Dockerfile); without it,
+# or if it doesn't match this JVM, classes are loaded from the jars as usual
+CDS_ARCHIVE = os.path.join(RUNNER_CLASSES, 'runner.jsa')
+# Compiled test classes keyed by test source hash + JVM version. Per container
+# by default; point it at a shared mount (see README) so containers share it.
+# Only used when submissions run as uids of their own, which can't write it
+HARNESS_CACHE_DIR = os.environ.get('HARNESS_CACHE_DIR', '/tmp/harness-cache')
+HARNESS_KEY_PATTERN = re.compile(r'[0-9a-f]{32}')
+# Compile-time constants are copied into the classes that use them, so a
+# harness built against a solution declaring any would keep its values
+CONSTANT_PATTERN = re.compile(r'\bstatic\s+final\b|\bfinal\s+static\b|\binterface\b')
+
+CLASS_PATTERN = re.compile(r'(?<![.\w])class\s+(\w+)')
+PUBLIC_CLASS_PATTERN = re.compile(r'\bpublic\s+(?:final\s+|abstract\s+)*class\s+(\w+)')
+# Lesson tests are sometimes written without semicolons after imports
+IMPORT_PATTERN = re.compile(r'^(\s*import\s+(?:static\s+)?[\w.]+(?:\.\*)?)\s*$', re.MULTILINE)
+IMPORT_LINE_PATTERN = re.compile(r'^\s*import\s+[^\n]*$\n?', re.MULTILINE)
+# Bare lesson test methods ("public void testX() {...}") get @Test like Rust tests get #[test]
+TEST_METHOD_PATTERN = re.compile(r'^(\s*)((?:public\s+)?void\s+test\w*\s*\()', re.MULTILINE)
+# Removed before counting braces, so braces in strings and comments don't count
+LITERAL_PATTERN = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])+\'|//[^\n]*|/\*.*?\*/', re.DOTALL)
+JUNIT_IMPORTS = 'import org.junit.Test;\nimport static org.junit.Assert.*;\n'
+
+
+def run_tests(tmpdir: str, code: str, tests: List[str], timeout: int = 30,
+              uid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compile the solution and JUnit test classes in a new JVM and run them; raises TimeoutError"""
+    started = time.monotonic()
+    solution_class, solution_source, wrapped = build_solution(code)
+    write_source(tmpdir, solution_class, solution_source)
+    
+    test_sources = build_test_classes(tests, solution_class if wrapped else None)
+    for class_name, source in test_sources.items():
+        write_source(tmpdir, class_name, source)
+    
+    cache_dir = trusted_cache_dir()
+    try:
+        result, usage = run_jvm(tmpdir, [','.join(test_sources), cache_dir or ''], timeout, uid)
+    except subprocess.TimeoutExpired:
+        raise TimeoutError('Java tests timed out')
+    
+    reply = parse_reply(result)
+    usage['wall_seconds'] = round(time.monotonic() - started, 3)
+    for test in reply['test_results']:
+        test['usage'] = usage
+    
+    if reply.get('harness_missing') and cache_dir and not CONSTANT_PATTERN.search(LITERAL_PATTERN.sub('', code)):
+        publish_harness(solution_class, solution_source, test_sources, timeout)
+    return reply['test_results']
+
+
+def run_jvm(workdir: str, args: List[str], timeout: float,
+            uid: Optional[int]) -> Tuple[subprocess.CompletedProcess, Dict[str, Any]]:
+    """Run JUnitRunner in workdir with args, under run_limited"""
+    return run_limited(
+        ['java'] + JVM_OPTIONS + class_data_options()
+        + ['-Djava.io.tmpdir=' + workdir, '-cp', f'{RUNNER_CLASSES}:{JUNIT_CLASSPATH}', 'JUnitRunner'] + args,
+        cwd=workdir,
+        env={'HOME': workdir, 'TMPDIR': workdir, 'PATH': os.environ.get('PATH', ''),
+             'MALLOC_ARENA_MAX': '2'},  # glibc reserves 64MB per thread arena otherwise
+        timeout=timeout,
+        memory_bytes=JVM_MEMORY_BYTES,
+        uid=uid
+    )
+
+
+def class_data_options() -> List[str]:
+    """Use the image's class data sharing archive, if it has one"""
+    return ['-XX:SharedArchiveFile=' + CDS_ARCHIVE] if os.path.exists(CDS_ARCHIVE) else []
+
+
+def parse_reply(result: subprocess.CompletedProcess) -> Dict[str, Any]:
+    """JUnitRunner's last stdout line, or an error result saying why the JVM gave none"""
+    lines = result.stdout.strip().splitlines()
+    try:
+        reply = json.loads(lines[-1]) if lines else None
+    except ValueError:
+        reply = None
+    if isinstance(reply, dict) and isinstance(reply.get('test_results'), list):
+        return reply
+    
+    # e.g. the JVM couldn't reserve memory, or the process was killed
+    errors = result.stderr.strip().splitlines()
+    error = errors[0][:200] if errors else 'Test JVM exited unexpectedly'
+    return {'test_results': [{'name': 'execution_error', 'passed': False, 'error': error}]}
+
+
+def trusted_cache_dir() -> Optional[str]:
+    """HARNESS_CACHE_DIR, when submissions can read but not write it"""
+    if not sandbox.enabled():
+        return None  # Student code runs as the validator's own user
+    try:
+        os.makedirs(HARNESS_CACHE_DIR, mode=0o755, exist_ok=True)
+        info = os.stat(HARNESS_CACHE_DIR)
+    except OSError:
+        return None
+    # A directory created first by a submission's uid would let it plant harnesses
+    if info.st_uid != os.geteuid() or info.st_mode & 0o022:
+        return None
+    return HARNESS_CACHE_DIR
+
+
+def publish_harness(solution_class: str, solution_source: str, test_sources: Dict[str, str],
+                    timeout: float) -> None:
+    """Compile the lesson's harness in a fresh sandbox and add it to the cache, never raising"""
+    try:
+        with sandbox.Sandbox() as build:
+            write_source(build.path, solution_class, solution_source)
+            for class_name, source in test_sources.items():
+                write_source(build.path, class_name, source)
+            
+            outdir = os.path.join(build.path, 'harness')
+            result, _ = run_jvm(build.path, ['--build-harness', ','.join(test_sources), outdir], timeout, build.uid)
+            lines = result.stdout.strip().splitlines()
+            if result.returncode != 0 or not lines or not HARNESS_KEY_PATTERN.fullmatch(lines[-1]):
+                return
+            
+            # Staged next to its final name, so the rename is atomic on a shared mount too
+            staging = tempfile.mkdtemp(prefix='staging-', dir=HARNESS_CACHE_DIR)
+            try:
+                for name in os.listdir(outdir):
+                    if name.endswith('.class'):
+                        shutil.copyfile(os.path.join(outdir, name), os.path.join(staging, name))
+                        os.chmod(os.path.join(staging, name), 0o444)
+                os.chmod(staging, 0o555)
+                os.rename(staging, os.path.join(HARNESS_CACHE_DIR, lines[-1]))
+            except OSError:
+                # Another worker or container published the same harness first
+                shutil.rmtree(staging, ignore_errors=True)
+    except Exception as e:
+        print(f"Harness build error: {str(e)}")
+
+
+def build_solution(code: str) -> Tuple[str, str, bool]:
+    """(class name, source, wrapped) for the student's code
+    
+    Beginner lessons ask for bare methods; those are wrapped in a Solution
+    class, which the generated test class then extends so the tests can
+    call them unqualified.
+    """
+    declarations = LITERAL_PATTERN.sub('', code)
+    solution = PUBLIC_CLASS_PATTERN.search(declarations) or CLASS_PATTERN.search(declarations)
+    if solution:
+        return solution.group(1), code, False
+    
+    imports, body = split_imports(code)
+    return 'Solution', f"{imports}public class Solution {{\n{body}\n}}\n", True
+
+
+def build_test_classes(tests: List[str], extends: Optional[str] = None) -> Dict[str, str]:
+    """Java sources by class name for the lesson's test fragments
+    
+    A fragment with a class declaration starts a test class; fragments after
+    it continue that class until its braces balance (lessons split one class
+    across several tests). Bare test methods go in a generated test class.
+    """
+    declared: Dict[str, List[str]] = {}
+    bare: List[str] = []
+    open_class = None
+    
+    for test in tests:
+        match = CLASS_PATTERN.search(LITERAL_PATTERN.sub('', test))
+        if match:
+            open_class = match.group(1)
+            declared[open_class] = [test]
+        elif open_class:
+            declared[open_class].append(test)
+        else:
+            bare.append(test)
+        
+        if open_class and brace_depth('\n'.join(declared[open_class])) <= 0:
+            open_class = None
+    
+    sources = {}
+    for class_name, fragments in declared.items():
+        source = '\n'.join(fragments)
+        source += '\n}' * max(0, brace_depth(source))
+        sources[class_name] = IMPORT_PATTERN.sub(r'\1;', source) + '\n'
+    
+    if bare:
+        class_name = f"{extends or 'Solution'}Test"
+        imports, body = split_imports('\n'.join(
+            test if '@Test' in test else TEST_METHOD_PATTERN.sub(r'\1@Test\n\1\2', test) for test in bare
+        ))
+        superclass = f' extends {extends}' if extends else ''
+        sources[class_name] = (f"{JUNIT_IMPORTS}{imports}public class {class_name}{superclass} {{\n"
+                               f"{body}\n}}\n")
+    
+    return sources
+
+
+def split_imports(source: str) -> Tuple[str, str]:
+    """(import lines, with semicolons, and the rest of source)"""
+    imports = ''.join(IMPORT_PATTERN.sub(r'\1;', line.rstrip()) + '\n'
+                      for line in IMPORT_LINE_PATTERN.findall(source))
+    return imports, IMPORT_LINE_PATTERN.sub('', source)
+
+
+def brace_depth(source: str) -> int:
+    """Unclosed { in source, outside string literals and comments"""
+    code = LITERAL_PATTERN.sub('', source)
+    return code.count('{') - code.count('}')
+
+
+def write_source(tmpdir: str, class_name: str, source: str) -> None:
+    """javac requires a public class to live in <ClassName>.java"""
+    with open(os.path.join(tmpdir, f'{class_name}.java'), 'w') as f:
+        f.write(source)
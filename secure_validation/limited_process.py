@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Run a command under resource_limits and account for what it used
+The launcher reaps the command with os.wait4 and reports its own CPU time
+and peak RSS, which getrusage(RUSAGE_CHILDREN) can't do with parallel
+workers and which, unlike the validator's wait4 on the launcher, doesn't
+include the validator's memory (see resource_limits.py).
+Output is read as it arrives into bounded ring buffers, and a child that
+keeps writing past OUTPUT_LIMIT_BYTES is killed instead of filling memory.
+Result files (pytest-json-report, simple_runner.py) come back over a pipe
+the same way, so they are never left where another submission could read them.
+"""
+
+import json
+import os
+import resource
+import select
+import signal
+import subprocess
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from resource_limits import limited_command, DEFAULT_MEMORY_BYTES, DEFAULT_FILE_BYTES
+
+READ_CHUNK = 65536
+RING_BUFFER_BYTES = 64 * 1024  # Tail of each stream kept for parsing and errors
+OUTPUT_LIMIT_BYTES = 1024 * 1024  # Per stream; more than this kills the child
+# Replaced with the report pipe's path in commands run with report=True
+REPORT_PATH = '{report}'
+
+
+class OutputLimitExceeded(subprocess.SubprocessError):
+    """The child wrote more than the output limit to stdout or stderr"""
+
+
+class RingBuffer:
+    """Keeps the last `size` bytes written and counts everything seen"""
+    
+    def __init__(self, size: int = RING_BUFFER_BYTES):
+        self.size = size
+        self.data = bytearray()
+        self.total = 0
+    
+    def write(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        self.data += chunk
+        if len(self.data) > self.size:
+            del self.data[:len(self.data) - self.size]
+    
+    def text(self) -> str:
+        text = self.data.decode(errors='replace')
+        if self.total > self.size:
+            return f"[{self.total - self.size} bytes truncated]\n" + text
+        return text
+
+
+def run_limited(command: List[str], cwd: str, env: Dict[str, str], timeout: float,
+                memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                file_bytes: int = DEFAULT_FILE_BYTES,
+                output_limit: int = OUTPUT_LIMIT_BYTES,
+                uid: Optional[int] = None,
+                report: bool = False) -> Tuple[subprocess.CompletedProcess, Dict[str, Any]]:
+    """Run command with rlimits (CPU capped at the timeout) and return (result, usage)
+    
+    The command runs as uid when given (see sandbox.py). With report=True,
+    REPORT_PATH in its arguments names a pipe whose contents end up in
+    result.report (None otherwise).
+    Raises subprocess.TimeoutExpired after killing the child, like subprocess.run,
+    and OutputLimitExceeded if it writes more than output_limit bytes to a stream.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    usage_read, usage_write = os.pipe()
+    report_read, report_write = os.pipe() if report else (None, None)
+    if report:
+        # Pipes are 0600; the command must be able to reopen it by path
+        if uid is not None:
+            os.fchown(report_write, uid, uid)
+        command = [arg.replace(REPORT_PATH, f'/dev/fd/{report_write}') for arg in command]
+    report_pipe = os.fdopen(report_read, 'rb') if report else None
+    try:
+        process = subprocess.Popen(
+            limited_command(command, cpu_seconds=max(1, int(timeout)), memory_bytes=memory_bytes,
+                            file_bytes=file_bytes, uid=uid, usage_fd=usage_write),
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            pass_fds=(usage_write,) + ((report_write,) if report else ()),
+            start_new_session=True  # kill() reaches the command behind the launcher
+        )
+    finally:
+        os.close(usage_write)
+        if report:
+            os.close(report_write)
+    
+    try:
+        result, rusage = communicate(process, command, timeout, deadline, output_limit, report_pipe)
+        reported = os.read(usage_read, READ_CHUNK)
+    finally:
+        os.close(usage_read)
+        if report_pipe:
+            report_pipe.close()
+    
+    usage = usage_from_rusage(rusage, time.monotonic() - started)
+    try:
+        usage.update(json.loads(reported))
+    except ValueError:
+        # Launcher died before reporting; its own rusage includes the validator's peak
+        usage['peak_rss_kb'] = None
+    return result, usage
+
+
+def communicate(process: subprocess.Popen, command: List[str], timeout: float, deadline: float,
+                output_limit: int, report_pipe=None) -> Tuple[subprocess.CompletedProcess, resource.struct_rusage]:
+    """Read the child's output (and report) until it exits, then reap it"""
+    output = {process.stdout: RingBuffer(), process.stderr: RingBuffer()}
+    if report_pipe:
+        # Sized to the limit, so a report is never truncated, only rejected
+        output[report_pipe] = RingBuffer(output_limit)
+    open_pipes = list(output)
+    while open_pipes:
+        remaining = deadline - time.monotonic()
+        ready, _, _ = select.select(open_pipes, [], [], max(0, remaining))
+        if not ready:
+            kill(process)
+            raise subprocess.TimeoutExpired(command, timeout)
+        
+        for pipe in ready:
+            chunk = os.read(pipe.fileno(), READ_CHUNK)
+            if chunk:
+                output[pipe].write(chunk)
+                if output[pipe].total > output_limit:
+                    kill(process)
+                    raise OutputLimitExceeded(f'Output exceeded {output_limit} bytes')
+            else:
+                open_pipes.remove(pipe)
+                pipe.close()
+    
+    reaped = wait_until(process, deadline)
+    if reaped is None:
+        # Closed its pipes but kept running
+        kill(process)
+        raise subprocess.TimeoutExpired(command, timeout)
+    
+    status, rusage = reaped
+    process.returncode = os.waitstatus_to_exitcode(status)
+    result = subprocess.CompletedProcess(
+        command, process.returncode, output[process.stdout].text(), output[process.stderr].text()
+    )
+    result.report = output[report_pipe].text() if report_pipe else None
+    return result, rusage
+
+
+def wait_until(process: subprocess.Popen, deadline: float) -> Optional[Tuple[int, resource.struct_rusage]]:
+    """Reap the child with its rusage, or None if it is still running at the deadline"""
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            return status, rusage
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.005)
+
+
+def kill(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+    for pipe in (process.stdout, process.stderr):
+        pipe.close()
+
+
+def usage_from_rusage(rusage: resource.struct_rusage, wall_seconds: float) -> Dict[str, Any]:
+    """Resource usage as reported alongside test results (ru_maxrss is KB on Linux)
+    
+    peak_rss_kb is only meaningful for a process that didn't inherit the
+    validator's memory; callers replace it where that isn't the case.
+    """
+    return {
+        'cpu_seconds': round(rusage.ru_utime + rusage.ru_stime, 3),
+        'peak_rss_kb': rusage.ru_maxrss,
+        'wall_seconds': round(wall_seconds, 3)
+    }
+
+
+def combine_usage(usages: List[Optional[Dict[str, Any]]], wall_seconds: float) -> Dict[str, Any]:
+    """Summary for a whole submission: total CPU, largest peak RSS, elapsed wall time"""
+    # Tests that ran in the same process share one usage dict; count it once
+    usages = list({id(usage): usage for usage in usages if usage}.values())
+    return {
+        'cpu_seconds': round(sum(usage['cpu_seconds'] for usage in usages), 3),
+        'peak_rss_kb': max((usage['peak_rss_kb'] for usage in usages if usage['peak_rss_kb'] is not None),
+                           default=0),
+        'wall_seconds': round(wall_seconds, 3)
+    }
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Resource limits for child processes that run student code
+Applied inside the child (after fork, before tests run) so one submission
+cannot starve the rest of the container
+
+As a script it forks the command under the limits, as uid when that isn't
+-1 (see sandbox.py), which is safe from worker threads where subprocess's
+preexec_fn is not, and reports the command's own CPU time and peak RSS as
+JSON on usage_fd (-1 for none):
+    python3 resource_limits.py <cpu_seconds> <memory_bytes> <file_bytes> <max_processes> <uid> <usage_fd> <command...>
+The command runs in a child of this small launcher rather than replacing
+it, because peak RSS survives exec: a process started by the validator
+would report the validator's own peak.
+"""
+
+import ctypes
+import json
+import os
+import resource
+import signal
+import sys
+from typing import List, Optional
+
+# Defaults sized for the 512MB / 0.25 vCPU validator task
+DEFAULT_CPU_SECONDS = 30
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+DEFAULT_FILE_BYTES = 10 * 1024 * 1024  # Largest file the child may write
+# RLIMIT_NPROC counts every process/thread of the user, not just the child's;
+# matches the nproc ulimit in ecs-task-definition.json and stops fork bombs
+DEFAULT_MAX_PROCESSES = 64
+
+LAUNCHER = os.path.abspath(__file__)
+
+PR_SET_DUMPABLE = 4
+PR_SET_NO_NEW_PRIVS = 38
+
+
+def apply_child_limits(cpu_seconds: int = DEFAULT_CPU_SECONDS,
+                       memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                       file_bytes: int = DEFAULT_FILE_BYTES,
+                       max_processes: int = DEFAULT_MAX_PROCESSES) -> None:
+    """Cap CPU time, address space, file size and process count of the current process"""
+    # Soft limit sends SIGXCPU, hard limit one second later sends SIGKILL
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (file_bytes, file_bytes))
+    resource.setrlimit(resource.RLIMIT_NPROC, (max_processes, max_processes))
+
+
+def drop_privileges(uid: int) -> None:
+    """Become uid (with no supplementary groups) for good"""
+    os.setgroups([])
+    os.setgid(uid)
+    os.setuid(uid)
+    # Setuid binaries and file capabilities can't hand privileges back
+    prctl(PR_SET_NO_NEW_PRIVS, 1)
+
+
+def prctl(option: int, value: int) -> None:
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(option, value, 0, 0, 0) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def limited_command(command: List[str], cpu_seconds: int = DEFAULT_CPU_SECONDS,
+                    memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                    file_bytes: int = DEFAULT_FILE_BYTES,
+                    max_processes: int = DEFAULT_MAX_PROCESSES,
+                    uid: Optional[int] = None,
+                    usage_fd: int = -1) -> List[str]:
+    """Wrap a command so it runs under the given limits, as uid if given"""
+    return [sys.executable, '-S', LAUNCHER, str(cpu_seconds), str(memory_bytes),
+            str(file_bytes), str(max_processes), str(-1 if uid is None else uid), str(usage_fd)] + command
+
+
+def main():
+    cpu_seconds, memory_bytes, file_bytes, max_processes, uid, usage_fd = (int(arg) for arg in sys.argv[1:7])
+    command = sys.argv[7:]
+    
+    pid = os.fork()
+    if pid == 0:
+        try:
+            if usage_fd >= 0:
+                os.close(usage_fd)
+            apply_child_limits(cpu_seconds, memory_bytes, file_bytes, max_processes)
+            if uid >= 0:
+                drop_privileges(uid)
+            os.execvp(command[0], command)
+        finally:
+            os._exit(127)
+    
+    _, status, rusage = os.wait4(pid, 0)
+    if usage_fd >= 0:
+        with os.fdopen(usage_fd, 'w') as f:
+            json.dump({
+                'cpu_seconds': round(rusage.ru_utime + rusage.ru_stime, 3),
+                'peak_rss_kb': rusage.ru_maxrss  # KB on Linux
+            }, f)
+    
+    # Exit the way the command did, so callers see its status or signal
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code < 0:
+        if -exit_code != signal.SIGKILL:
+            signal.signal(-exit_code, signal.SIG_DFL)
+        os.kill(os.getpid(), -exit_code)
+    os._exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Rust test runner for lessons whose tests are plain `fn test_*()` functions
+Lessons only use std, so the crate is compiled with `rustc --test` directly
+(cargo adds startup time and has no dependencies to resolve). Without
+per-submission users, each worker keeps its own incremental cache under
+RUST_CACHE_DIR, so repeat submissions reuse unchanged compiler work. With
+them (see sandbox.py) a cache would be written by one submission's uid and
+trusted by the next, so each build starts cold.
+"""
+
+import os
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from limited_process import run_limited, combine_usage
+
+RUSTC = os.environ.get('RUSTC', 'rustc')
+RUST_CACHE_DIR = os.environ.get('RUST_CACHE_DIR', '/tmp/rust-cache')
+RUST_EDITION = '2021'
+# rustc/LLVM reserve far more address space than the tests themselves, and
+# the test binary (std linked statically) plus incremental files exceed 10MB
+COMPILE_MEMORY_BYTES = 1024 * 1024 * 1024
+COMPILE_FILE_BYTES = 64 * 1024 * 1024
+
+TEST_FN_PATTERN = re.compile(r'^(\s*)fn (test_\w+)', re.MULTILINE)
+RESULT_PATTERN = re.compile(r'^test tests::(\w+) \.\.\. (ok|FAILED)', re.MULTILINE)
+FAILURE_PATTERN = re.compile(r'^---- tests::(\w+) stdout ----\n(.*?)(?=^---- |^failures:$)',
+                             re.MULTILINE | re.DOTALL)
+
+
+def run_tests(tmpdir: str, code: str, tests: List[str], timeout: int = 30,
+              uid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compile the solution with its tests and run them, as uid if given; raises TimeoutError"""
+    started = time.monotonic()
+    deadline = started + timeout
+    source_file = os.path.join(tmpdir, 'solution.rs')
+    binary = os.path.join(tmpdir, 'solution_tests')
+    
+    with open(source_file, 'w') as f:
+        f.write(build_test_crate(code, tests))
+    
+    env = {'HOME': tmpdir, 'TMPDIR': tmpdir, 'PATH': os.environ.get('PATH', '')}
+    incremental = ['-C', f'incremental={worker_cache_dir()}'] if uid is None else []
+    
+    try:
+        compiled, compile_usage = run_limited(
+            [RUSTC, '--test', '--edition', RUST_EDITION, '--crate-name', 'solution']
+            + incremental + ['-C', 'debuginfo=0',
+                             '-o', binary, 'solution.rs'],  # Relative, so errors don't show tmpdir
+            cwd=tmpdir, env=env, timeout=timeout,
+            memory_bytes=COMPILE_MEMORY_BYTES, file_bytes=COMPILE_FILE_BYTES, uid=uid
+        )
+        if compiled.returncode != 0:
+            return [{'name': 'compilation_error', 'passed': False,
+                     'error': first_error(compiled.stderr), 'usage': compile_usage}]
+        
+        result, run_usage = run_limited(
+            [binary, '--test-threads=1'],
+            cwd=tmpdir, env=env, timeout=max(1, deadline - time.monotonic()), uid=uid
+        )
+    except subprocess.TimeoutExpired:
+        raise TimeoutError('Rust tests timed out')
+    
+    # One process pair ran every test, so they all share its usage
+    usage = combine_usage([compile_usage, run_usage], time.monotonic() - started)
+    test_results = parse_test_output(result.stdout)
+    for test in test_results:
+        test['usage'] = usage
+    return test_results
+
+
+def build_test_crate(code: str, tests: List[str]) -> str:
+    """Student code followed by the lesson tests in a #[cfg(test)] module"""
+    test_functions = []
+    for test in tests:
+        if '#[test]' not in test:
+            test = TEST_FN_PATTERN.sub(r'\1#[test]\n\1fn \2', test)
+        test_functions.append(test)
+    
+    return (code + '\n\n#[cfg(test)]\nmod tests {\n    use super::*;\n\n'
+            + '\n\n'.join(test_functions) + '\n}\n')
+
+
+def worker_cache_dir() -> str:
+    """Incremental cache for the calling worker thread, so builds never share one"""
+    cache_dir = os.path.join(RUST_CACHE_DIR, threading.current_thread().name)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def parse_test_output(stdout: str) -> List[Dict[str, Any]]:
+    """Results from libtest's human-readable output"""
+    failures = {name: clean_panic(detail) for name, detail in FAILURE_PATTERN.findall(stdout)}
+    
+    test_results = [{
+        'name': name,
+        'passed': outcome == 'ok',
+        'error': None if outcome == 'ok' else failures.get(name, 'Test failed')
+    } for name, outcome in RESULT_PATTERN.findall(stdout)]
+    
+    if not test_results:
+        return [{'name': 'execution_error', 'passed': False, 'error': 'No test results found'}]
+    
+    return test_results
+
+
+def clean_panic(detail: str) -> str:
+    """Panic message without the thread prefix and backtrace hint"""
+    lines = [line for line in detail.strip().splitlines()
+             if not line.startswith('note: run with `RUST_BACKTRACE')]
+    if lines and lines[0].startswith('thread '):
+        lines[0] = lines[0].split(' panicked at ', 1)[-1]
+    return '\n'.join(lines)[:300]
+
+
+def first_error(stderr: str) -> str:
+    """First compiler error, which is usually the one the student needs"""
+    blocks = stderr.strip().split('\n\n')
+    errors = [block for block in blocks if block.startswith('error')]
+    return (errors[0] if errors else stderr.strip())[:300]
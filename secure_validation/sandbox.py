@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-submission users for the validator container
+The validator runs as root with only the capabilities it needs to switch
+users (see ecs-task-definition.json). Each submission gets a uid of its own
+from a pool and a 0700 working directory owned by that uid, and every
+process that runs student code drops to it, so a submission can't read
+another's files, open its /proc entries (environ, cwd, fds) or signal its
+processes. The validator keeps payloads and AWS credentials as root and
+marks itself non-dumpable.
+
+Without root (local runs) submissions keep the validator's own user;
+validator_script.py then validates batch entries one at a time.
+"""
+
+import collections
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Optional
+
+from resource_limits import prctl, PR_SET_DUMPABLE
+
+SANDBOX_UID_BASE = int(os.environ.get('SANDBOX_UID_BASE', '20000'))
+SANDBOX_UID_COUNT = int(os.environ.get('SANDBOX_UID_COUNT', '64'))
+
+# Released uids go to the back, so a uid is reused as late as possible
+_free_uids = collections.deque(range(SANDBOX_UID_BASE, SANDBOX_UID_BASE + SANDBOX_UID_COUNT))
+_uids_available = threading.Condition()
+
+
+def enabled() -> bool:
+    """Submissions only get their own users when the validator runs as root"""
+    return os.geteuid() == 0
+
+
+class Sandbox:
+    """A working directory and, when enabled(), a uid for one submission
+    
+    On exit every process left running as the uid is killed and the
+    directory is removed before the uid goes back to the pool.
+    """
+    
+    def __init__(self):
+        self.uid: Optional[int] = None
+        self.path: Optional[str] = None
+    
+    def __enter__(self) -> 'Sandbox':
+        if enabled():
+            with _uids_available:
+                _uids_available.wait_for(lambda: _free_uids)
+                self.uid = _free_uids.popleft()
+        self.path = tempfile.mkdtemp(prefix='submission-')  # Mode 0700
+        if self.uid is not None:
+            os.chown(self.path, self.uid, self.uid)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        if self.uid is None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            return
+        
+        try:
+            kill_all(self.uid)
+        finally:
+            # A uid that might still have processes is never handed out again
+            shutil.rmtree(self.path, ignore_errors=True)
+        with _uids_available:
+            _free_uids.append(self.uid)
+            _uids_available.notify()
+
+
+def kill_all(uid: int) -> None:
+    """SIGKILL every process running as uid, including ones that left their session"""
+    # kill(-1) from a process of that uid reaches exactly its processes
+    subprocess.run(
+        [sys.executable, '-S', '-c', 'import os\ntry:\n    os.kill(-1, 9)\nexcept OSError:\n    pass'],
+        user=uid, group=uid, extra_groups=[], env={}, stdin=subprocess.DEVNULL
+    )
+
+
+def protect_process() -> None:
+    """Make this process's /proc entries and memory root-only, whoever runs it"""
+    prctl(PR_SET_DUMPABLE, 0)
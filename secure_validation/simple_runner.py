@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Minimal test runner for plain assertion-style lesson tests
+Discovers test_* functions and runs each with its own timeout, without
+loading pytest. Assertion details come from rewriting assert statements
+in the test file's AST before it is executed.
+
+Usage: python3 -S simple_runner.py <test_file> <results_file> [per_test_timeout]
+"""
+
+import ast
+import json
+import os
+import signal
+import sys
+import traceback
+from typing import Dict, Any, List, Optional
+
+PER_TEST_TIMEOUT = 5  # seconds
+
+# Comparison operators whose operands are worth reporting on failure
+COMPARE_SYMBOLS = {
+    ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=',
+    ast.Gt: '>', ast.GtE: '>=', ast.In: 'in', ast.NotIn: 'not in',
+    ast.Is: 'is', ast.IsNot: 'is not'
+}
+
+
+class TestTimeout(Exception):
+    """Raised inside a test when its time budget runs out"""
+
+
+class AssertRewriter(ast.NodeTransformer):
+    """Turn `assert` statements into calls that report operand values"""
+    
+    def __init__(self, source: str):
+        self.source = source
+    
+    def visit_Assert(self, node: ast.Assert) -> ast.AST:
+        text = ast.get_source_segment(self.source, node.test) or 'assertion'
+        # The message stays lazy, as with a real assert
+        message = ast.Lambda(
+            args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=node.msg or ast.Constant(None)
+        )
+        
+        test = node.test
+        if isinstance(test, ast.Compare) and len(test.ops) == 1 and type(test.ops[0]) in COMPARE_SYMBOLS:
+            call = _helper_call('_cl_assert_compare', [
+                test.left, test.comparators[0],
+                ast.Constant(COMPARE_SYMBOLS[type(test.ops[0])]), ast.Constant(text), message
+            ])
+        else:
+            call = _helper_call('_cl_assert', [test, ast.Constant(text), message])
+        
+        return ast.copy_location(ast.Expr(call), node)
+
+
+def _helper_call(name: str, args: List[ast.expr]) -> ast.Call:
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=args, keywords=[])
+
+
+def _cl_assert(value: Any, text: str, message) -> None:
+    if not value:
+        detail = message()
+        raise AssertionError(f"assert {text}" + (f": {detail}" if detail is not None else ''))
+
+
+def _cl_assert_compare(left: Any, right: Any, op: str, text: str, message) -> None:
+    checks = {
+        '==': lambda: left == right, '!=': lambda: left != right,
+        '<': lambda: left < right, '<=': lambda: left <= right,
+        '>': lambda: left > right, '>=': lambda: left >= right,
+        'in': lambda: left in right, 'not in': lambda: left not in right,
+        'is': lambda: left is right, 'is not': lambda: left is not right
+    }
+    if not checks[op]():
+        detail = message()
+        error = f"assert {text}\n  where {left!r} {op} {right!r} is False"
+        raise AssertionError(error + (f"\n  {detail}" if detail is not None else ''))
+
+
+def load_tests(test_file: str) -> List[tuple]:
+    """Rewrite asserts, execute the module and return its (name, function) tests"""
+    with open(test_file, 'r') as f:
+        source = f.read()
+    
+    tree = ast.fix_missing_locations(AssertRewriter(source).visit(ast.parse(source, test_file)))
+    namespace = {
+        '__name__': 'test_solution',
+        '_cl_assert': _cl_assert,
+        '_cl_assert_compare': _cl_assert_compare
+    }
+    exec(compile(tree, test_file, 'exec'), namespace)
+    
+    # Skip test_* names pulled in by `from solution import *`
+    return [(name, obj) for name, obj in namespace.items()
+            if name.startswith('test_') and callable(obj)
+            and getattr(obj, '__module__', None) == 'test_solution']
+
+
+def run_tests(test_file: str, timeout: int = PER_TEST_TIMEOUT) -> List[Dict[str, Any]]:
+    """Run every discovered test function, each under its own timeout"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(test_file)))
+    
+    try:
+        tests = load_tests(test_file)
+    except Exception as e:
+        return [{'name': 'collection_error', 'passed': False, 'error': _format_exception(e)}]
+    
+    signal.signal(signal.SIGALRM, _on_timeout)
+    results = []
+    for name, test in tests:
+        error = run_one(test, timeout)
+        results.append({'name': name, 'passed': error is None, 'error': error})
+    
+    return results
+
+
+def run_one(test, timeout: int) -> Optional[str]:
+    """Run a single test, returning its error message or None on success"""
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        test()
+        return None
+    except TestTimeout:
+        return f'Test timed out after {timeout}s'
+    except AssertionError as e:
+        return str(e) or 'AssertionError'
+    except Exception as e:
+        return _format_exception(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _on_timeout(signum, frame):
+    raise TestTimeout()
+
+
+def _format_exception(error: BaseException) -> str:
+    """Last traceback frame plus the exception, like pytest's --tb=line"""
+    frames = traceback.extract_tb(error.__traceback__)
+    location = f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno}: " if frames else ''
+    return f"{location}{type(error).__name__}: {error}"
+
+
+def main():
+    test_file, results_file = sys.argv[1], sys.argv[2]
+    timeout = int(sys.argv[3]) if len(sys.argv) > 3 else PER_TEST_TIMEOUT
+    results = run_tests(test_file, timeout)
+    
+    with open(results_file, 'w') as f:
+        json.dump({'test_results': results}, f)
+
+
+if __name__ == '__main__':
+    main()
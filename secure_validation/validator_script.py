@@ -1,45 +1,120 @@
 #!/usr/bin/env python3
 """
 Secure validation script that runs inside the container
-This script has minimal privileges and restricted environment
+This script has minimal privileges and restricted environment; student code
+runs in child processes as a per-submission uid (see sandbox.py)
 """
 
+import base64
+import itertools
 import json
 import os
 import sys
 import subprocess
-import tempfile
+import time
+import re
 import signal
+import threading
+import zlib
 import boto3
-from typing import Dict, Any, List
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+
+import java_runner
+import rust_runner
+import sandbox
+from limited_process import run_limited, combine_usage, OutputLimitExceeded, REPORT_PATH
+
+# Shared by batch worker threads (clients are thread-safe, creation is not)
+s3 = boto3.client('s3')
+
+# S3 layout shared by every backend (validation_lambda/execution_backends.py)
+S3_PREFIX = os.environ.get('S3_PREFIX', 'executions')
+
+# Inline transport: input arrives as EXECUTION_PAYLOAD (zlib + base64 JSON) and
+# small results leave the same way instead of through S3. CodeBuild exports the
+# file named by RESULTS_EXPORT_FILE; Fargate reads the TEST_RESULTS log line.
+RESULTS_EXPORT_FILE = os.environ.get('RESULTS_EXPORT_FILE', '')
+INLINE_RESULTS_LIMIT = int(os.environ.get('INLINE_RESULTS_LIMIT', '4096'))
+
+# Per-test results are streamed to this table as they complete (optional)
+EVENTS_TABLE = os.environ.get('VALIDATION_EVENTS_TABLE', '')
+EVENT_TTL_SECONDS = 3600
+DONE_EVENT_SEQ = 1000000  # Fixed so the final event is always last and written once
+events_table = boto3.resource('dynamodb').Table(EVENTS_TABLE) if EVENTS_TABLE else None
+
+# Batch mode: several submissions validated in one container run. Only
+# submissions with uids of their own run side by side (see sandbox.py)
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '4')) if sandbox.enabled() else 1
+BATCH_TIME_LIMIT = 240  # Stays under the 5 minute build timeout
+
+# 'subprocess' starts a fresh pytest per submission; 'forkserver' forks a
+# child from a server process with pytest already imported (see fork_server.py)
+EXECUTION_MODE = os.environ.get('EXECUTION_MODE', 'subprocess')
+
+# Each test runs in its own worker process with its own time/CPU budget, so
+# one slow or hanging test only fails itself
+TEST_WORKERS = int(os.environ.get('TEST_WORKERS', '4'))
+PER_TEST_TIMEOUT = int(os.environ.get('PER_TEST_TIMEOUT', '10'))
+SUITE_TIMEOUT = 30  # When tests cannot be split and run as one file
+TEST_NAME_PATTERN = re.compile(r'^def (test_\w+)', re.MULTILINE)
+
+# Shared by all batch submissions so the container never runs more than
+# TEST_WORKERS test processes at once
+worker_slots = threading.BoundedSemaphore(TEST_WORKERS)
+
+# Lessons choose 'pytest' or the minimal assertion runner ('simple')
+VALID_RUNNERS = ['pytest', 'simple']
+SIMPLE_RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'simple_runner.py')
+if EXECUTION_MODE == 'forkserver':
+    import fork_server
+    fork_server.preload()
+
+# Compiled languages run through their own runners (javac + JUnit, rustc --test)
+LANGUAGE_RUNNERS = {'java': java_runner, 'rust': rust_runner}
 
 # Timeout handler
 def timeout_handler(signum, frame):
     print("TIMEOUT: Code execution exceeded time limit")
     sys.exit(1)
 
-# Set timeout
-signal.signal(signal.SIGALRM, timeout_handler)
-signal.alarm(60)  # 60 seconds max
-
 def main():
     """Main validation function"""
+    # Set timeout here rather than at import, so importers (benchmarks) aren't killed
+    signal.signal(signal.SIGALRM, timeout_handler)
+    signal.alarm(60)  # 60 seconds max
+    
+    # Submissions stay out of the environment child processes could inherit,
+    # and /proc/<pid>/environ, which still has them, is root-only from here on
+    sandbox.protect_process()
+    execution_id = os.environ.get('EXECUTION_ID')
+    s3_bucket = os.environ.get('S3_BUCKET')
+    batch_id = os.environ.get('BATCH_ID')
+    payload = os.environ.pop('EXECUTION_PAYLOAD', None)
+    manifest = os.environ.pop('BATCH_PAYLOAD', None)
+    
+    if batch_id and s3_bucket:
+        run_batch(s3_bucket, batch_id, manifest)
+        return
+    
     try:
-        execution_id = os.environ.get('EXECUTION_ID')
-        s3_bucket = os.environ.get('S3_BUCKET')
-        
         if not execution_id or not s3_bucket:
             print("ERROR: Missing required environment variables")
             sys.exit(1)
         
-        # Download input from S3
-        input_data = download_input(s3_bucket, execution_id)
+        # Small payloads travel inline; larger ones are staged in S3
+        if payload:
+            input_data = decode_payload(payload)
+        else:
+            input_data = download_input(s3_bucket, execution_id)
         
-        # Run validation
-        results = run_validation(input_data)
+        # Run validation, streaming each test result as it completes
+        results = validate_with_events(input_data, execution_id)
         
-        # Upload results
-        upload_results(s3_bucket, execution_id, results)
+        # Return results through the same channel when they fit
+        if not (payload and export_results(results)):
+            upload_results(s3_bucket, execution_id, results)
         
         print("Validation completed successfully")
         
@@ -57,113 +132,405 @@ def main():
             upload_results(s3_bucket, execution_id, error_results)
         except:
             pass
+        emit = make_event_emitter(execution_id)
+        if emit:
+            emit('done', summarize_results(error_results))
         sys.exit(1)
 
 
+def run_batch(bucket: str, batch_id: str, manifest: Optional[str] = None) -> None:
+    """Validate every submission listed in a batch manifest.
+    
+    Each submission still runs in its own sandbox and pytest subprocess via
+    run_validation; results are fanned back out to each execution's own
+    results.json so waiting orchestrators see no difference.
+    """
+    signal.alarm(BATCH_TIME_LIMIT)
+    
+    if manifest:
+        entries = decode_payload(manifest).get('executions', [])
+    else:
+        entries = download_batch_manifest(bucket, batch_id)
+    print(f"Validating batch {batch_id} ({len(entries)} submissions)")
+    
+    with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as pool:
+        for entry in entries:
+            pool.submit(validate_execution, bucket, entry)
+    
+    print("Batch validation completed")
+
+
+def validate_execution(bucket: str, entry: Dict[str, Any]) -> None:
+    """Validate one submission of a batch, never raising"""
+    execution_id = entry['executionId']
+    try:
+        if entry.get('payload'):
+            input_data = decode_payload(entry['payload'])
+        else:
+            input_data = download_input(bucket, execution_id)
+        results = validate_with_events(input_data, execution_id)
+    except Exception as e:
+        print(f"ERROR ({execution_id}): {str(e)}")
+        results = {
+            'test_results': [{
+                'name': 'container_error',
+                'passed': False,
+                'error': str(e)[:200]
+            }]
+        }
+        emit = make_event_emitter(execution_id)
+        if emit:
+            emit('done', summarize_results(results))
+    
+    try:
+        upload_results(bucket, execution_id, results)
+    except Exception as e:
+        print(f"ERROR uploading results for {execution_id}: {str(e)}")
+
+
+def download_batch_manifest(bucket: str, batch_id: str) -> List[Dict[str, Any]]:
+    """Download the executions (IDs and optional inline payloads) in a batch"""
+    s3_key = f"batches/{batch_id}/manifest.json"
+    
+    response = s3.get_object(Bucket=bucket, Key=s3_key)
+    return json.loads(response['Body'].read()).get('executions', [])
+
+
+def decode_payload(payload: str) -> Dict[str, Any]:
+    """Decode an inline zlib + base64 JSON payload"""
+    return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+def encode_payload(data: Dict[str, Any]) -> str:
+    """Encode data as an inline zlib + base64 JSON payload"""
+    return base64.b64encode(zlib.compress(json.dumps(data).encode())).decode()
+
+
 def download_input(bucket: str, execution_id: str) -> Dict[str, Any]:
     """Download user code and tests from S3"""
-    s3 = boto3.client('s3')
-    
-    s3_key = f"fargate-executions/{execution_id}/input.json"
+    s3_key = f"{S3_PREFIX}/{execution_id}/input.json"
     
     response = s3.get_object(Bucket=bucket, Key=s3_key)
     return json.loads(response['Body'].read())
 
 
-def run_validation(input_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Run code validation in secure environment"""
+def validate_with_events(input_data: Dict[str, Any], execution_id: str) -> Dict[str, Any]:
+    """Run validation, streaming each test result and a final summary when enabled"""
+    emit = make_event_emitter(execution_id)
+    if emit is None:
+        return run_validation(input_data)
+    
+    results = run_validation(input_data, on_result=lambda result: emit('test', result))
+    emit('done', summarize_results(results))
+    return results
+
+
+def make_event_emitter(execution_id: str) -> Optional[Callable[[str, Dict[str, Any]], None]]:
+    """Return a function that appends events for this execution, or None if streaming is off"""
+    if events_table is None:
+        return None
+    
+    sequence = itertools.count(1)  # seq 0 is the orchestrator's 'started' event
+    
+    def emit(event_type: str, data: Dict[str, Any]) -> None:
+        try:
+            events_table.put_item(Item={
+                'executionId': execution_id,
+                'seq': DONE_EVENT_SEQ if event_type == 'done' else next(sequence),
+                'type': event_type,
+                'ttl': int(time.time()) + EVENT_TTL_SECONDS,
+                # DynamoDB rejects floats (resource usage); store them as Decimal
+                **json.loads(json.dumps(data), parse_float=Decimal)
+            })
+        except Exception as e:
+            # Streaming is best effort; final results still arrive the usual way
+            print(f"Event emit error: {str(e)}")
+    
+    return emit
+
+
+def summarize_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload of the final 'done' event"""
+    test_results = results.get('test_results', [])
+    return {
+        'passed': bool(test_results) and all(r.get('passed', False) and not r.get('cached')
+                                             for r in test_results),
+        'results': test_results
+    }
+
+
+def run_validation(input_data: Dict[str, Any],
+                   on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Run code validation in secure environment
+    
+    on_result, if given, is called with each test result as soon as its
+    worker finishes (from the worker thread), before the full set is returned.
+    """
+    started = time.monotonic()
     
     code = input_data['code']
     tests = input_data['tests']
+    runner = input_data.get('runner', 'pytest')
+    language = input_data.get('language', 'python')
     
     # Additional security checks
     if len(code) > 10000:
         raise ValueError("Code too long")
     
-    # Create temporary directory for execution
-    with tempfile.TemporaryDirectory() as tmpdir:
+    if runner not in VALID_RUNNERS:
+        raise ValueError(f"Unknown test runner: {runner}")
+    
+    if language in LANGUAGE_RUNNERS:
+        with sandbox.Sandbox() as box:
+            test_results = run_language_tests(box.path, language, code, tests, box.uid)
+        if on_result:
+            for result in test_results:
+                on_result(result)
+        return with_resource_usage(test_results, started)
+    
+    if language != 'python':
+        raise ValueError(f"Unsupported language: {language}")
+    
+    # Working directory and uid of this submission's own
+    with sandbox.Sandbox() as box:
+        tmpdir = box.path
+        
         # Write user code
         code_file = os.path.join(tmpdir, 'solution.py')
         with open(code_file, 'w') as f:
             f.write(code)
         
-        # Write test file
-        test_file = os.path.join(tmpdir, 'test_solution.py')
-        test_content = 'from solution import *\n\n' + '\n\n'.join(tests)
-        with open(test_file, 'w') as f:
-            f.write(test_content)
+        # One file per test when every test string is self-contained,
+        # otherwise a single file so shared helpers stay visible
+        if all(TEST_NAME_PATTERN.search(test) for test in tests):
+            test_files = [write_test_file(tmpdir, f'test_{i}.py', [test]) for i, test in enumerate(tests)]
+            timeout = PER_TEST_TIMEOUT
+        else:
+            test_files = [write_test_file(tmpdir, 'test_solution.py', tests)]
+            timeout = SUITE_TIMEOUT
         
-        # Run tests with strict limits
-        try:
-            # Use subprocess with additional security
-            result = subprocess.run(
-                [sys.executable, '-m', 'pytest', test_file, '-v', '--tb=short', '--json-report', '--json-report-file=results.json'],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True,
-                timeout=30,  # 30 second timeout for pytest
-                env={
-                    'HOME': tmpdir,
-                    'TMPDIR': tmpdir,
-                    'PYTHONPATH': tmpdir,
-                    'PYTHONDONTWRITEBYTECODE': '1'
-                }
-            )
-            
-            # Parse results
-            results_file = os.path.join(tmpdir, 'results.json')
-            if os.path.exists(results_file):
-                with open(results_file, 'r') as f:
-                    pytest_results = json.load(f)
-                
-                test_results = []
-                for test in pytest_results.get('tests', []):
-                    test_results.append({
-                        'name': test['nodeid'].split('::')[-1],
-                        'passed': test['outcome'] == 'passed',
-                        'error': format_error(test) if test['outcome'] == 'failed' else None
-                    })
-                
-                return {'test_results': test_results}
+        # Tests that passed last time (indices from the orchestrator) only run
+        # once the rest pass, so a resubmission that still fails returns early
+        known_passing = set(input_data.get('knownPassing', [])) if len(test_files) == len(tests) else set()
+        first = [i for i in range(len(test_files)) if i not in known_passing]
+        rest = [i for i in range(len(test_files)) if i in known_passing]
+        
+        # Run tests in parallel workers with strict limits, keeping test order
+        with ThreadPoolExecutor(max_workers=TEST_WORKERS) as pool:
+            file_results = dict(zip(first, run_test_stage(
+                pool, tmpdir, [test_files[i] for i in first], runner, timeout, on_result, box.uid)))
             
+            if all(r['passed'] for i in first for r in file_results[i]):
+                file_results.update(zip(rest, run_test_stage(
+                    pool, tmpdir, [test_files[i] for i in rest], runner, timeout, on_result, box.uid)))
             else:
-                # Fallback: parse stdout
-                return parse_stdout_results(result.stdout, result.stderr)
-                
-        except subprocess.TimeoutExpired:
-            return {
-                'test_results': [{
-                    'name': 'timeout',
-                    'passed': False,
-                    'error': 'Test execution timeout'
-                }]
-            }
-        except Exception as e:
-            return {
-                'test_results': [{
-                    'name': 'execution_error',
-                    'passed': False,
-                    'error': str(e)[:200]  # Limit error message length
-                }]
-            }
+                for i in rest:
+                    file_results[i] = [cached_result(test_files[i])]
+                    if on_result:
+                        on_result(file_results[i][0])
+        
+        test_results = [result for i in range(len(test_files)) for result in file_results[i]]
+        return with_resource_usage(test_results, started)
+
+
+def with_resource_usage(test_results: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+    """Validation output: per-test results plus what the whole submission used"""
+    return {
+        'test_results': test_results,
+        'resource_usage': combine_usage([test.get('usage') for test in test_results],
+                                        time.monotonic() - started)
+    }
+
+
+def run_test_stage(pool: ThreadPoolExecutor, tmpdir: str, test_files: List[str], runner: str,
+                   timeout: int, on_result: Optional[Callable[[Dict[str, Any]], None]],
+                   uid: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+    """Run test files on the pool and wait for all of them, results in file order"""
+    futures = [pool.submit(run_test_file, tmpdir, test_file, runner, timeout, uid)
+               for test_file in test_files]
+    if on_result:
+        for future in futures:
+            future.add_done_callback(lambda done: [on_result(r) for r in done.result()])
+    return [future.result() for future in futures]
+
+
+def cached_result(test_file: str) -> Dict[str, Any]:
+    """Result for a previously passing test that was skipped this time"""
+    return {
+        'name': file_test_name(test_file, 'cached'),
+        'passed': True,
+        'error': None,
+        'cached': True
+    }
+
+
+def run_language_tests(tmpdir: str, language: str, code: str, tests: List[str],
+                       uid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compile and run a Java or Rust submission as one suite, never raising"""
+    try:
+        with worker_slots:
+            test_results = LANGUAGE_RUNNERS[language].run_tests(tmpdir, code, tests, timeout=SUITE_TIMEOUT,
+                                                                uid=uid)
+    except TimeoutError:
+        return [{'name': 'timeout', 'passed': False, 'error': 'Test execution timeout'}]
+    except OutputLimitExceeded:
+        return [{'name': 'output_limit', 'passed': False, 'error': 'Test produced too much output'}]
+    except Exception as e:
+        return [{'name': 'execution_error', 'passed': False, 'error': str(e)[:200]}]
+    
+    for test in test_results:
+        if test['error']:
+            test['error'] = sanitize_error(test['error'])
+    return test_results
+
+
+def write_test_file(tmpdir: str, filename: str, tests: List[str]) -> str:
+    """Write test functions to a file that imports the student's solution"""
+    test_file = os.path.join(tmpdir, filename)
+    test_content = 'from solution import *\n\n' + '\n\n'.join(tests)
+    with open(test_file, 'w') as f:
+        f.write(test_content)
+    return test_file
+
+
+def run_test_file(tmpdir: str, test_file: str, runner: str, timeout: int,
+                  uid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Run one test file in its own worker process, never raising"""
+    try:
+        with worker_slots:
+            return execute_test_file(tmpdir, test_file, runner, timeout, uid)
+    
+    except (subprocess.TimeoutExpired, TimeoutError):
+        return [{
+            'name': file_test_name(test_file, 'timeout'),
+            'passed': False,
+            'error': 'Test execution timeout'
+        }]
+    except OutputLimitExceeded:
+        return [{
+            'name': file_test_name(test_file, 'output_limit'),
+            'passed': False,
+            'error': 'Test produced too much output'
+        }]
+    except Exception as e:
+        return [{
+            'name': file_test_name(test_file, 'execution_error'),
+            'passed': False,
+            'error': str(e)[:200]  # Limit error message length
+        }]
+
+
+def execute_test_file(tmpdir: str, test_file: str, runner: str, timeout: int,
+                      uid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Run one test file with the configured execution mode and runner"""
+    if EXECUTION_MODE == 'forkserver':
+        results = fork_server.run_tests(tmpdir, test_file, timeout=timeout, runner=runner, uid=uid)
+        for test in results['test_results']:
+            if test['error']:
+                test['error'] = sanitize_error(test['error'])
+    elif runner == 'simple':
+        results = run_simple_subprocess(tmpdir, test_file, timeout, uid)
+    else:
+        results = run_pytest_subprocess(tmpdir, test_file, timeout, uid)
+    
+    # Usage is per worker process, shared by the tests it ran
+    for test in results['test_results']:
+        test['usage'] = results['usage']
+    return results['test_results']
+
+
+def file_test_name(test_file: str, default: str) -> str:
+    """Name to report for a whole file: its test when it holds exactly one"""
+    with open(test_file, 'r') as f:
+        names = TEST_NAME_PATTERN.findall(f.read())
+    return names[0] if len(names) == 1 else default
+
+
+def run_pytest_subprocess(tmpdir: str, test_file: str, timeout: int = SUITE_TIMEOUT,
+                          uid: Optional[int] = None) -> Dict[str, Any]:
+    """Run tests in a fresh pytest interpreter (the default execution mode)"""
+    # Use subprocess with additional security; the report comes back over a pipe
+    result, usage = run_limited(
+        [sys.executable, '-m', 'pytest', test_file, '-v', '--tb=short', '-p', 'no:cacheprovider',
+         '--json-report', f'--json-report-file={REPORT_PATH}'],
+        cwd=tmpdir,
+        timeout=timeout,
+        env={
+            'HOME': tmpdir,
+            'TMPDIR': tmpdir,
+            'PYTHONPATH': tmpdir,
+            'PYTHONDONTWRITEBYTECODE': '1'
+        },
+        uid=uid,
+        report=True
+    )
+    
+    # Parse results
+    if result.report:
+        pytest_results = json.loads(result.report)
+        
+        test_results = []
+        for test in pytest_results.get('tests', []):
+            test_results.append({
+                'name': test['nodeid'].split('::')[-1],
+                'passed': test['outcome'] == 'passed',
+                'error': format_error(test) if test['outcome'] == 'failed' else None
+            })
+        
+        # No tests means collection failed (e.g. MemoryError under the rlimit)
+        if test_results:
+            return {'test_results': test_results, 'usage': usage}
+    
+    # Fallback: parse stdout
+    return dict(parse_stdout_results(result.stdout, result.stderr), usage=usage)
+
+
+def run_simple_subprocess(tmpdir: str, test_file: str, timeout: int = SUITE_TIMEOUT,
+                          uid: Optional[int] = None) -> Dict[str, Any]:
+    """Run tests with simple_runner.py; -S skips site imports for a faster start"""
+    result, usage = run_limited(
+        [sys.executable, '-S', SIMPLE_RUNNER, test_file, REPORT_PATH, str(timeout)],
+        cwd=tmpdir,
+        timeout=timeout,
+        env={
+            'HOME': tmpdir,
+            'TMPDIR': tmpdir,
+            'PYTHONDONTWRITEBYTECODE': '1'
+        },
+        uid=uid,
+        report=True
+    )
+    
+    if not result.report:
+        return dict(parse_stdout_results(result.stdout, result.stderr), usage=usage)
+    
+    test_results = json.loads(result.report)['test_results']
+    
+    for test in test_results:
+        if test['error']:
+            test['error'] = sanitize_error(test['error'])
+    
+    return {'test_results': test_results, 'usage': usage}
 
 
 def format_error(test_data: Dict[str, Any]) -> str:
     """Format test error message safely"""
     try:
         if 'call' in test_data and 'longrepr' in test_data['call']:
-            error_msg = str(test_data['call']['longrepr'])
-            # Limit error message length and remove sensitive info
-            error_msg = error_msg[:300]
-            # Remove potential path information
-            error_msg = error_msg.replace('/workspace/', '').replace('/tmp/', '')
-            return error_msg
+            return sanitize_error(str(test_data['call']['longrepr']))
     except:
         pass
     
     return 'Test failed'
 
 
+def sanitize_error(error_msg: str) -> str:
+    """Limit error message length and remove sensitive info"""
+    error_msg = error_msg[:300]
+    # Remove potential path information
+    return error_msg.replace('/workspace/', '').replace('/tmp/', '')
+
+
 def parse_stdout_results(stdout: str, stderr: str) -> Dict[str, Any]:
     """Fallback: parse pytest stdout output"""
     results = []
@@ -205,11 +572,26 @@ def parse_stdout_results(stdout: str, stderr: str) -> Dict[str, Any]:
     return {'test_results': results}
 
 
+def export_results(results: Dict[str, Any]) -> bool:
+    """Return small results inline; False means the caller must use S3"""
+    encoded = encode_payload(results)
+    if len(encoded) > INLINE_RESULTS_LIMIT:
+        return False
+    
+    # Fargate orchestrators read this line from CloudWatch Logs
+    print(f"TEST_RESULTS: {json.dumps(results)}")
+    
+    if RESULTS_EXPORT_FILE:
+        # CodeBuild exports it as TEST_RESULTS_PAYLOAD (see codebuild-project.yml)
+        with open(RESULTS_EXPORT_FILE, 'w') as f:
+            f.write(encoded)
+    
+    return True
+
+
 def upload_results(bucket: str, execution_id: str, results: Dict[str, Any]) -> None:
     """Upload results to S3"""
-    s3 = boto3.client('s3')
-    
-    s3_key = f"fargate-executions/{execution_id}/results.json"
+    s3_key = f"{S3_PREFIX}/{execution_id}/results.json"
     
     # Also output to logs for debugging
     print(f"TEST_RESULTS: {json.dumps(results)}")
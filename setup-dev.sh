@@ -252,6 +252,9 @@ export PROGRESS_TABLE="\${PROJECT_NAME}-progress-\${ENVIRONMENT}"
 export SESSIONS_TABLE="\${PROJECT_NAME}-sessions-\${ENVIRONMENT}"
 export LESSON_CACHE_TABLE="\${PROJECT_NAME}-lesson-cache-\${ENVIRONMENT}"
 
+# Signs progress pagination cursors (user Lambda); shared by all containers
+export PROGRESS_CURSOR_SECRET="$(python3 -c 'import secrets; print(secrets.token_hex(32))')"
+
 # S3 Buckets
 export STATIC_LESSONS_BUCKET="\${PROJECT_NAME}-static-lessons-\${AWS_ACCOUNT_ID}"
 export FRONTEND_BUCKET="\${PROJECT_NAME}-frontend-\${AWS_ACCOUNT_ID}"
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Users table access shared by auth_lambda and user_lambda
+Symlinked into both function directories, so each deployment zip gets a copy.
+
+Schema 2 (current) uses the API's camelCase names: userId, createdAt,
+lastLogin. Earlier auth_lambda versions wrote schema 1 items with
+user_id/created_at/last_login. Reads return every item with schema 2
+names; tools/migrate_users.py rewrites old items in place.
+"""
+
+from typing import Dict, Any, Optional
+from botocore.exceptions import ClientError
+
+SCHEMA_VERSION = 2
+# Schema 1 attribute -> schema 2 attribute
+LEGACY_ATTRIBUTES = {'user_id': 'userId', 'created_at': 'createdAt', 'last_login': 'lastLogin'}
+
+
+def get_user(table: Any, user_id: str) -> Optional[Dict[str, Any]]:
+    """User item in schema 2 names, or None"""
+    item = table.get_item(Key={'userId': user_id}).get('Item')
+    return normalize(item) if item else None
+
+
+def needs_migration(item: Dict[str, Any]) -> bool:
+    return int(item.get('schemaVersion', 1)) < SCHEMA_VERSION or bool(LEGACY_ATTRIBUTES.keys() & item.keys())
+
+
+def normalize(item: Dict[str, Any]) -> Dict[str, Any]:
+    """The item with schema 2 attribute names, whichever schema wrote it"""
+    if not needs_migration(item):
+        return item
+    
+    user = {key: value for key, value in item.items() if key not in LEGACY_ATTRIBUTES}
+    for legacy, current in LEGACY_ATTRIBUTES.items():
+        if legacy in item and current not in user:
+            user[current] = item[legacy]
+    
+    # Items touched by both schemas keep the earliest creation and latest login
+    if 'created_at' in item and 'createdAt' in item:
+        user['createdAt'] = min(item['created_at'], item['createdAt'])
+    if 'last_login' in item and 'lastLogin' in item:
+        user['lastLogin'] = max(item['last_login'], item['lastLogin'])
+    
+    user['schemaVersion'] = SCHEMA_VERSION
+    return user
+
+
+def put_if_absent(table: Any, item: Dict[str, Any], key_attribute: str = 'userId') -> bool:
+    """Create item in one conditional put_item; False if its key already exists"""
+    try:
+        table.put_item(Item=item, ConditionExpression=f'attribute_not_exists({key_attribute})')
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
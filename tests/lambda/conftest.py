@@ -0,0 +1,147 @@
+"""
+Fixtures for the Lambda handlers, run against moto's in-memory AWS
+Each Lambda directory vendors its own (deployment) dependencies, so its
+directory goes at the end of sys.path and the installed boto3 is used.
+"""
+
+import importlib.util
+import os
+import sys
+
+import boto3
+import pytest
+from moto import mock_aws
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+PROGRESS_TABLE = 'codelearn-progress-test'
+EVENTS_TABLE = 'codelearn-validation-events-test'
+SESSIONS_TABLE = 'codelearn-sessions-test'
+USERS_TABLE = 'codelearn-users-test'
+
+
+def load_handler(directory: str, module: str = 'handler'):
+    """Import a Lambda module fresh, so it creates its clients inside the mock
+    
+    Other modules of a Lambda import its handler as `handler`, so while they
+    load that name is bound to this directory's handler.
+    """
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.append(path)
+    spec = importlib.util.spec_from_file_location(f'{directory}_{module}', os.path.join(path, f'{module}.py'))
+    loaded = importlib.util.module_from_spec(spec)
+    
+    if module == 'handler':
+        spec.loader.exec_module(loaded)
+        return loaded
+    
+    previous = sys.modules.get('handler')
+    sys.modules['handler'] = load_handler(directory)
+    try:
+        spec.loader.exec_module(loaded)
+    finally:
+        if previous is None:
+            del sys.modules['handler']
+        else:
+            sys.modules['handler'] = previous
+    return loaded
+
+
+class Clock:
+    """Stands in for a Lambda module's time module: monkeypatch.setattr(module, 'time', Clock(now))"""
+    
+    def __init__(self, now: float):
+        self.now = now
+    
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('PROGRESS_TABLE', PROGRESS_TABLE)
+    monkeypatch.setenv('PROGRESS_CURSOR_SECRET', 'test-cursor-secret')
+    monkeypatch.setenv('VALIDATION_EVENTS_TABLE', EVENTS_TABLE)
+    monkeypatch.setenv('SESSIONS_TABLE', SESSIONS_TABLE)
+    monkeypatch.setenv('USERS_TABLE', USERS_TABLE)
+    with mock_aws():
+        yield
+
+
+@pytest.fixture
+def progress_table(aws):
+    """Progress table as created by quick-start-scripts.sh"""
+    return boto3.resource('dynamodb').create_table(
+        TableName=PROGRESS_TABLE,
+        AttributeDefinitions=[
+            {'AttributeName': 'userId', 'AttributeType': 'S'},
+            {'AttributeName': 'lessonId', 'AttributeType': 'S'},
+            {'AttributeName': 'completedAt', 'AttributeType': 'N'}
+        ],
+        KeySchema=[
+            {'AttributeName': 'userId', 'KeyType': 'HASH'},
+            {'AttributeName': 'lessonId', 'KeyType': 'RANGE'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'CompletedIndex',
+            'KeySchema': [
+                {'AttributeName': 'userId', 'KeyType': 'HASH'},
+                {'AttributeName': 'completedAt', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {
+                'ProjectionType': 'INCLUDE',
+                'NonKeyAttributes': ['topic', 'language', 'status', 'completed', 'attempts', 'firstAttemptSuccess']
+            }
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+@pytest.fixture
+def events_table(aws):
+    """Validation events table as created by secure_validation/codebuild-project.yml"""
+    return boto3.resource('dynamodb').create_table(
+        TableName=EVENTS_TABLE,
+        AttributeDefinitions=[
+            {'AttributeName': 'executionId', 'AttributeType': 'S'},
+            {'AttributeName': 'seq', 'AttributeType': 'N'}
+        ],
+        KeySchema=[
+            {'AttributeName': 'executionId', 'KeyType': 'HASH'},
+            {'AttributeName': 'seq', 'KeyType': 'RANGE'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+@pytest.fixture
+def sessions_table(aws):
+    """Sessions table as created by quick-start-scripts.sh"""
+    return boto3.resource('dynamodb').create_table(
+        TableName=SESSIONS_TABLE,
+        AttributeDefinitions=[{'AttributeName': 'session_id', 'AttributeType': 'S'}],
+        KeySchema=[{'AttributeName': 'session_id', 'KeyType': 'HASH'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+@pytest.fixture
+def users_table(aws):
+    """Users table as created by quick-start-scripts.sh"""
+    return boto3.resource('dynamodb').create_table(
+        TableName=USERS_TABLE,
+        AttributeDefinitions=[
+            {'AttributeName': 'userId', 'AttributeType': 'S'},
+            {'AttributeName': 'email', 'AttributeType': 'S'}
+        ],
+        KeySchema=[{'AttributeName': 'userId', 'KeyType': 'HASH'}],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'EmailIndex',
+            'KeySchema': [{'AttributeName': 'email', 'KeyType': 'HASH'}],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
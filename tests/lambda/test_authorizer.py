@@ -0,0 +1,104 @@
+"""
+auth_lambda session authorizer against moto's DynamoDB
+"""
+
+import pytest
+
+from conftest import Clock, load_handler
+
+NOW = 1700000000
+METHOD_ARN = 'arn:aws:execute-api:us-east-1:123456789012:abc123/dev/GET/user/profile'
+
+
+@pytest.fixture
+def authorizer(sessions_table, monkeypatch):
+    module = load_handler('auth_lambda', 'authorizer')
+    monkeypatch.setattr(module, 'time', Clock(NOW))
+    return module
+
+
+def create_session(authorizer, sessions_table, session_id='s1', token='secret-token', expires_at=NOW + 86400):
+    sessions_table.put_item(Item={
+        'session_id': session_id,
+        'user_id': 'u1',
+        'token_hash': authorizer.hash_token(token),
+        'created_at': NOW,
+        'expires_at': expires_at
+    })
+
+
+def authorize(authorizer, authorization):
+    return authorizer.lambda_handler({'authorizationToken': authorization, 'methodArn': METHOD_ARN}, None)
+
+
+def assert_rejected(authorizer, authorization):
+    with pytest.raises(Exception, match='^Unauthorized$'):
+        authorize(authorizer, authorization)
+
+
+def test_valid_session_is_allowed_for_the_whole_stage(authorizer, sessions_table):
+    create_session(authorizer, sessions_table)
+    
+    response = authorize(authorizer, 'Bearer s1.secret-token')
+    
+    assert response['principalId'] == 'u1'
+    assert response['context'] == {'userId': 'u1'}
+    statement = response['policyDocument']['Statement'][0]
+    assert statement['Effect'] == 'Allow'
+    assert statement['Resource'] == 'arn:aws:execute-api:us-east-1:123456789012:abc123/dev/*'
+
+
+def test_session_expiring_while_cached_is_rejected(authorizer, sessions_table):
+    create_session(authorizer, sessions_table, expires_at=NOW + 600)
+    authorize(authorizer, 'Bearer s1.secret-token')
+    
+    # Past expiry the cached entry is gone; the item itself outlives it until TTL deletes it
+    authorizer.time.now = NOW + 601
+    assert_rejected(authorizer, 'Bearer s1.secret-token')
+    assert 'Item' in sessions_table.get_item(Key={'session_id': 's1'})
+
+
+def test_cached_entry_is_dropped_before_expiry(authorizer, sessions_table):
+    create_session(authorizer, sessions_table, expires_at=NOW + 120)
+    authorize(authorizer, 'Bearer s1.secret-token')
+    
+    authorizer.time.now = NOW + 120 - authorizer.SESSION_CACHE_MARGIN
+    assert authorizer.session_cache.get('s1') is None
+    # Still valid, so it is read again rather than rejected
+    assert authorize(authorizer, 'Bearer s1.secret-token')['principalId'] == 'u1'
+
+
+def test_revoked_session_is_rejected_within_cache_ttl(authorizer, sessions_table):
+    create_session(authorizer, sessions_table)
+    authorize(authorizer, 'Bearer s1.secret-token')
+    sessions_table.delete_item(Key={'session_id': 's1'})
+    
+    authorizer.time.now = NOW + authorizer.SESSION_CACHE_TTL
+    assert_rejected(authorizer, 'Bearer s1.secret-token')
+    
+    # A container that never cached it rejects it straight away
+    cold = load_handler('auth_lambda', 'authorizer')
+    with pytest.raises(Exception, match='^Unauthorized$'):
+        cold.lambda_handler({'authorizationToken': 'Bearer s1.secret-token', 'methodArn': METHOD_ARN}, None)
+
+
+def test_wrong_token_is_rejected_even_when_session_is_cached(authorizer, sessions_table):
+    create_session(authorizer, sessions_table)
+    authorize(authorizer, 'Bearer s1.secret-token')
+    
+    assert_rejected(authorizer, 'Bearer s1.guessed-token')
+
+
+@pytest.mark.parametrize('authorization', [
+    '',
+    'Bearer',
+    'Bearer s1',
+    'Bearer .secret-token',
+    'Bearer s1.',
+    'Basic s1.secret-token',
+    'Bearer unknown.secret-token',
+])
+def test_malformed_or_unknown_tokens_are_rejected(authorizer, sessions_table, authorization):
+    create_session(authorizer, sessions_table)
+    
+    assert_rejected(authorizer, authorization)
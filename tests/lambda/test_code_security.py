@@ -0,0 +1,63 @@
+"""
+validation_lambda's forbidden API check for Java and Rust submissions
+"""
+
+import pytest
+
+from conftest import load_handler
+
+
+@pytest.fixture
+def handler(aws):
+    return load_handler('validation_lambda')
+
+
+@pytest.mark.parametrize('code, forbidden', [
+    ('Runtime.getRuntime().exec("ls");', 'Runtime'),
+    ('Class.forName("java.l" + "ang.Runt" + "ime");', 'forName'),
+    ('Object o = getClass().getMethod("run").invoke(null);', 'getMethod'),
+    ('\\u0052untime.getRuntime();', 'Runtime'),
+    ('java./* */net.Socket socket;', 'net'),
+    ('String open = "/*"; Runtime runtime; String close = "*/";', 'Runtime'),
+    ('char quote = \'"\'; System.exit(1); String empty = "";', 'exit'),
+])
+def test_java_apis_are_found_however_written(handler, code, forbidden):
+    assert handler.find_forbidden_api(code, 'java') == forbidden
+
+
+@pytest.mark.parametrize('code', [
+    'throw new RuntimeException("Thread interrupted");',
+    'public int add(int a, int b) { return a + b; } // no Runtime here',
+    'String block = """\n    Runtime\n    """;',
+])
+def test_java_names_in_literals_and_longer_words_pass(handler, code):
+    assert handler.find_forbidden_api(code, 'java') is None
+
+
+@pytest.mark.parametrize('code, forbidden', [
+    ('use std::process as p; fn main() { p::Command::new("ls"); }', 'process'),
+    ('use std::{io, fs as files};', 'fs'),
+    ('use std as s; fn read() { s::fs::read("x"); }', 'fs'),
+    ('fn quit() { std::/* */process::exit(1) }', 'process'),
+    ('let open = "/*"; std::process::exit(1); let close = "*/";', 'process'),
+    ('let raw = r#"a"b"#; std::r#process::exit(1);', 'process'),
+    ('let home = env!("HOME");', 'env'),
+    ('#[path = "/etc/passwd"] mod secrets;', 'path'),
+    ('macro_rules! m { ($a:ident) => { std::$a::exit(1) } }', 'macro_rules'),
+])
+def test_rust_apis_are_found_however_written(handler, code, forbidden):
+    assert handler.find_forbidden_api(code, 'rust') == forbidden
+
+
+@pytest.mark.parametrize('code', [
+    'fn process(items: &[i32]) -> i32 { let path = items.len() as i32; path }',
+    "fn longest<'a>(x: &'a str, y: &'a str) -> &'a str { let quote = '\"'; x }",
+    'let message = "std::process is not allowed";',
+])
+def test_rust_local_names_and_literals_pass(handler, code):
+    assert handler.find_forbidden_api(code, 'rust') is None
+
+
+def test_tests_are_checked_too(handler):
+    error = handler.validate_code_security('fn add() {}', ['fn test_add() { std::fs::remove_dir_all("/"); }'], 'rust')
+    assert error == 'Forbidden API in tests: fs'
@@ -0,0 +1,58 @@
+"""
+validation_lambda result retrieval against moto's CloudWatch Logs and S3
+"""
+
+import json
+import time
+
+import boto3
+from botocore.exceptions import ClientError
+
+from conftest import load_handler
+
+TASK_ARN = 'arn:aws:ecs:us-east-1:123456789012:task/codelearn-validation/abc123'
+
+
+def test_fargate_results_wait_for_log_delivery(aws, monkeypatch):
+    backends = load_handler('validation_lambda', 'execution_backends')
+    logs = boto3.client('logs')
+    group = f'/ecs/{backends.TASK_DEFINITION}'
+    logs.create_log_group(logGroupName=group)
+    results = [{'name': 'test_add', 'passed': True}]
+    
+    def deliver_logs(seconds):
+        # The results line only reaches CloudWatch after the first read
+        if seconds and not logs.describe_log_streams(logGroupName=group)['logStreams']:
+            logs.create_log_stream(logGroupName=group, logStreamName='ecs/validator/abc123')
+            logs.put_log_events(logGroupName=group, logStreamName='ecs/validator/abc123', logEvents=[
+                {'timestamp': int(time.time() * 1000), 'message': f"TEST_RESULTS: {json.dumps({'test_results': results})}"}
+            ])
+    
+    monkeypatch.setattr(backends.time, 'sleep', deliver_logs)
+    
+    task = {'taskArn': TASK_ARN, 'inline': True}
+    assert backends.FargateBackend().get_results(task, 'exec-1') == results
+
+
+def test_batched_results_wait_through_access_denied(aws, monkeypatch):
+    backends = load_handler('validation_lambda', 'execution_backends')
+    s3 = boto3.client('s3')
+    s3.create_bucket(Bucket=backends.VALIDATION_BUCKET)
+    key = f'{backends.EXECUTIONS_PREFIX}/exec-1/results.json'
+    results = [{'name': 'test_add', 'passed': True}]
+    get_object = backends.s3.get_object
+    
+    def without_list_bucket(**kwargs):
+        # Without s3:ListBucket, S3 answers 403 rather than 404 for a missing key
+        try:
+            return get_object(**kwargs)
+        except ClientError:
+            raise ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'Access Denied'}}, 'GetObject')
+    
+    def upload_results(seconds):
+        s3.put_object(Bucket=backends.VALIDATION_BUCKET, Key=key, Body=json.dumps({'test_results': results}))
+    
+    monkeypatch.setattr(backends.s3, 'get_object', without_list_bucket)
+    monkeypatch.setattr(backends.time, 'sleep', upload_results)
+    
+    assert backends.BatchedCodeBuildBackend().wait(None, 'exec-1') == results
@@ -0,0 +1,114 @@
+"""
+user_lambda profile cache and versioned preference updates against moto's DynamoDB
+"""
+
+import json
+
+import pytest
+
+from conftest import Clock, load_handler
+
+
+@pytest.fixture
+def handler(users_table):
+    users_table.put_item(Item={'userId': 'u1', 'email': 'u1@example.com', 'schemaVersion': 2,
+                               'preferences': {'theme': 'light'}, 'version': 1})
+    return load_handler('user_lambda')
+
+
+def update_event(preferences, version=None):
+    body = {'preferences': preferences}
+    if version is not None:
+        body['version'] = version
+    return {'httpMethod': 'PUT', 'path': '/profile', 'body': json.dumps(body),
+            'requestContext': {'authorizer': {'userId': 'u1'}}}
+
+
+def bump_version(users_table, theme):
+    """A write from another container"""
+    users_table.update_item(
+        Key={'userId': 'u1'},
+        UpdateExpression='SET preferences = :prefs ADD #version :one',
+        ExpressionAttributeNames={'#version': 'version'},
+        ExpressionAttributeValues={':prefs': {'theme': theme}, ':one': 1}
+    )
+
+
+def stored(users_table):
+    return users_table.get_item(Key={'userId': 'u1'})['Item']
+
+
+def test_cache_entries_expire_and_least_recent_is_evicted(aws, monkeypatch):
+    handler = load_handler('user_lambda')
+    monkeypatch.setattr(handler, 'time', Clock(1000))
+    cache = handler.ProfileCache(size=2, ttl=60)
+    
+    cache.put('a', {'userId': 'a'})
+    cache.put('b', {'userId': 'b'})
+    cache.get('a')
+    cache.put('c', {'userId': 'c'})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'userId': 'a'}
+    
+    handler.time.now = 1061
+    assert cache.get('a') is None
+    cache.put('c', {'userId': 'c'})
+    cache.invalidate('c')
+    assert cache.get('c') is None
+
+
+def test_update_with_current_version_writes_through_cache(handler, users_table):
+    response = handler.lambda_handler(update_event({'theme': 'dark'}, version=1), None)
+    
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['version'] == 2
+    assert stored(users_table)['preferences'] == {'theme': 'dark'}
+    assert handler.profile_cache.get('u1')['version'] == 2
+
+
+def test_stale_client_version_gets_409_without_retry(handler, users_table):
+    handler.load_profile('u1')
+    bump_version(users_table, 'blue')
+    
+    response = handler.lambda_handler(update_event({'theme': 'dark'}, version=1), None)
+    
+    assert response['statusCode'] == 409
+    assert stored(users_table)['preferences'] == {'theme': 'blue'}
+    assert handler.profile_cache.get('u1') is None
+
+
+def test_stale_cache_is_invalidated_and_retried_once(handler, users_table):
+    handler.load_profile('u1')
+    bump_version(users_table, 'blue')
+    
+    response = handler.lambda_handler(update_event({'theme': 'dark'}), None)
+    
+    assert response['statusCode'] == 200
+    assert stored(users_table)['version'] == 3
+    assert stored(users_table)['preferences'] == {'theme': 'dark'}
+    assert handler.profile_cache.get('u1')['version'] == 3
+
+
+@pytest.mark.parametrize('conflicts, status', [(1, 200), (2, 409)])
+def test_concurrent_write_between_read_and_update(handler, users_table, monkeypatch, conflicts, status):
+    write_preferences = handler.write_preferences
+    attempts = []
+    
+    def write_after_another_container(user_id, preferences, version):
+        attempts.append(version)
+        if len(attempts) <= conflicts:
+            bump_version(users_table, f'other-{len(attempts)}')
+        return write_preferences(user_id, preferences, version)
+    
+    monkeypatch.setattr(handler, 'write_preferences', write_after_another_container)
+    
+    response = handler.lambda_handler(update_event({'theme': 'dark'}), None)
+    
+    assert response['statusCode'] == status
+    # One retry at most, each from a fresh read of the table
+    assert attempts == [1, 2]
+    if status == 200:
+        assert stored(users_table)['preferences'] == {'theme': 'dark'}
+    else:
+        assert stored(users_table)['preferences'] == {'theme': 'other-2'}
+        assert handler.profile_cache.get('u1') is None
@@ -0,0 +1,83 @@
+"""
+user_lambda progress pagination cursors against moto's DynamoDB
+"""
+
+import base64
+import json
+
+import pytest
+
+from conftest import load_handler
+
+
+def progress_event(user_id, **params):
+    return {'httpMethod': 'GET', 'path': '/progress', 'queryStringParameters': params,
+            'requestContext': {'authorizer': {'userId': user_id}}}
+
+
+def add_lessons(progress_table, user_id, count):
+    for i in range(count):
+        progress_table.put_item(Item={'userId': user_id, 'lessonId': f'python_beginner_topic{i}_1', 'attempts': 1})
+
+
+def first_page_cursor(handler, user_id):
+    response = handler.lambda_handler(progress_event(user_id, limit='2'), None)
+    return json.loads(response['body'])['pagination']['lastKey']
+
+
+def test_cursor_resumes_after_the_last_lesson(progress_table):
+    add_lessons(progress_table, 'u1', 3)
+    handler = load_handler('user_lambda')
+    
+    response = handler.lambda_handler(progress_event('u1', limit='2', lastKey=first_page_cursor(handler, 'u1')), None)
+    
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert [lesson['lessonId'] for lesson in body['lessons']] == ['python_beginner_topic2_1']
+    assert body['pagination'] == {'hasMore': False}
+
+
+def test_tampered_cursor_is_rejected(progress_table):
+    add_lessons(progress_table, 'u1', 3)
+    handler = load_handler('user_lambda')
+    cursor = first_page_cursor(handler, 'u1')
+    
+    # Point the key at another lesson but keep the signature
+    decoded = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    payload, signature = decoded.rsplit('.', 1)
+    payload = payload.replace('topic1', 'topic0')
+    forged = base64.urlsafe_b64encode(f'{payload}.{signature}'.encode()).decode().rstrip('=')
+    
+    with pytest.raises(ValueError, match='signature'):
+        handler.decode_cursor(forged, 'u1', 'all')
+    assert handler.lambda_handler(progress_event('u1', lastKey=forged), None)['statusCode'] == 400
+
+
+@pytest.mark.parametrize('cursor', ['!!!', 'abc', 'bm8tc2lnbmF0dXJl'])
+def test_malformed_cursor_is_rejected(aws, cursor):
+    handler = load_handler('user_lambda')
+    
+    with pytest.raises(ValueError):
+        handler.decode_cursor(cursor, 'u1', 'all')
+
+
+def test_cursor_from_another_user_or_query_is_rejected(progress_table):
+    add_lessons(progress_table, 'u1', 3)
+    handler = load_handler('user_lambda')
+    cursor = first_page_cursor(handler, 'u1')
+    
+    with pytest.raises(ValueError, match='different query'):
+        handler.decode_cursor(cursor, 'u2', 'all')
+    with pytest.raises(ValueError, match='different query'):
+        handler.decode_cursor(cursor, 'u1', 'in_progress')
+    response = handler.lambda_handler(progress_event('u2', lastKey=cursor), None)
+    assert response['statusCode'] == 400
+
+
+def test_missing_secret_only_fails_cursor_requests(progress_table, monkeypatch):
+    add_lessons(progress_table, 'u1', 3)
+    monkeypatch.delenv('PROGRESS_CURSOR_SECRET')
+    handler = load_handler('user_lambda')
+    
+    assert handler.lambda_handler(progress_event('u1', limit='5'), None)['statusCode'] == 200
+    assert handler.lambda_handler(progress_event('u1', limit='2'), None)['statusCode'] == 500
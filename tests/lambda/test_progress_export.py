@@ -0,0 +1,72 @@
+"""
+user_lambda progress export against moto's DynamoDB
+"""
+
+import json
+
+from conftest import load_handler
+
+
+def export_event(user_id):
+    return {'httpMethod': 'GET', 'path': '/progress/export',
+            'requestContext': {'authorizer': {'userId': user_id}}}
+
+
+def test_export_returns_every_lesson_in_order(progress_table):
+    lesson_ids = ['c_beginner_pointers_1', 'java_beginner_loops_1', 'python_advanced_async_1',
+                  'python_beginner_variables_1', 'rust_beginner_ownership_1', 'zig_beginner_intro_1']
+    for lesson_id in reversed(lesson_ids):
+        progress_table.put_item(Item={'userId': 'u1', 'lessonId': lesson_id, 'attempts': 2, 'status': 'in_progress'})
+    progress_table.put_item(Item={'userId': 'u2', 'lessonId': 'python_beginner_loops_1', 'attempts': 1})
+    handler = load_handler('user_lambda')
+    
+    response = handler.lambda_handler(export_event('u1'), None)
+    
+    assert response['statusCode'] == 200
+    items = [json.loads(line) for line in response['body'].splitlines()]
+    assert [item['lessonId'] for item in items] == lesson_ids
+    assert items[0] == {'lessonId': 'c_beginner_pointers_1', 'attempts': 2, 'status': 'in_progress'}
+
+
+def test_lessons_at_range_boundaries_are_exported_once(progress_table):
+    # Range bounds are "<language>_" prefixes; IDs equal to or either side of one
+    lesson_ids = ['a', 'c', 'c_', 'c_beginner_pointers_1', 'java', 'java_', 'java`', 'javascript_',
+                  'python_', 'rust_', 'typescript_beginner_types_1', 'zzz']
+    for lesson_id in lesson_ids:
+        progress_table.put_item(Item={'userId': 'u1', 'lessonId': lesson_id})
+    handler = load_handler('user_lambda')
+    
+    response = handler.lambda_handler(export_event('u1'), None)
+    
+    assert [json.loads(line)['lessonId'] for line in response['body'].splitlines()] == lesson_ids
+
+
+def test_large_export_continues_from_cursor(progress_table, monkeypatch):
+    lesson_ids = sorted(f'{language}_beginner_topic{i}_1' for language in ['c', 'java', 'python', 'rust']
+                        for i in range(5))
+    for lesson_id in lesson_ids:
+        progress_table.put_item(Item={'userId': 'u1', 'lessonId': lesson_id, 'attempts': 1})
+    handler = load_handler('user_lambda')
+    monkeypatch.setattr(handler, 'EXPORT_MAX_BYTES', 250)
+    
+    exported = []
+    pages = 0
+    event = export_event('u1')
+    while True:
+        response = handler.lambda_handler(event, None)
+        assert response['statusCode'] == 200
+        body = response['body']
+        assert len(body) <= 250
+        exported += [json.loads(line)['lessonId'] for line in body.splitlines()]
+        pages += 1
+        cursor = response['headers'].get(handler.EXPORT_CURSOR_HEADER)
+        if not cursor:
+            break
+        event = dict(export_event('u1'), queryStringParameters={'cursor': cursor})
+    
+    assert exported == lesson_ids
+    assert pages > 2
+    
+    # Cursors are bound to the user, like pagination cursors
+    foreign = dict(export_event('u2'), queryStringParameters={'cursor': event['queryStringParameters']['cursor']})
+    assert handler.lambda_handler(foreign, None)['statusCode'] == 400
@@ -0,0 +1,42 @@
+"""
+validation_lambda progress recording from the events table stream
+"""
+
+from boto3.dynamodb.types import TypeSerializer
+
+from conftest import load_handler
+
+LESSON_ID = 'python_beginner_loops_1700000000'
+
+
+def stream_record(event_name, item):
+    serializer = TypeSerializer()
+    return {
+        'eventName': event_name,
+        'dynamodb': {'NewImage': {name: serializer.serialize(value) for name, value in item.items()}}
+    }
+
+
+def test_done_event_records_progress_without_a_client_read(progress_table, events_table):
+    recorder = load_handler('validation_lambda', 'progress_recorder')
+    events_table.put_item(Item={
+        'executionId': 'exec-1', 'seq': 0, 'type': 'started', 'userId': 'u1',
+        'lessonId': LESSON_ID, 'testHashes': {'test_a': 'h1'}, 'language': 'python'
+    })
+    done = {
+        'executionId': 'exec-1', 'seq': 1000000, 'type': 'done', 'passed': True,
+        'results': [{'name': 'test_a', 'passed': True}]
+    }
+    test_event = {'executionId': 'exec-1', 'seq': 1, 'type': 'test', 'name': 'test_a', 'passed': True}
+    
+    stream = {'Records': [stream_record('INSERT', test_event), stream_record('INSERT', done)]}
+    assert recorder.lambda_handler(stream, None) == {'recorded': 1}
+    # Redelivered by the stream: the execution is only counted once
+    recorder.lambda_handler(stream, None)
+    
+    lesson = progress_table.get_item(Key={'userId': 'u1', 'lessonId': LESSON_ID})['Item']
+    assert lesson['completed'] is True
+    assert lesson['attempts'] == 1
+    assert lesson['testResults'] == {'h1': True}
+    summary = progress_table.get_item(Key={'userId': 'u1#summary', 'lessonId': 'summary'})['Item']
+    assert summary['completedLessons'] == 1
@@ -0,0 +1,82 @@
+"""
+validation_lambda progress tracking against moto's DynamoDB
+"""
+
+from conftest import load_handler
+
+
+def get_item(table, user_id, lesson_id):
+    return table.get_item(Key={'userId': user_id, 'lessonId': lesson_id}).get('Item')
+
+
+def test_attempt_and_summary_are_written(progress_table):
+    handler = load_handler('validation_lambda')
+    
+    handler.track_progress('u1', 'python_beginner_variables', 'exec-1', False,
+                           {'test_a': 'h1'}, [{'name': 'test_a', 'passed': False}])
+    
+    lesson = get_item(progress_table, 'u1', 'python_beginner_variables')
+    assert lesson['attempts'] == 1
+    assert lesson['firstAttemptSuccess'] is False
+    assert lesson['testResults'] == {'h1': False}
+    
+    summary = get_item(progress_table, 'u1#summary', 'summary')
+    assert summary['totalAttempts'] == 1
+    assert summary['lastLessonId'] == 'python_beginner_variables'
+    assert len(summary['activeDays']) == 1
+
+
+def test_completion_updates_summary_once(progress_table):
+    handler = load_handler('validation_lambda')
+    
+    handler.track_progress('u1', 'python_beginner_variables', 'exec-1', False, {}, [])
+    handler.track_progress('u1', 'python_beginner_variables', 'exec-2', True, {}, [])
+    # Already completed, and a repeat of a recorded execution: neither is written
+    handler.track_progress('u1', 'python_beginner_variables', 'exec-3', True, {}, [])
+    handler.track_progress('u1', 'python_beginner_variables', 'exec-2', True, {}, [])
+    
+    lesson = get_item(progress_table, 'u1', 'python_beginner_variables')
+    assert lesson['attempts'] == 2
+    assert lesson['completed'] is True
+    assert lesson['status'] == 'completed'
+    
+    summary = get_item(progress_table, 'u1#summary', 'summary')
+    assert summary['totalAttempts'] == 2
+    assert summary['completedLessons'] == 1
+    assert summary['completedLanguage#python'] == 1
+    assert summary['completedLevel#beginner'] == 1
+
+
+def test_topic_and_language_are_written(progress_table):
+    handler = load_handler('validation_lambda')
+    lesson_id = 'java_intermediate_for_loops_1700000000'
+    
+    handler.track_progress('u1', lesson_id, 'exec-1', True, {}, [], 'java')
+    
+    lesson = get_item(progress_table, 'u1', lesson_id)
+    assert lesson['language'] == 'java'
+    assert lesson['topic'] == 'for loops'
+    
+    # CompletedIndex serves ?status=completed with the same fields
+    completed = progress_table.query(
+        IndexName='CompletedIndex',
+        KeyConditionExpression='userId = :uid',
+        ExpressionAttributeValues={':uid': 'u1'}
+    )['Items']
+    assert [(item['topic'], item['language']) for item in completed] == [('for loops', 'java')]
+
+
+def test_cached_results_never_complete_or_carry_over(progress_table):
+    handler = load_handler('validation_lambda')
+    hashes = {'test_a': 'h1', 'test_b': 'h2'}
+    
+    handler.track_progress('u1', 'python_beginner_variables', 'exec-1', True, hashes,
+                           [{'name': 'test_a', 'passed': True},
+                            {'name': 'test_b', 'passed': True, 'cached': True}])
+    
+    lesson = get_item(progress_table, 'u1', 'python_beginner_variables')
+    assert 'completedAt' not in lesson
+    assert lesson['testResults'] == {'h1': True}
+    assert handler.get_known_passing('u1', 'python_beginner_variables',
+                                     ['def test_a(): pass', 'def test_b(): pass'], hashes) == [0]
+    assert 'completedLessons' not in get_item(progress_table, 'u1#summary', 'summary')
@@ -0,0 +1,44 @@
+#!/bin/bash
+
+# Adds CompletedIndex to a progress table created before it existed
+# (quick-start-scripts.sh creates new tables with it). The user Lambda's
+# ?status=completed queries fail until the index is ACTIVE. DynamoDB
+# backfills it from existing items; safe to re-run.
+
+source config/dev-config.sh
+
+echo "📇 Adding CompletedIndex to $PROGRESS_TABLE"
+echo "=========================================="
+echo ""
+
+INDEX_STATUS=$(aws dynamodb describe-table \
+    --table-name $PROGRESS_TABLE \
+    --query "Table.GlobalSecondaryIndexes[?IndexName=='CompletedIndex'].IndexStatus | [0]" \
+    --output text \
+    --region $AWS_REGION) || exit 1
+
+if [ "$INDEX_STATUS" = "None" ]; then
+    # Same key schema and projection as quick-start-scripts.sh
+    aws dynamodb update-table \
+        --table-name $PROGRESS_TABLE \
+        --attribute-definitions AttributeName=userId,AttributeType=S AttributeName=completedAt,AttributeType=N \
+        --global-secondary-index-updates '[{"Create":{"IndexName":"CompletedIndex","KeySchema":[{"AttributeName":"userId","KeyType":"HASH"},{"AttributeName":"completedAt","KeyType":"RANGE"}],"Projection":{"ProjectionType":"INCLUDE","NonKeyAttributes":["topic","language","status","completed","attempts","firstAttemptSuccess"]}}}]' \
+        --region $AWS_REGION > /dev/null || exit 1
+    echo "  ✅ Index creation started"
+else
+    echo "  ℹ️  Index already exists ($INDEX_STATUS)"
+fi
+
+# Backfilling takes a while on large tables
+while [ "$INDEX_STATUS" != "ACTIVE" ]; do
+    sleep 15
+    INDEX_STATUS=$(aws dynamodb describe-table \
+        --table-name $PROGRESS_TABLE \
+        --query "Table.GlobalSecondaryIndexes[?IndexName=='CompletedIndex'].IndexStatus | [0]" \
+        --output text \
+        --region $AWS_REGION)
+    echo "  ⏳ $INDEX_STATUS"
+done
+
+echo ""
+echo "✅ CompletedIndex is ACTIVE"
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Rebuild per-user progress summary items from their lesson items
+The summary item (see docs/dynamodb-schemas.md) only counts progress written
+after it was introduced; this recomputes its counters from every lesson item
+so users with earlier progress see correct totals.
+
+Usage:
+    python3 tools/backfill_progress_summary.py --table codelearn-progress-dev --dry-run
+    python3 tools/backfill_progress_summary.py --table codelearn-progress-dev --segments 8 --writes-per-second 50
+
+Users are found with a parallel segmented scan. Each user's lesson items are
+then re-read consistently and the summary is written on the condition that
+no submission changed it since it was read, so it can run against a live table
+and be re-run safely.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Set
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from migrate_users import MAX_RETRIES, RateLimiter
+
+SUMMARY_SUFFIX = '#summary'
+# Same as validation_lambda/handler.py:LESSON_LEVELS
+LESSON_LEVELS = ['beginner', 'intermediate', 'advanced', 'experienced']
+
+local = threading.local()
+
+
+def progress_table(args: argparse.Namespace) -> Any:
+    """This thread's table; resources aren't thread-safe, so each worker gets its own session"""
+    if not hasattr(local, 'table'):
+        local.table = boto3.session.Session().resource('dynamodb').Table(args.table)
+    return local.table
+
+
+def scan_users(args: argparse.Namespace, segment: int) -> Set[str]:
+    """User IDs with lesson items in one scan segment"""
+    table = progress_table(args)
+    scan_params = {
+        'Segment': segment,
+        'TotalSegments': args.segments,
+        'ProjectionExpression': 'userId',
+        'Limit': args.page_size
+    }
+    users = set()
+    
+    while True:
+        response = table.scan(**scan_params)
+        users.update(item['userId'] for item in response.get('Items', [])
+                     if not item['userId'].endswith(SUMMARY_SUFFIX))
+        if 'LastEvaluatedKey' not in response:
+            return users
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def load_lessons(table: Any, user_id: str) -> list:
+    """All of a user's lesson items, read consistently"""
+    query_params = {
+        'KeyConditionExpression': Key('userId').eq(user_id),
+        'ProjectionExpression': 'lessonId, #language, attempts, completedAt',
+        'ExpressionAttributeNames': {'#language': 'language'},
+        'ConsistentRead': True
+    }
+    lessons = []
+    
+    while True:
+        response = table.query(**query_params)
+        lessons.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return lessons
+        query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def summarize(lessons: list, summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Counters as the validation lambda would have maintained them for these lessons"""
+    counts = {'completedLessons': 0, 'totalAttempts': 0}
+    active_days = set(int(day) for day in summary.get('activeDays', set()))
+    last_completed = None
+    
+    for lesson in lessons:
+        counts['totalAttempts'] += int(lesson.get('attempts', 0))
+        if 'completedAt' not in lesson:
+            continue
+        
+        lesson_id = lesson['lessonId']
+        parts = lesson_id.split('_')
+        counts['completedLessons'] += 1
+        language = f"completedLanguage#{lesson.get('language') or parts[0]}"
+        counts[language] = counts.get(language, 0) + 1
+        if len(parts) > 1 and parts[1] in LESSON_LEVELS:
+            level = f'completedLevel#{parts[1]}'
+            counts[level] = counts.get(level, 0) + 1
+        
+        completed_at = int(lesson['completedAt'])
+        active_days.add(completed_at // 86400)
+        if last_completed is None or completed_at > last_completed[0]:
+            last_completed = (completed_at, lesson_id)
+    
+    result = {'counts': counts, 'activeDays': active_days}
+    if 'lastActivityAt' in summary:
+        result['lastActivityAt'] = int(summary['lastActivityAt'])
+        result['lastLessonId'] = summary.get('lastLessonId')
+    if last_completed and last_completed[0] > result.get('lastActivityAt', 0):
+        result['lastActivityAt'], result['lastLessonId'] = last_completed
+    return result
+
+
+def backfill_user(args: argparse.Namespace, user_id: str, limiter: RateLimiter) -> str:
+    """Rewrite one user's summary unless a submission changes it meanwhile"""
+    table = progress_table(args)
+    key = {'userId': f'{user_id}{SUMMARY_SUFFIX}', 'lessonId': 'summary'}
+    
+    for _ in range(MAX_RETRIES):
+        summary = table.get_item(Key=key, ConsistentRead=True).get('Item', {})
+        rebuilt = summarize(load_lessons(table, user_id), summary)
+        if all(int(summary.get(name, 0)) == count for name, count in rebuilt['counts'].items()):
+            return 'current'
+        if args.dry_run:
+            return 'rebuilt'
+        
+        names = {}
+        values = {}
+        updates = []
+        for index, (name, count) in enumerate(rebuilt['counts'].items()):
+            names[f'#c{index}'] = name
+            values[f':c{index}'] = count
+            updates.append(f'#c{index} = :c{index}')
+        if rebuilt['activeDays']:
+            updates.append('activeDays = :days')
+            values[':days'] = rebuilt['activeDays']
+        if 'lastActivityAt' in rebuilt:
+            updates += ['lastActivityAt = :at', 'lastLessonId = :lesson']
+            values.update({':at': rebuilt['lastActivityAt'], ':lesson': rebuilt['lastLessonId']})
+        
+        # Every submission adds to totalAttempts, so an unchanged value means no writes since the read
+        if summary:
+            condition = 'totalAttempts = :seenAttempts'
+            values[':seenAttempts'] = summary.get('totalAttempts', 0)
+        else:
+            condition = 'attribute_not_exists(userId)'
+        
+        limiter.acquire()
+        try:
+            table.update_item(
+                Key=key,
+                UpdateExpression=f"SET {', '.join(updates)}",
+                ConditionExpression=condition,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+            return 'rebuilt'
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"Failed to backfill {user_id}: {e}")
+                return 'failed'
+    
+    return 'failed'
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Rebuild progress summary items from lesson items')
+    parser.add_argument('--table', default=os.environ.get('PROGRESS_TABLE', 'codelearn-progress-dev'))
+    parser.add_argument('--segments', type=int, default=4, help='Parallel scan segments (one thread each)')
+    parser.add_argument('--writes-per-second', type=float, default=25, help='Cap across all users')
+    parser.add_argument('--page-size', type=int, default=100, help='Items per scan request')
+    parser.add_argument('--dry-run', action='store_true', help='Count summaries to rebuild without writing')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    limiter = RateLimiter(args.writes_per_second)
+    
+    print(f"Backfilling summaries in {args.table} "
+          f"({args.segments} segments, {args.writes_per_second:g} writes/s{', dry run' if args.dry_run else ''})")
+    
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=args.segments) as pool:
+        users = set().union(*pool.map(lambda segment: scan_users(args, segment), range(args.segments)))
+        results = list(pool.map(lambda user_id: backfill_user(args, user_id, limiter), sorted(users)))
+    
+    totals = {key: results.count(key) for key in ('rebuilt', 'current', 'failed')}
+    print(f"Done in {time.time() - started:.1f}s: {len(users)} users, "
+          + ', '.join(f"{key} {value}" for key, value in totals.items()))
+    sys.exit(1 if totals['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
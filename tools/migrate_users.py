@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Migrate users table items to the current schema (see shared/user_store.py)
+Scans the table in parallel segments and rewrites schema 1 items
+(user_id/created_at/last_login) with schema 2 names, at a capped write rate
+so the migration doesn't starve the live application of capacity.
+
+Usage:
+    python3 tools/migrate_users.py --table codelearn-users-dev --dry-run
+    python3 tools/migrate_users.py --table codelearn-users-dev --segments 8 --writes-per-second 50
+
+Items are rewritten in place when the table is keyed by userId. A table
+keyed by user_id can't hold schema 2 items; pass --target-table to copy
+the users into a new table keyed by userId instead.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from user_store import SCHEMA_VERSION, LEGACY_ATTRIBUTES, needs_migration, normalize, put_if_absent
+
+MAX_RETRIES = 3  # Per item, when a login changes it between scan and write
+
+
+class RateLimiter:
+    """Token bucket shared by all segment workers"""
+    
+    def __init__(self, per_second: float):
+        self.per_second = per_second
+        self.tokens = per_second
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.per_second, self.tokens + (now - self.updated) * self.per_second)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.per_second
+            time.sleep(wait)
+
+
+def migrate_segment(args: argparse.Namespace, segment: int, limiter: RateLimiter) -> Dict[str, int]:
+    """Scan one segment and migrate its schema 1 items"""
+    # Resources aren't thread-safe, so each worker gets its own session
+    dynamodb = boto3.session.Session().resource('dynamodb')
+    table = dynamodb.Table(args.table)
+    target = dynamodb.Table(args.target_table) if args.target_table else None
+    counts = {'scanned': 0, 'migrated': 0, 'current': 0, 'skipped': 0, 'failed': 0}
+    
+    scan_params = {'Segment': segment, 'TotalSegments': args.segments, 'Limit': args.page_size}
+    while True:
+        response = table.scan(**scan_params)
+        
+        for item in response.get('Items', []):
+            counts['scanned'] += 1
+            if target is None and not needs_migration(item):
+                counts['current'] += 1
+                continue
+            
+            if args.dry_run:
+                counts['migrated'] += 1
+                continue
+            
+            limiter.acquire()
+            try:
+                result = copy_item(target, item) if target else migrate_in_place(table, item)
+                counts[result] += 1
+            except ClientError as e:
+                print(f"Segment {segment}: failed to migrate {item.get('userId') or item.get('user_id')}: {e}")
+                counts['failed'] += 1
+        
+        if 'LastEvaluatedKey' not in response:
+            return counts
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def migrate_in_place(table: Any, item: Dict[str, Any]) -> str:
+    """Rename an item's schema 1 attributes unless a login changed it since it was read"""
+    if 'userId' not in item:
+        print(f"Skipping {item.get('user_id')}: table is not keyed by userId (use --target-table)")
+        return 'skipped'
+    
+    for _ in range(MAX_RETRIES):
+        user = normalize(item)
+        removed = [legacy for legacy in LEGACY_ATTRIBUTES if legacy in item]
+        updates = ['schemaVersion = :schema']
+        values = {':schema': SCHEMA_VERSION}
+        for attribute in ('createdAt', 'lastLogin'):
+            if attribute in user:
+                updates.append(f'{attribute} = :{attribute}')
+                values[f':{attribute}'] = user[attribute]
+        
+        # Unchanged since the scan: lastLogin is the only attribute logins overwrite
+        if 'lastLogin' in item:
+            condition = 'lastLogin = :seenLogin'
+            values[':seenLogin'] = item['lastLogin']
+        else:
+            condition = 'attribute_exists(userId) AND attribute_not_exists(lastLogin)'
+        
+        expression = f"SET {', '.join(updates)}"
+        if removed:
+            expression += f" REMOVE {', '.join(removed)}"
+        
+        try:
+            table.update_item(
+                Key={'userId': item['userId']},
+                UpdateExpression=expression,
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values
+            )
+            return 'migrated'
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            item = table.get_item(Key={'userId': item['userId']}, ConsistentRead=True).get('Item')
+            if not item:
+                return 'skipped'
+            if not needs_migration(item):
+                return 'current'
+    
+    return 'failed'
+
+
+def copy_item(target: Any, item: Dict[str, Any]) -> str:
+    """Write the schema 2 form of item into the target table, keeping any newer copy"""
+    user = normalize(item)
+    if 'userId' not in user:
+        return 'skipped'
+    return 'migrated' if put_if_absent(target, user) else 'current'
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Migrate users table items to schema 2')
+    parser.add_argument('--table', default=os.environ.get('USERS_TABLE', 'codelearn-users-dev'))
+    parser.add_argument('--target-table', help='Copy into this table (keyed by userId) instead of in place')
+    parser.add_argument('--segments', type=int, default=4, help='Parallel scan segments (one thread each)')
+    parser.add_argument('--writes-per-second', type=float, default=25, help='Cap across all segments')
+    parser.add_argument('--page-size', type=int, default=100, help='Items per scan request')
+    parser.add_argument('--dry-run', action='store_true', help='Count items to migrate without writing')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    limiter = RateLimiter(args.writes_per_second)
+    
+    print(f"Migrating {args.table}{' -> ' + args.target_table if args.target_table else ''} "
+          f"({args.segments} segments, {args.writes_per_second:g} writes/s{', dry run' if args.dry_run else ''})")
+    
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=args.segments) as pool:
+        results = list(pool.map(lambda segment: migrate_segment(args, segment, limiter), range(args.segments)))
+    
+    totals = {key: sum(result[key] for result in results) for key in results[0]}
+    print(f"Done in {time.time() - started:.1f}s: " + ', '.join(f"{key} {value}" for key, value in totals.items()))
+    sys.exit(1 if totals['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -43,6 +43,44 @@ function update_function {
     cd ..
 }
 
+# Signs progress pagination cursors; every container must share it, so it
+# is generated once and kept in config/dev-config.sh
+function ensure_cursor_secret {
+    if [ -z "$PROGRESS_CURSOR_SECRET" ]; then
+        export PROGRESS_CURSOR_SECRET=$(python3 -c 'import secrets; print(secrets.token_hex(32))')
+        echo "export PROGRESS_CURSOR_SECRET=\"$PROGRESS_CURSOR_SECRET\"" >> config/dev-config.sh
+        echo "🔑 Generated PROGRESS_CURSOR_SECRET (saved to config/dev-config.sh)"
+    fi
+}
+
+function configure_user_function {
+    ensure_cursor_secret
+    
+    # Configuration can't change while the code update is still in progress
+    aws lambda wait function-updated --function-name CodeLearn-User --region $AWS_REGION
+    
+    # --environment replaces every variable, so merge ours into the current ones
+    local current=$(aws lambda get-function-configuration \
+        --function-name CodeLearn-User \
+        --query 'Environment.Variables' \
+        --output json \
+        --region $AWS_REGION)
+    local environment=$(CURRENT="$current" USERS_TABLE="$USERS_TABLE" PROGRESS_TABLE="$PROGRESS_TABLE" \
+        PROGRESS_CURSOR_SECRET="$PROGRESS_CURSOR_SECRET" python3 -c '
+import json, os
+variables = json.loads(os.environ["CURRENT"] or "null") or {}
+for name in ("USERS_TABLE", "PROGRESS_TABLE", "PROGRESS_CURSOR_SECRET"):
+    variables[name] = os.environ[name]
+print(json.dumps({"Variables": variables}))')
+    
+    aws lambda update-function-configuration \
+        --function-name CodeLearn-User \
+        --environment "$environment" \
+        --region $AWS_REGION > /dev/null
+    
+    echo "✅ CodeLearn-User configured"
+}
+
 case "$1" in
     lesson)
         update_function "lesson_lambda" "CodeLearn-Lesson"
@@ -52,11 +90,13 @@ case "$1" in
         ;;
     user)
         update_function "user_lambda" "CodeLearn-User"
+        configure_user_function
         ;;
     all)
         update_function "lesson_lambda" "CodeLearn-Lesson"
         update_function "validation_lambda" "CodeLearn-Validation"
         update_function "user_lambda" "CodeLearn-User"
+        configure_user_function
         ;;
     *)
         show_help
@@ -63,6 +63,13 @@ def validate_lesson(filepath: Path) -> list:
                     if 'TODO' in test or ('assert True' in test and len(test) < 100):
                         errors.append(f"Test {i+1} appears to be a placeholder")
         
+        # Check optional test runner
+        if 'runner' in lesson:
+            if lesson['runner'] not in ['pytest', 'simple']:
+                errors.append("Runner must be 'pytest' or 'simple'")
+            elif lesson['runner'] == 'simple' and any('pytest' in test for test in lesson.get('tests', [])):
+                errors.append("Runner 'simple' cannot run tests that use pytest")
+        
     except json.JSONDecodeError as e:
         errors.append(f"Invalid JSON: {e}")
     except Exception as e:
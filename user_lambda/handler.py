@@ -1,17 +1,84 @@
+import base64
+import hashlib
+import hmac
 import json
 import os
 import boto3
 import time
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 
+from user_store import SCHEMA_VERSION, get_user, normalize, put_if_absent
+
 dynamodb = boto3.resource('dynamodb')
+# Export threads share a low-level client (resources aren't thread-safe), which
+# takes and returns DynamoDB-typed values rather than plain Python ones
+dynamodb_client = boto3.client('dynamodb')
+deserializer = TypeDeserializer()
 users_table = dynamodb.Table(os.environ.get('USERS_TABLE', 'codelearn-users-dev'))
 progress_table = dynamodb.Table(os.environ.get('PROGRESS_TABLE', 'codelearn-progress-dev'))
 
 # Configuration
 MAX_PROGRESS_ITEMS = 100  # Maximum items to return in progress query
+# Sparse GSI (userId, completedAt): only completed lessons have completedAt
+COMPLETED_INDEX = os.environ.get('PROGRESS_COMPLETED_INDEX', 'CompletedIndex')
+# Fields the progress views render; testResults and lastExecutionId stay server-side
+PROGRESS_FIELDS = ['lessonId', 'topic', 'language', 'status', 'completed', 'attempts',
+                   'firstAttemptSuccess', 'completedAt']
+PROGRESS_STATUSES = ['all', 'completed', 'in_progress']
+# Signs pagination cursors; every container must use the same secret, or a
+# cursor from one is rejected by another (set by tools/update-lambda.sh).
+# Without it only requests that issue or read a cursor fail
+CURSOR_SECRET = os.environ.get('PROGRESS_CURSOR_SECRET', '').encode()
+# Export queries lesson ID ranges in parallel, split at each lesson language prefix
+# ("<language>_<level>_<topic>_<timestamp>", see lesson_lambda)
+EXPORT_RANGE_BOUNDARIES = [f'{language}_' for language in
+                           sorted(['python', 'java', 'rust', 'javascript', 'typescript', 'go', 'c', 'cpp'])]
+EXPORT_WORKERS = 4
+# Lambda proxy responses are capped at 6MB; larger exports continue from a cursor
+EXPORT_MAX_BYTES = 5 * 1024 * 1024
+EXPORT_CURSOR_HEADER = 'X-Export-Cursor'
 ALLOWED_PREFERENCE_KEYS = ['theme', 'language', 'notifications', 'difficulty', 'autoSave']
+# Warm-container profile cache. Entries expire so writes made by other
+# containers (and lastLogin from auth_lambda) show up within the TTL
+PROFILE_CACHE_SIZE = int(os.environ.get('PROFILE_CACHE_SIZE', '256'))
+PROFILE_CACHE_TTL = int(os.environ.get('PROFILE_CACHE_TTL', '60'))
+
+
+class ProfileCache:
+    """Least-recently-used user items by userId, each with the time it was cached"""
+    
+    def __init__(self, size: int, ttl: int):
+        self.size = size
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+    
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        cached_at, profile = entry
+        if time.time() - cached_at > self.ttl:
+            del self.entries[user_id]
+            return None
+        self.entries.move_to_end(user_id)
+        return profile
+    
+    def put(self, user_id: str, profile: Dict[str, Any]) -> None:
+        self.entries[user_id] = (time.time(), profile)
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+    
+    def invalidate(self, user_id: str) -> None:
+        self.entries.pop(user_id, None)
+
+
+profile_cache = ProfileCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL)
 
 
 def validate_preferences(preferences: Dict[str, Any]) -> Optional[str]:
@@ -65,6 +132,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return create_profile(event)
         elif http_method == 'PUT' and '/profile' in path:
             return update_profile(event)
+        elif http_method == 'PATCH' and '/profile' in path:
+            return patch_preferences(event)
+        elif http_method == 'GET' and '/progress/export' in path:
+            return export_progress(event)
+        elif http_method == 'GET' and '/progress/summary' in path:
+            return get_progress_summary(event)
         elif http_method == 'GET' and '/progress' in path:
             return get_progress(event)
         else:
@@ -85,10 +158,9 @@ def get_profile(event: Dict[str, Any]) -> Dict[str, Any]:
         return error_response(401, str(e))
     
     try:
-        response = users_table.get_item(Key={'userId': user_id})
+        user = load_profile(user_id)
         
-        if 'Item' in response:
-            user = response['Item']
+        if user:
             return {
                 'statusCode': 200,
                 'headers': cors_headers(),
@@ -98,8 +170,9 @@ def get_profile(event: Dict[str, Any]) -> Dict[str, Any]:
                     'name': user.get('name'),
                     'preferences': user.get('preferences', {}),
                     'createdAt': user.get('createdAt'),
-                    'lastLogin': user.get('lastLogin')
-                })
+                    'lastLogin': user.get('lastLogin'),
+                    'version': user.get('version', 0)
+                }, default=decimal_default)
             }
         else:
             return error_response(404, 'User not found')
@@ -125,23 +198,40 @@ def update_profile(event: Dict[str, Any]) -> Dict[str, Any]:
         if validation_error:
             return error_response(400, validation_error)
         
-        # Update user preferences
-        users_table.update_item(
-            Key={'userId': user_id},
-            UpdateExpression='SET preferences = :prefs, lastLogin = :time',
-            ExpressionAttributeValues={
-                ':prefs': preferences,
-                ':time': int(time.time())
-            }
-        )
+        # Clients that send the version they read get a 409 instead of
+        # overwriting a newer profile; otherwise the latest version is used
+        client_version = body.get('version')
+        if client_version is not None and (not isinstance(client_version, int) or isinstance(client_version, bool)):
+            return error_response(400, 'Version must be an integer')
+        
+        for attempt in range(2):
+            user = load_profile(user_id)
+            if not user:
+                return error_response(404, 'User not found')
+            
+            version = client_version if client_version is not None else int(user.get('version', 0))
+            try:
+                user = write_preferences(user_id, preferences, version)
+                break
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                # The cached copy (or the client's) is out of date
+                profile_cache.invalidate(user_id)
+                if client_version is not None or attempt:
+                    return error_response(409, 'Profile was modified', 'Reload the profile and retry')
+        
+        # Write-through: the next read in this container skips DynamoDB
+        profile_cache.put(user_id, user)
         
         return {
             'statusCode': 200,
             'headers': cors_headers(),
             'body': json.dumps({
                 'message': 'Profile updated successfully',
-                'preferences': preferences
-            })
+                'preferences': user.get('preferences', {}),
+                'version': user['version']
+            }, default=decimal_default)
         }
         
     except Exception as e:
@@ -149,6 +239,151 @@ def update_profile(event: Dict[str, Any]) -> Dict[str, Any]:
         return error_response(500, 'Failed to update profile')
 
 
+def patch_preferences(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Change only the preference keys in the request; null removes a key
+    
+    Each key is its own SET/REMOVE path, so concurrent patches of different
+    keys both apply. Send `version` to make the patch conditional as well.
+    """
+    try:
+        user_id = get_user_id_from_context(event)
+    except ValueError as e:
+        return error_response(401, str(e))
+    
+    try:
+        body = json.loads(event.get('body') or '{}')
+        changes = body.get('preferences', {})
+        client_version = body.get('version')
+        
+        if not isinstance(changes, dict) or not changes:
+            return error_response(400, 'Preferences must be a non-empty JSON object')
+        if client_version is not None and (not isinstance(client_version, int) or isinstance(client_version, bool)):
+            return error_response(400, 'Version must be an integer')
+        
+        # Removals (null) only need an allowed key; values are checked as usual
+        validation_error = validate_preferences({k: v for k, v in changes.items() if v is not None})
+        removed_keys = [k for k, v in changes.items() if v is None and k not in ALLOWED_PREFERENCE_KEYS]
+        if removed_keys:
+            validation_error = f"Invalid preference keys: {', '.join(removed_keys)}"
+        if validation_error:
+            return error_response(400, validation_error)
+        
+        try:
+            user = write_preference_keys(user_id, changes, client_version)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            profile_cache.invalidate(user_id)
+            if client_version is not None:
+                return error_response(409, 'Profile was modified', 'Reload the profile and retry')
+            return error_response(404, 'User not found')
+        
+        profile_cache.put(user_id, user)
+        
+        return {
+            'statusCode': 200,
+            'headers': cors_headers(),
+            'body': json.dumps({
+                'message': 'Preferences updated successfully',
+                'preferences': user.get('preferences', {}),
+                'version': user['version']
+            }, default=decimal_default)
+        }
+        
+    except json.JSONDecodeError:
+        return error_response(400, 'Invalid JSON in request body')
+    except Exception as e:
+        print(f"Error patching preferences: {e}")
+        return error_response(500, 'Failed to update preferences')
+
+
+def write_preference_keys(user_id: str, changes: Dict[str, Any], version: Optional[int]) -> Dict[str, Any]:
+    """One update_item touching only the changed preference keys; returns the new item"""
+    sets = ['lastLogin = :time']
+    removes = []
+    names = {'#version': 'version'}
+    values = {':time': int(time.time()), ':one': 1}
+    
+    for i, (key, value) in enumerate(sorted(changes.items())):
+        names[f'#k{i}'] = key
+        if value is None:
+            removes.append(f'preferences.#k{i}')
+        else:
+            sets.append(f'preferences.#k{i} = :v{i}')
+            values[f':v{i}'] = value
+    
+    update = f"SET {', '.join(sets)}"
+    if removes:
+        update += f" REMOVE {', '.join(removes)}"
+    update += ' ADD #version :one'
+    
+    if version is None:
+        condition = 'attribute_exists(userId)'
+    elif version:
+        condition = '#version = :version'
+        values[':version'] = version
+    else:
+        condition = 'attribute_exists(userId) AND attribute_not_exists(#version)'
+    
+    try:
+        response = users_table.update_item(
+            Key={'userId': user_id},
+            UpdateExpression=update,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues='ALL_NEW'
+        )
+    except ClientError as e:
+        # Nested paths need the map to exist; only items from before
+        # preferences were always written lack it
+        if e.response['Error']['Code'] != 'ValidationException':
+            raise
+        user = get_user(users_table, user_id)
+        if not user or 'preferences' in user:
+            raise
+        merged = {k: v for k, v in changes.items() if v is not None}
+        return write_preferences(user_id, merged, version if version is not None else int(user.get('version', 0)))
+    
+    return normalize(response['Attributes'])
+
+
+def load_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """User item from the warm cache, or from the users table on a miss"""
+    user = profile_cache.get(user_id)
+    if user is None:
+        user = get_user(users_table, user_id)
+        if user:
+            profile_cache.put(user_id, user)
+    return user
+
+
+def write_preferences(user_id: str, preferences: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """Replace preferences if the item is still at version; returns the new item
+    
+    Raises ClientError (ConditionalCheckFailedException) if another write got
+    there first. Items written before versioning count as version 0.
+    """
+    if version:
+        condition = '#version = :version'
+    else:
+        condition = 'attribute_exists(userId) AND attribute_not_exists(#version)'
+    
+    values = {':prefs': preferences, ':time': int(time.time()), ':next': version + 1}
+    if version:
+        values[':version'] = version
+    
+    response = users_table.update_item(
+        Key={'userId': user_id},
+        UpdateExpression='SET preferences = :prefs, lastLogin = :time, #version = :next',
+        ConditionExpression=condition,
+        ExpressionAttributeNames={'#version': 'version'},
+        ExpressionAttributeValues=values,
+        ReturnValues='ALL_NEW'
+    )
+    return normalize(response['Attributes'])
+
+
 def get_progress(event: Dict[str, Any]) -> Dict[str, Any]:
     """Get user's learning progress with pagination"""
     try:
@@ -161,28 +396,44 @@ def get_progress(event: Dict[str, Any]) -> Dict[str, Any]:
         query_params = event.get('queryStringParameters') or {}
         limit = min(int(query_params.get('limit', '50')), MAX_PROGRESS_ITEMS)
         last_key = query_params.get('lastKey')
+        status = query_params.get('status', 'all')
+        
+        if status not in PROGRESS_STATUSES:
+            return error_response(400, f"Invalid status: {status}. Allowed: {', '.join(PROGRESS_STATUSES)}")
         
-        # Build query parameters
+        # Build query parameters, fetching only the rendered fields
         query_params = {
             'KeyConditionExpression': 'userId = :uid',
+            'ProjectionExpression': ', '.join(f'#{field}' for field in PROGRESS_FIELDS),
+            'ExpressionAttributeNames': {f'#{field}': field for field in PROGRESS_FIELDS},
             'ExpressionAttributeValues': {':uid': user_id},
             'Limit': limit
         }
         
+        if status == 'completed':
+            # Newest completions first, without reading unfinished lessons
+            query_params['IndexName'] = COMPLETED_INDEX
+            query_params['ScanIndexForward'] = False
+        elif status == 'in_progress':
+            query_params['FilterExpression'] = 'attribute_not_exists(#completedAt)'
+        
         if last_key:
-            # Add pagination token
-            query_params['ExclusiveStartKey'] = {'userId': user_id, 'lessonId': last_key}
+            # Resume from an opaque cursor issued for this user and query
+            try:
+                query_params['ExclusiveStartKey'] = decode_cursor(last_key, user_id, status)
+            except ValueError as e:
+                return error_response(400, 'Invalid lastKey', str(e))
         
         response = progress_table.query(**query_params)
-        
         lessons = response.get('Items', [])
-        # Fix: Use 'status' field consistent with validation lambda
-        completed = [l for l in lessons if l.get('status') == 'completed']
+        
+        # Totals come from the summary item, not from this page of lessons
+        summary = load_progress_summary(user_id)
         
         # Prepare pagination info
         pagination = {}
         if 'LastEvaluatedKey' in response:
-            pagination['lastKey'] = response['LastEvaluatedKey'].get('lessonId')
+            pagination['lastKey'] = encode_cursor(response['LastEvaluatedKey'], status)
             pagination['hasMore'] = True
         else:
             pagination['hasMore'] = False
@@ -192,10 +443,11 @@ def get_progress(event: Dict[str, Any]) -> Dict[str, Any]:
             'headers': cors_headers(),
             'body': json.dumps({
                 'totalLessons': len(lessons),
-                'completedLessons': len(completed),
+                'completedLessons': summary['completedLessons'],
+                'summary': summary,
                 'lessons': lessons,
                 'pagination': pagination
-            })
+            }, default=decimal_default)
         }
         
     except Exception as e:
@@ -203,6 +455,202 @@ def get_progress(event: Dict[str, Any]) -> Dict[str, Any]:
         return error_response(500, 'Failed to get progress')
 
 
+def encode_cursor(last_evaluated_key: Dict[str, Any], status: str) -> str:
+    """Opaque, signed cursor holding the full LastEvaluatedKey
+    
+    Index pages carry the index keys too, so the cursor stays valid whatever
+    the key schema of the table or index being queried.
+    """
+    payload = json.dumps({'key': last_evaluated_key, 'status': status},
+                         sort_keys=True, separators=(',', ':'), default=decimal_default)
+    return base64.urlsafe_b64encode(f'{payload}.{sign(payload)}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, user_id: str, status: str) -> Dict[str, Any]:
+    """ExclusiveStartKey from a cursor; ValueError unless it was issued for this user and query"""
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        payload, signature = decoded.rsplit('.', 1)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Malformed cursor')
+    
+    if not hmac.compare_digest(signature, sign(payload)):
+        raise ValueError('Cursor signature mismatch')
+    
+    data = json.loads(payload)
+    if data['key'].get('userId') != user_id or data['status'] != status:
+        raise ValueError('Cursor belongs to a different query')
+    return data['key']
+
+
+def sign(payload: str) -> str:
+    if not CURSOR_SECRET:
+        # Not a ValueError: the client's cursor isn't at fault, so callers answer 500
+        raise RuntimeError('PROGRESS_CURSOR_SECRET is not set')
+    return hmac.new(CURSOR_SECRET, payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def export_progress(event: Dict[str, Any]) -> Dict[str, Any]:
+    """The user's lessons as NDJSON, one item per line
+    
+    Lesson ID ranges are queried in parallel and concatenated in lessonId
+    order. API Gateway buffers Lambda responses, so the body is built whole
+    and stops before EXPORT_MAX_BYTES; the rest follows from the cursor in
+    the EXPORT_CURSOR_HEADER header.
+    """
+    try:
+        user_id = get_user_id_from_context(event)
+    except ValueError as e:
+        return error_response(401, str(e))
+    
+    try:
+        cursor = (event.get('queryStringParameters') or {}).get('cursor')
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, user_id, 'export')['lessonId']
+            except (ValueError, KeyError) as e:
+                return error_response(400, 'Invalid cursor', str(e))
+        
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as pool:
+            pages = pool.map(lambda bounds: query_range(user_id, *bounds), export_ranges(after))
+            items = [item for items in pages for item in items if after is None or item['lessonId'] > after]
+        
+        headers = cors_headers()
+        headers['Content-Type'] = 'application/x-ndjson'
+        headers['Access-Control-Expose-Headers'] = EXPORT_CURSOR_HEADER
+        lines = []
+        size = 0
+        for index, item in enumerate(items):
+            line = json.dumps(item, default=decimal_default) + '\n'
+            if lines and size + len(line) > EXPORT_MAX_BYTES:
+                last_key = {'userId': user_id, 'lessonId': items[index - 1]['lessonId']}
+                headers[EXPORT_CURSOR_HEADER] = encode_cursor(last_key, 'export')
+                break
+            lines.append(line)
+            size += len(line)
+        
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': ''.join(lines)
+        }
+    
+    except Exception as e:
+        print(f"Error exporting progress: {e}")
+        return error_response(500, 'Failed to export progress')
+
+
+def export_ranges(after: Optional[str]) -> List[tuple]:
+    """(low, high) lessonId ranges to export, starting at after when resuming"""
+    ranges = list(zip([None] + EXPORT_RANGE_BOUNDARIES, EXPORT_RANGE_BOUNDARIES + [None]))
+    if after is None:
+        return ranges
+    return [(after if low is None or low < after else low, high)
+            for low, high in ranges if high is None or high > after]
+
+
+def query_range(user_id: str, low: Optional[str], high: Optional[str]) -> List[Dict[str, Any]]:
+    """All lessons with low <= lessonId < high (either bound may be open)"""
+    values = {':uid': {'S': user_id}}
+    if low and high:
+        # BETWEEN is inclusive; no lesson ID equals a bare "<language>_" prefix
+        key_condition = 'userId = :uid AND lessonId BETWEEN :low AND :high'
+        values.update({':low': {'S': low}, ':high': {'S': high}})
+    elif low:
+        key_condition = 'userId = :uid AND lessonId >= :low'
+        values[':low'] = {'S': low}
+    else:
+        key_condition = 'userId = :uid AND lessonId < :high'
+        values[':high'] = {'S': high}
+    
+    paginator = dynamodb_client.get_paginator('query')
+    items = []
+    for page in paginator.paginate(
+        TableName=progress_table.name,
+        KeyConditionExpression=key_condition,
+        ProjectionExpression=', '.join(f'#{field}' for field in PROGRESS_FIELDS),
+        ExpressionAttributeNames={f'#{field}': field for field in PROGRESS_FIELDS},
+        ExpressionAttributeValues=values
+    ):
+        items.extend({key: deserializer.deserialize(value) for key, value in item.items()}
+                     for item in page.get('Items', []))
+    return [item for item in items if item['lessonId'] != high]
+
+
+def get_progress_summary(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the user's progress totals with one get_item"""
+    try:
+        user_id = get_user_id_from_context(event)
+    except ValueError as e:
+        return error_response(401, str(e))
+    
+    try:
+        return {
+            'statusCode': 200,
+            'headers': cors_headers(),
+            'body': json.dumps(load_progress_summary(user_id), default=decimal_default)
+        }
+    except Exception as e:
+        print(f"Error getting progress summary: {e}")
+        return error_response(500, 'Failed to get progress summary')
+
+
+def load_progress_summary(user_id: str) -> Dict[str, Any]:
+    """Read the summary item the validation lambda maintains on every progress write"""
+    item = progress_table.get_item(Key=summary_key(user_id)).get('Item', {})
+    active_days = sorted(int(day) for day in item.get('activeDays', set()))
+    
+    return {
+        'completedLessons': int(item.get('completedLessons', 0)),
+        'totalAttempts': int(item.get('totalAttempts', 0)),
+        'completedByLanguage': prefixed_counts(item, 'completedLanguage#'),
+        'completedByLevel': prefixed_counts(item, 'completedLevel#'),
+        'currentStreak': current_streak(active_days, int(time.time()) // 86400),
+        'longestStreak': longest_streak(active_days),
+        'lastActivityAt': item.get('lastActivityAt'),
+        'lastLessonId': item.get('lastLessonId')
+    }
+
+
+def summary_key(user_id: str) -> Dict[str, str]:
+    """Same key as validation_lambda/handler.py:summary_key"""
+    return {'userId': f'{user_id}#summary', 'lessonId': 'summary'}
+
+
+def prefixed_counts(item: Dict[str, Any], prefix: str) -> Dict[str, int]:
+    return {name[len(prefix):]: int(count) for name, count in item.items() if name.startswith(prefix)}
+
+
+def current_streak(active_days: List[int], today: int) -> int:
+    """Consecutive active days ending today (or yesterday, if today has no activity yet)"""
+    days = set(active_days)
+    day = today if today in days else today - 1
+    streak = 0
+    while day in days:
+        streak += 1
+        day -= 1
+    return streak
+
+
+def longest_streak(active_days: List[int]) -> int:
+    """Longest run of consecutive days in a sorted list"""
+    longest = streak = 0
+    previous = None
+    for day in active_days:
+        streak = streak + 1 if previous == day - 1 else 1
+        longest = max(longest, streak)
+        previous = day
+    return longest
+
+
+def decimal_default(value: Any) -> Any:
+    """json.dumps hook for numbers read back from DynamoDB"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def create_profile(event: Dict[str, Any]) -> Dict[str, Any]:
     """Create new user profile"""
     try:
@@ -225,16 +673,7 @@ def create_profile(event: Dict[str, Any]) -> Dict[str, Any]:
         if validation_error:
             return error_response(400, validation_error)
         
-        # Check if user already exists
-        try:
-            response = users_table.get_item(Key={'userId': user_id})
-            if 'Item' in response:
-                return error_response(409, 'User already exists')
-        except ClientError as e:
-            print(f"Error checking existing user: {e}")
-            return error_response(500, 'Failed to validate user')
-        
-        # Create new user record
+        # Create new user record; the put itself detects an existing user
         current_time = int(time.time())
         user_data = {
             'userId': user_id,
@@ -242,10 +681,14 @@ def create_profile(event: Dict[str, Any]) -> Dict[str, Any]:
             'name': name,
             'preferences': preferences,
             'createdAt': current_time,
-            'lastLogin': current_time
+            'lastLogin': current_time,
+            'version': 1,
+            'schemaVersion': SCHEMA_VERSION
         }
         
-        users_table.put_item(Item=user_data)
+        if not put_if_absent(users_table, user_data, 'userId'):
+            return error_response(409, 'User already exists')
+        profile_cache.put(user_id, user_data)
         
         return {
             'statusCode': 201,
@@ -271,7 +714,7 @@ def cors_headers() -> Dict[str, str]:
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,PATCH,DELETE,OPTIONS'
     }
 
 
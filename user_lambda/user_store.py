@@ -0,0 +1 @@
+../shared/user_store.py
\ No newline at end of file
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Micro-batching dispatcher for code validation
+Triggered by the validation SQS queue; groups every submission received in
+one batching window into a single CodeBuild run instead of one build each
+"""
+
+import base64
+import json
+import os
+import zlib
+import boto3
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+
+# AWS clients
+codebuild = boto3.client('codebuild')
+s3 = boto3.client('s3')
+
+# Configuration from environment
+CODEBUILD_PROJECT = os.environ.get('VALIDATION_PROJECT', 'codelearn-validation')
+VALIDATION_BUCKET = os.environ.get('VALIDATION_BUCKET', 'codelearn-validation-temp')
+
+# Must match the event source mapping's BatchSize so one build stays under its timeout
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '10'))
+# Encoded manifests up to this size skip S3 and travel in the build environment
+INLINE_PAYLOAD_LIMIT = int(os.environ.get('INLINE_PAYLOAD_LIMIT', '4096'))
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Start one validation build for a batch of queued submissions
+    The batching window itself is configured on the SQS event source mapping
+    (MaximumBatchingWindowInSeconds)
+    """
+    entries = parse_entries(event.get('Records', []))
+    
+    if not entries:
+        return {'builds': [], 'executions': 0}
+    
+    build_ids = []
+    for start in range(0, len(entries), MAX_BATCH_SIZE):
+        chunk = entries[start:start + MAX_BATCH_SIZE]
+        batch_id = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
+        
+        manifest = {'executions': chunk, 'timestamp': int(time.time())}
+        payload = encode_payload(manifest)
+        if len(payload) > INLINE_PAYLOAD_LIMIT:
+            upload_batch_manifest(batch_id, manifest)
+            payload = None
+        
+        build_ids.append(start_batch_build(batch_id, payload))
+        
+        print(f"Dispatched batch {batch_id} with {len(chunk)} submissions")
+    
+    # Any exception above fails the whole invocation so SQS redelivers the batch
+    return {'builds': build_ids, 'executions': len(entries)}
+
+
+def parse_entries(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Extract executions (ID plus optional inline payload) from SQS records"""
+    entries = []
+    seen = set()
+    
+    for record in records:
+        try:
+            message = json.loads(record.get('body', '{}'))
+        except json.JSONDecodeError:
+            message = {}
+        
+        execution_id = message.get('executionId')
+        if not execution_id:
+            print(f"Skipping malformed message: {record.get('messageId')}")
+            continue
+        
+        if execution_id not in seen:
+            seen.add(execution_id)
+            entries.append({'executionId': execution_id, 'payload': message.get('payload')})
+    
+    return entries
+
+
+def encode_payload(data: Dict[str, Any]) -> str:
+    """Encode data as an inline zlib + base64 JSON payload"""
+    return base64.b64encode(zlib.compress(json.dumps(data).encode())).decode()
+
+
+def upload_batch_manifest(batch_id: str, manifest: Dict[str, Any]) -> None:
+    """Upload the executions the build should validate (manifests too large to inline)"""
+    s3.put_object(
+        Bucket=VALIDATION_BUCKET,
+        Key=f"batches/{batch_id}/manifest.json",
+        Body=json.dumps(manifest),
+        ServerSideEncryption='AES256'
+    )
+
+
+def start_batch_build(batch_id: str, payload: Optional[str] = None) -> str:
+    """Start one CodeBuild run for the whole batch"""
+    environment = [
+        {'name': 'BATCH_ID', 'value': batch_id},
+        {'name': 'S3_BUCKET', 'value': VALIDATION_BUCKET}
+    ]
+    if payload:
+        environment.append({'name': 'BATCH_PAYLOAD', 'value': payload})
+    
+    response = codebuild.start_build(
+        projectName=CODEBUILD_PROJECT,
+        environmentVariablesOverride=environment,
+        timeoutInMinutesOverride=5
+    )
+    
+    return response['build']['id']
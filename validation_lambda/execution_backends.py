@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Execution backends for code validation
+Every backend runs the same validator (secure_validation/validator_script.py)
+on the same staged input and returns its test results; they only differ in
+how the run is started and how results come back. handler.py picks one per
+submission: VALIDATION_BACKEND names it, or 'auto' routes by observed latency.
+"""
+
+import base64
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import zlib
+import boto3
+import time
+from typing import Dict, Any, List, Optional
+from botocore.exceptions import ClientError
+
+# AWS clients
+codebuild = boto3.client('codebuild')
+ecs = boto3.client('ecs')
+logs = boto3.client('logs')
+s3 = boto3.client('s3')
+sqs = boto3.client('sqs')
+
+# Configuration from environment
+VALIDATION_BUCKET = os.environ.get('VALIDATION_BUCKET', 'codelearn-validation-temp')
+# Staged input and results for every backend (validator_script.py S3_PREFIX)
+EXECUTIONS_PREFIX = 'executions'
+# Encoded payloads up to this size skip S3 (Fargate overrides are limited to 8KB)
+INLINE_PAYLOAD_LIMIT = int(os.environ.get('INLINE_PAYLOAD_LIMIT', '4096'))
+MAX_WAIT_SECONDS = 300
+
+# CodeBuild
+CODEBUILD_PROJECT = os.environ.get('VALIDATION_PROJECT', 'codelearn-validation')
+# When set, submissions are micro-batched through SQS (see batch_dispatcher.py)
+BATCH_QUEUE_URL = os.environ.get('VALIDATION_BATCH_QUEUE_URL', '')
+
+# ECS Fargate
+ECS_CLUSTER = os.environ.get('VALIDATION_CLUSTER', 'codelearn-validation')
+TASK_DEFINITION = os.environ.get('VALIDATION_TASK_DEF', 'codelearn-validator')
+SUBNETS = os.environ.get('VALIDATION_SUBNETS', '').split(',')
+SECURITY_GROUPS = os.environ.get('VALIDATION_SECURITY_GROUPS', '').split(',')
+# CloudWatch Logs can lag a stopped task, so the results line is read with backoff
+LOG_RETRY_DELAYS = [0, 0.5, 1, 2, 4]
+
+# Local: runs validator_script.py as a subprocess on this machine. For
+# development and benchmarking only; it has none of the container isolation
+LOCAL_VALIDATOR_SCRIPT = os.environ.get(
+    'LOCAL_VALIDATOR_SCRIPT',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'secure_validation', 'validator_script.py')
+)
+
+# 'codebuild', 'batch', 'fargate', 'local' or 'auto'
+VALIDATION_BACKEND = os.environ.get('VALIDATION_BACKEND', 'batch' if BATCH_QUEUE_URL else 'codebuild')
+# Candidates for 'auto', and how often it tries one that isn't the fastest
+ROUTE_BACKENDS = os.environ.get('ROUTE_BACKENDS', 'codebuild,fargate').split(',')
+ROUTE_EXPLORE_RATE = float(os.environ.get('ROUTE_EXPLORE_RATE', '0.05'))
+
+
+class ExecutionBackend:
+    """Starts validator runs and collects their results
+    
+    Subclasses implement start() and wait(); the handle returned by start()
+    only has to mean something to the same backend's wait().
+    """
+    
+    name = ''
+    
+    def dispatch(self, execution_id: str, execution_data: Dict[str, Any]) -> Any:
+        """Stage a submission and start its run without waiting"""
+        # Small submissions travel inline; S3 is only the oversized fallback
+        payload = encode_payload(execution_data)
+        if len(payload) > INLINE_PAYLOAD_LIMIT:
+            stage_input(execution_id, execution_data)
+            payload = None
+        
+        return self.start(execution_id, payload)
+    
+    def execute(self, execution_id: str, execution_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run a submission to completion, recording how long it took"""
+        started = time.time()
+        results = self.wait(self.dispatch(execution_id, execution_data), execution_id)
+        elapsed = time.time() - started
+        
+        router.record(self.name, elapsed)
+        print(f"Execution {execution_id} on {self.name} took {elapsed:.2f}s")
+        return results
+    
+    def start(self, execution_id: str, payload: Optional[str]) -> Any:
+        """Start one run; payload is None when the input is staged in S3"""
+        raise NotImplementedError
+    
+    def wait(self, handle: Any, execution_id: str, max_wait: int = MAX_WAIT_SECONDS) -> List[Dict[str, Any]]:
+        """Wait for a started run and return its test results"""
+        raise NotImplementedError
+
+
+class CodeBuildBackend(ExecutionBackend):
+    """One CodeBuild build per submission"""
+    
+    name = 'codebuild'
+    
+    def start(self, execution_id: str, payload: Optional[str]) -> str:
+        response = codebuild.start_build(
+            projectName=CODEBUILD_PROJECT,
+            environmentVariablesOverride=run_environment(execution_id, payload),
+            timeoutInMinutesOverride=5
+        )
+        return response['build']['id']
+    
+    def wait(self, build_id: str, execution_id: str, max_wait: int = MAX_WAIT_SECONDS) -> List[Dict[str, Any]]:
+        start_time = time.time()
+        
+        while time.time() - start_time < max_wait:
+            try:
+                build = codebuild.batch_get_builds(ids=[build_id])['builds'][0]
+                status = build['buildStatus']
+                
+                if status == 'SUCCEEDED':
+                    exported = get_exported_results(build)
+                    if exported is not None:
+                        return exported
+                    return get_staged_results(execution_id)
+                elif status in ['FAILED', 'STOPPED', 'TIMED_OUT']:
+                    return [{'name': 'execution_failed', 'passed': False, 'error': f'Build {status.lower()}'}]
+                
+                time.sleep(2)
+            
+            except Exception as e:
+                print(f"Error checking build status: {e}")
+                break
+        
+        return timeout_results()
+
+
+class BatchedCodeBuildBackend(ExecutionBackend):
+    """Queues submissions so batch_dispatcher.py runs several in one build"""
+    
+    name = 'batch'
+    
+    def start(self, execution_id: str, payload: Optional[str]) -> None:
+        message = {'executionId': execution_id}
+        if payload:
+            message['payload'] = payload
+        
+        sqs.send_message(
+            QueueUrl=BATCH_QUEUE_URL,
+            MessageBody=json.dumps(message)
+        )
+    
+    def wait(self, handle: None, execution_id: str, max_wait: int = MAX_WAIT_SECONDS) -> List[Dict[str, Any]]:
+        # Batch builds always fan results out to S3 per execution ID
+        s3_key = f"{EXECUTIONS_PREFIX}/{execution_id}/results.json"
+        start_time = time.time()
+        
+        while time.time() - start_time < max_wait:
+            try:
+                response = s3.get_object(Bucket=VALIDATION_BUCKET, Key=s3_key)
+                return json.loads(response['Body'].read()).get('test_results', [])
+            except ClientError as e:
+                # Without s3:ListBucket a missing key is AccessDenied (403), not NoSuchKey
+                if e.response['Error']['Code'] not in ('NoSuchKey', 'AccessDenied', '403', '404'):
+                    print(f"Error reading batched results: {e}")
+                    break
+            
+            time.sleep(1)
+        
+        return timeout_results()
+
+
+class FargateBackend(ExecutionBackend):
+    """One ECS Fargate task per submission (read-only root, no network)"""
+    
+    name = 'fargate'
+    
+    def start(self, execution_id: str, payload: Optional[str]) -> Dict[str, Any]:
+        response = ecs.run_task(
+            cluster=ECS_CLUSTER,
+            taskDefinition=TASK_DEFINITION,
+            launchType='FARGATE',
+            platformVersion='1.4.0',
+            networkConfiguration={
+                'awsvpcConfiguration': {
+                    'subnets': SUBNETS,
+                    'securityGroups': SECURITY_GROUPS,
+                    'assignPublicIp': 'DISABLED'  # No internet access
+                }
+            },
+            overrides={
+                'containerOverrides': [{
+                    'name': 'validator',
+                    'environment': run_environment(execution_id, payload)
+                }]
+            },
+            tags=[
+                {'key': 'Purpose', 'value': 'CodeValidation'},
+                {'key': 'ExecutionId', 'value': execution_id}
+            ]
+        )
+        return {'taskArn': response['tasks'][0]['taskArn'], 'inline': payload is not None}
+    
+    def wait(self, task: Dict[str, Any], execution_id: str, max_wait: int = MAX_WAIT_SECONDS) -> List[Dict[str, Any]]:
+        start_time = time.time()
+        
+        while time.time() - start_time < max_wait:
+            try:
+                response = ecs.describe_tasks(cluster=ECS_CLUSTER, tasks=[task['taskArn']])
+                if not response['tasks']:
+                    break
+                
+                if response['tasks'][0].get('lastStatus') == 'STOPPED':
+                    return self.get_results(task, execution_id)
+                
+                time.sleep(3)
+            
+            except Exception as e:
+                print(f"Error checking task status: {e}")
+                break
+        
+        try:
+            ecs.stop_task(cluster=ECS_CLUSTER, task=task['taskArn'], reason='Timeout')
+        except ClientError:
+            pass
+        
+        return timeout_results()
+    
+    def get_results(self, task: Dict[str, Any], execution_id: str) -> List[Dict[str, Any]]:
+        """Inline runs report through the TEST_RESULTS log line; S3 holds the rest"""
+        if not task['inline']:
+            return get_staged_results(execution_id)
+        
+        for delay in LOG_RETRY_DELAYS:
+            time.sleep(delay)
+            results = self.parse_logs_for_results(task['taskArn'])
+            if results is not None:
+                return results
+        
+        # Results too large for a log line were uploaded instead
+        return get_staged_results(execution_id)
+    
+    def parse_logs_for_results(self, task_arn: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            response = logs.get_log_events(
+                logGroupName=f'/ecs/{TASK_DEFINITION}',
+                logStreamName=f"ecs/validator/{task_arn.split('/')[-1]}"
+            )
+        except ClientError as e:
+            print(f"Log parsing error: {e}")
+            return None
+        
+        for event in response.get('events', []):
+            message = event.get('message', '')
+            if 'TEST_RESULTS:' in message:
+                try:
+                    return json.loads(message.split('TEST_RESULTS:', 1)[1]).get('test_results', [])
+                except ValueError:
+                    pass
+        
+        return None
+
+
+class LocalBackend(ExecutionBackend):
+    """validator_script.py as a local subprocess, for development and benchmarks"""
+    
+    name = 'local'
+    
+    def start(self, execution_id: str, payload: Optional[str]) -> Dict[str, Any]:
+        export_fd, export_file = tempfile.mkstemp(suffix='.b64')
+        os.close(export_fd)
+        
+        env = dict(os.environ, **run_environment_dict(execution_id, payload))
+        env['RESULTS_EXPORT_FILE'] = export_file
+        
+        process = subprocess.Popen(
+            [sys.executable, LOCAL_VALIDATOR_SCRIPT],
+            cwd=os.path.dirname(LOCAL_VALIDATOR_SCRIPT),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return {'process': process, 'exportFile': export_file}
+    
+    def wait(self, run: Dict[str, Any], execution_id: str, max_wait: int = MAX_WAIT_SECONDS) -> List[Dict[str, Any]]:
+        try:
+            run['process'].wait(timeout=max_wait)
+        except subprocess.TimeoutExpired:
+            run['process'].kill()
+            run['process'].wait()
+            return timeout_results()
+        
+        try:
+            with open(run['exportFile']) as f:
+                exported = f.read()
+        finally:
+            os.unlink(run['exportFile'])
+        
+        if exported:
+            return decode_payload(exported).get('test_results', [])
+        return get_staged_results(execution_id)
+
+
+class LatencyRouter:
+    """Sends each run to the backend with the lowest recent latency
+    
+    Latency is an exponentially weighted average per backend, kept for the
+    life of the warm Lambda container. Backends without a measurement are
+    tried first, and a small share of runs go to a random candidate so a
+    backend that was slow once gets re-measured.
+    """
+    
+    def __init__(self, candidates: List[str], smoothing: float = 0.2):
+        self.candidates = candidates
+        self.smoothing = smoothing
+        self.latency: Dict[str, float] = {}
+    
+    def choose(self) -> str:
+        unmeasured = [name for name in self.candidates if name not in self.latency]
+        if unmeasured:
+            return unmeasured[0]
+        if random.random() < ROUTE_EXPLORE_RATE:
+            return random.choice(self.candidates)
+        return min(self.candidates, key=self.latency.get)
+    
+    def record(self, name: str, seconds: float) -> None:
+        previous = self.latency.get(name)
+        if previous is None:
+            self.latency[name] = seconds
+        else:
+            self.latency[name] = previous + self.smoothing * (seconds - previous)
+
+
+BACKENDS = {backend.name: backend for backend in [
+    CodeBuildBackend(), BatchedCodeBuildBackend(), FargateBackend(), LocalBackend()
+]}
+router = LatencyRouter(ROUTE_BACKENDS)
+
+
+def choose_backend() -> ExecutionBackend:
+    """The configured backend, or the currently fastest one for 'auto'"""
+    if VALIDATION_BACKEND == 'auto':
+        return BACKENDS[router.choose()]
+    return BACKENDS[VALIDATION_BACKEND]
+
+
+def run_environment_dict(execution_id: str, payload: Optional[str]) -> Dict[str, str]:
+    """Environment validator_script.py reads for a single execution"""
+    environment = {'EXECUTION_ID': execution_id, 'S3_BUCKET': VALIDATION_BUCKET}
+    if payload:
+        environment['EXECUTION_PAYLOAD'] = payload
+    return environment
+
+
+def run_environment(execution_id: str, payload: Optional[str]) -> List[Dict[str, str]]:
+    """The same environment as CodeBuild/ECS override entries"""
+    return [{'name': name, 'value': value} for name, value in run_environment_dict(execution_id, payload).items()]
+
+
+def encode_payload(data: Dict[str, Any]) -> str:
+    """Encode data as an inline zlib + base64 JSON payload"""
+    return base64.b64encode(zlib.compress(json.dumps(data).encode())).decode()
+
+
+def decode_payload(payload: str) -> Dict[str, Any]:
+    """Decode an inline zlib + base64 JSON payload"""
+    return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+def stage_input(execution_id: str, execution_data: Dict[str, Any]) -> None:
+    """Upload a submission too large to inline"""
+    s3.put_object(
+        Bucket=VALIDATION_BUCKET,
+        Key=f"{EXECUTIONS_PREFIX}/{execution_id}/input.json",
+        Body=json.dumps(execution_data),
+        ServerSideEncryption='AES256'
+    )
+
+
+def get_exported_results(build: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Read inline results exported by the build (TEST_RESULTS_PAYLOAD), if any"""
+    for variable in build.get('exportedEnvironmentVariables', []):
+        if variable.get('name') == 'TEST_RESULTS_PAYLOAD' and variable.get('value'):
+            try:
+                return decode_payload(variable['value']).get('test_results', [])
+            except (ValueError, zlib.error) as e:
+                print(f"Invalid exported results: {e}")
+    return None
+
+
+def get_staged_results(execution_id: str) -> List[Dict[str, Any]]:
+    """Results the validator uploaded to S3"""
+    try:
+        s3_key = f"{EXECUTIONS_PREFIX}/{execution_id}/results.json"
+        response = s3.get_object(Bucket=VALIDATION_BUCKET, Key=s3_key)
+        return json.loads(response['Body'].read()).get('test_results', [])
+    except ClientError:
+        return [{'name': 'results_error', 'passed': False, 'error': 'Could not retrieve results'}]
+
+
+def timeout_results() -> List[Dict[str, Any]]:
+    return [{'name': 'execution_timeout', 'passed': False, 'error': 'Execution timeout'}]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Background cleanup of staged validation files
+S3 lifecycle rules (secure_validation/s3-lifecycle.json) expire these
+prefixes after a day; run this on a schedule (e.g. EventBridge rate(15
+minutes)) to delete them within minutes instead, off the request path
+"""
+
+import os
+import boto3
+import time
+from typing import Dict, Any, List
+
+# AWS clients
+s3 = boto3.client('s3')
+
+# Configuration from environment
+VALIDATION_BUCKET = os.environ.get('VALIDATION_BUCKET', 'codelearn-validation-temp')
+SWEEP_PREFIXES = os.environ.get('SWEEP_PREFIXES', 'executions/,batches/').split(',')
+# Longer than the slowest build, so files of running validations are kept
+SWEEP_AGE_SECONDS = int(os.environ.get('SWEEP_AGE_SECONDS', '900'))
+
+DELETE_BATCH_SIZE = 1000  # delete_objects limit
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Delete staged objects older than SWEEP_AGE_SECONDS under each prefix"""
+    cutoff = time.time() - SWEEP_AGE_SECONDS
+    deleted = 0
+    
+    for prefix in SWEEP_PREFIXES:
+        stale_keys = list_stale_keys(prefix, cutoff)
+        for start in range(0, len(stale_keys), DELETE_BATCH_SIZE):
+            deleted += delete_keys(stale_keys[start:start + DELETE_BATCH_SIZE])
+    
+    print(f"Swept {deleted} staged objects older than {SWEEP_AGE_SECONDS}s")
+    return {'deleted': deleted}
+
+
+def list_stale_keys(prefix: str, cutoff: float) -> List[str]:
+    """Keys under prefix last modified before cutoff"""
+    paginator = s3.get_paginator('list_objects_v2')
+    stale_keys = []
+    
+    for page in paginator.paginate(Bucket=VALIDATION_BUCKET, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if obj['LastModified'].timestamp() < cutoff:
+                stale_keys.append(obj['Key'])
+    
+    return stale_keys
+
+
+def delete_keys(keys: List[str]) -> int:
+    """Delete up to DELETE_BATCH_SIZE keys, returning how many were removed"""
+    response = s3.delete_objects(
+        Bucket=VALIDATION_BUCKET,
+        Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+    )
+    
+    for error in response.get('Errors', []):
+        print(f"Sweep error for {error['Key']}: {error['Message']}")
+    
+    return len(keys) - len(response.get('Errors', []))
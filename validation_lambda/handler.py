@@ -1,25 +1,33 @@
 #!/usr/bin/env python3
 """
-Secure code validation using AWS CodeBuild
-This replaces dangerous direct code execution with isolated container execution
+Secure code validation in isolated containers
+Submissions run on CodeBuild, ECS Fargate or a local subprocess through the
+backends in execution_backends.py; this handler validates input, tracks
+progress and serves streamed results
 """
 
+import hashlib
 import json
 import os
+import re
 import boto3
 import time
+from decimal import Decimal
 from typing import Dict, Any, List, Optional
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
+from execution_backends import ExecutionBackend, choose_backend
+
 # AWS clients
-codebuild = boto3.client('codebuild')
-s3 = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
 
 # Configuration from environment
-CODEBUILD_PROJECT = os.environ.get('VALIDATION_PROJECT', 'codelearn-validation')
-VALIDATION_BUCKET = os.environ.get('VALIDATION_BUCKET', 'codelearn-validation-temp')
 PROGRESS_TABLE = os.environ.get('PROGRESS_TABLE', 'codelearn-progress-dev')
+# Per-test result events written by validator_script.py (enables streaming)
+EVENTS_TABLE = os.environ.get('VALIDATION_EVENTS_TABLE', '')
+EVENT_TTL_SECONDS = 3600
+LONG_POLL_SECONDS = 20  # Stays under the API Gateway 29s integration timeout
 
 # Security constraints
 MAX_CODE_LENGTH = 10000  # 10KB max
@@ -27,37 +35,86 @@ FORBIDDEN_IMPORTS = [
     'os', 'sys', 'subprocess', 'socket', 'urllib', 'requests', 
     'boto3', 'http', 'ftplib', 'smtplib', '__import__', 'eval', 'exec'
 ]
-VALID_LANGUAGES = ['python']
+# Java and Rust lessons are checked for APIs that reach outside the sandbox.
+# Sources are compared token by token with comments and literals removed, so
+# spacing, comments, Java \u escapes and class names built from strings don't
+# hide a name. This only turns obvious attempts away early; the per-submission
+# sandbox (secure_validation/sandbox.py) is what contains code that gets past it.
+FORBIDDEN_PATTERNS = {
+    'java': ['Runtime', 'ProcessBuilder', 'ProcessHandle', 'net', 'nio', 'File', 'FileInputStream',
+             'FileOutputStream', 'FileReader', 'FileWriter', 'RandomAccessFile', 'exit', 'getenv',
+             'reflect', 'invoke', 'forName', 'getMethod', 'getDeclaredMethod', 'getField',
+             'getDeclaredField', 'getConstructor', 'getDeclaredConstructor', 'setAccessible',
+             'MethodHandles', 'ClassLoader', 'getClassLoader', 'ScriptEngineManager', 'Unsafe', 'Thread'],
+    'rust': ['unsafe', 'extern', 'include', 'include_str', 'include_bytes', 'macro_rules', 'asm',
+             'global_asm', 'no_mangle', 'export_name', 'link_section']
+}
+# Rust names only forbidden as paths, macros or attributes (std::fs, use std::{fs as f},
+# env!, #[path]), so lesson functions and variables can still be called e.g. "process"
+RUST_FORBIDDEN_PATHS = ['process', 'net', 'fs', 'env', 'os', 'thread', 'path']
+JAVA_TOKEN_PATTERN = re.compile(r'''
+    //[^\n]*|/\*.*?\*/                          # comments
+    |""".*?(?<!\\)"""                           # text blocks
+    |"(?:\\.|[^"\\\n])*"                        # strings
+    |'(?:\\.|[^'\\\n])+'                        # characters
+    |(?P<token>[\w$]+|\S)
+''', re.VERBOSE | re.DOTALL)
+RUST_TOKEN_PATTERN = re.compile(r'''
+    //[^\n]*|/\*.*?\*/                          # comments (nested ones end early: extra tokens, never fewer)
+    |\b[bc]?r(\#*)".*?"\1                       # raw strings
+    |"(?:\\.|[^"\\])*"                          # strings
+    |'(?:\\.[^'\n]*|[^'\\\n])'                  # characters (not lifetimes)
+    |(?P<token>::|(?:r\#)?\w+|\S)                # r#name is a raw identifier
+''', re.VERBOSE | re.DOTALL)
+UNICODE_ESCAPE_PATTERN = re.compile(r'\\u+([0-9a-fA-F]{4})')
+VALID_LANGUAGES = ['python', 'java', 'rust']
+VALID_RUNNERS = ['pytest', 'simple']  # 'simple' skips pytest for plain assert tests
+TEST_NAME_PATTERN = re.compile(r'^def (test_\w+)', re.MULTILINE)
+# Lesson IDs are "<language>_<level>_<topic>_<timestamp>" (lesson_lambda)
+LESSON_LEVELS = ['beginner', 'intermediate', 'advanced', 'experienced']
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Secure code validation orchestrator"""
     try:
-        body = json.loads(event.get('body', '{}'))
+        if event.get('httpMethod') == 'GET' and '/events' in event.get('path', ''):
+            return get_execution_events(event)
+        
+        body = json.loads(event.get('body') or '{}')
         
         code = body.get('code', '')
         tests = body.get('tests', [])
         language = body.get('language', 'python')
         lesson_id = body.get('lessonId')
         user_id = body.get('userId', 'anonymous')
+        runner = body.get('runner', 'pytest')
         
         # Input validation
-        validation_error = validate_inputs(code, tests, language)
+        validation_error = validate_inputs(code, tests, language, runner)
         if validation_error:
             return error_response(400, validation_error)
         
         # Security validation
-        security_error = validate_code_security(code, tests)
+        security_error = validate_code_security(code, tests, language)
         if security_error:
             return error_response(403, f'Security violation: {security_error}')
         
-        # Execute in secure container
         execution_id = f"{user_id}_{lesson_id}_{int(time.time())}"
-        results = execute_code_securely(code, tests, language, execution_id)
         
-        # Track progress if all tests passed
-        all_passed = all(r.get('passed', False) for r in results)
-        if all_passed and lesson_id:
-            track_progress(user_id, lesson_id)
+        # Resubmissions run previously failing tests first
+        test_hashes = hash_tests(tests)
+        known_passing = get_known_passing(user_id, lesson_id, tests, test_hashes)
+        
+        # Streaming: start the run and let the client long-poll its events
+        if body.get('stream') and EVENTS_TABLE:
+            return start_streamed_execution(code, tests, language, execution_id, runner, user_id,
+                                            lesson_id, test_hashes, known_passing)
+        
+        # Execute in secure container
+        results = execute_code_securely(code, tests, language, execution_id, runner, known_passing)
+        
+        # Record the attempt (and completion if all tests passed)
+        all_passed = all(r.get('passed', False) and not r.get('cached') for r in results)
+        track_progress(user_id, lesson_id, execution_id, all_passed, test_hashes, results, language)
         
         return {
             'statusCode': 200,
@@ -75,7 +132,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return error_response(500, 'Internal validation error')
 
 
-def validate_inputs(code: str, tests: List[str], language: str) -> Optional[str]:
+def validate_inputs(code: str, tests: List[str], language: str, runner: str = 'pytest') -> Optional[str]:
     """Validate basic input parameters"""
     if not code or not code.strip():
         return 'Code cannot be empty'
@@ -89,12 +146,26 @@ def validate_inputs(code: str, tests: List[str], language: str) -> Optional[str]
     if language not in VALID_LANGUAGES:
         return f'Language {language} not supported'
     
+    if runner not in VALID_RUNNERS:
+        return f'Test runner {runner} not supported'
+    
     return None
 
 
-def validate_code_security(code: str, tests: List[str]) -> Optional[str]:
+def validate_code_security(code: str, tests: List[str], language: str = 'python') -> Optional[str]:
     """Security validation to prevent malicious code"""
     
+    if language in FORBIDDEN_PATTERNS:
+        # Python's import list matches ordinary Java/Rust words ("System", "position")
+        forbidden = find_forbidden_api(code, language)
+        if forbidden:
+            return f'Forbidden API: {forbidden}'
+        for test in tests:
+            forbidden = find_forbidden_api(test, language)
+            if forbidden:
+                return f'Forbidden API in tests: {forbidden}'
+        return None
+    
     # Check for forbidden imports/functions
     code_lower = code.lower()
     for forbidden in FORBIDDEN_IMPORTS:
@@ -110,23 +181,83 @@ def validate_code_security(code: str, tests: List[str]) -> Optional[str]:
     return None
 
 
-def execute_code_securely(code: str, tests: List[str], language: str, execution_id: str) -> List[Dict[str, Any]]:
-    """Execute code in secure CodeBuild environment"""
+def find_forbidden_api(source: str, language: str) -> Optional[str]:
+    """First forbidden API named in Java or Rust source, if any"""
+    if language == 'java':
+        # javac translates \\uXXXX escapes before it reads anything else
+        source = UNICODE_ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1), 16)), source)
+        pattern = JAVA_TOKEN_PATTERN
+    else:
+        pattern = RUST_TOKEN_PATTERN
+    tokens = []
+    for match in pattern.finditer(source):
+        token = match.group('token')
+        if token:
+            tokens.append(token[2:] if token.startswith('r#') else token)
     
-    try:
-        # Upload code to S3 for CodeBuild
-        upload_code_to_s3(code, tests, execution_id)
+    in_use = False
+    for index, token in enumerate(tokens):
+        if token in FORBIDDEN_PATTERNS[language]:
+            return token
+        if language != 'rust':
+            continue
         
-        # Start CodeBuild execution
-        build_id = start_codebuild_execution(execution_id)
-        
-        # Wait for completion and get results
-        results = wait_for_execution_results(build_id, execution_id)
-        
-        # Clean up temporary files
-        cleanup_execution_files(execution_id)
+        if token in ('use', ';'):
+            in_use = token == 'use'
+        elif token in RUST_FORBIDDEN_PATHS:
+            before = tokens[index - 1] if index else ''
+            after = tokens[index + 1] if index + 1 < len(tokens) else ''
+            # use trees rename modules ("use std::{fs as f}"), so anything inside one counts
+            if in_use or '::' in (before, after) or before == '[' or after == '!':
+                return token
+    
+    return None
+
+
+def hash_tests(tests: List[str]) -> Dict[str, str]:
+    """Map each test's function name to a hash of its source"""
+    test_hashes = {}
+    for test in tests:
+        match = TEST_NAME_PATTERN.search(test)
+        if match:
+            test_hashes[match.group(1)] = hashlib.sha256(test.encode()).hexdigest()[:16]
+    return test_hashes
+
+
+def get_known_passing(user_id: str, lesson_id: Optional[str], tests: List[str],
+                      test_hashes: Dict[str, str]) -> List[int]:
+    """Indices of tests whose current source passed on the last submission"""
+    if not lesson_id or user_id == 'anonymous':
+        return []
+    
+    try:
+        item = dynamodb.Table(PROGRESS_TABLE).get_item(
+            Key={'userId': user_id, 'lessonId': lesson_id},
+            ProjectionExpression='testResults'
+        ).get('Item', {})
+    except Exception as e:
+        print(f"Test results lookup error: {e}")
+        return []
+    
+    last_results = item.get('testResults', {})
+    known_passing = []
+    for i, test in enumerate(tests):
+        match = TEST_NAME_PATTERN.search(test)
+        if match and last_results.get(test_hashes.get(match.group(1))):
+            known_passing.append(i)
+    return known_passing
+
+
+def execute_code_securely(code: str, tests: List[str], language: str, execution_id: str,
+                          runner: str = 'pytest', known_passing: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """Execute code in an isolated container on the selected backend"""
+    
+    try:
+        execution_data = build_execution_data(code, tests, runner, known_passing, language)
         
-        return results
+        # Staged files under executions/ expire via S3 lifecycle rules (and the
+        # optional execution_sweeper.py), keeping cleanup off the request path
+        return choose_backend().execute(execution_id, execution_data)
         
     except Exception as e:
         print(f"Execution error: {str(e)}")
@@ -137,99 +268,258 @@ def execute_code_securely(code: str, tests: List[str], language: str, execution_
         }]
 
 
-def upload_code_to_s3(code: str, tests: List[str], execution_id: str) -> None:
-    """Upload user code and tests to S3 for CodeBuild"""
-    execution_data = {
-        'code': code,
-        'tests': tests,
-        'timestamp': int(time.time())
+def start_streamed_execution(code: str, tests: List[str], language: str, execution_id: str, runner: str,
+                             user_id: str, lesson_id: Optional[str], test_hashes: Dict[str, str],
+                             known_passing: List[int]) -> Dict[str, Any]:
+    """Start a run without waiting; results arrive via GET .../events"""
+    events_table = dynamodb.Table(EVENTS_TABLE)
+    
+    # seq 0 remembers who to credit once the container reports 'done', so it is
+    # written before the run starts (progress_recorder.py reads it on 'done')
+    events_table.put_item(Item={
+        'executionId': execution_id,
+        'seq': 0,
+        'type': 'started',
+        'userId': user_id,
+        'lessonId': lesson_id,
+        'testCount': len(tests),
+        'testHashes': test_hashes,
+        'language': language,
+        'ttl': int(time.time()) + EVENT_TTL_SECONDS
+    })
+    
+    dispatch_execution(choose_backend(), code, tests, execution_id, runner, known_passing, language)
+    
+    return {
+        'statusCode': 202,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'executionId': execution_id,
+            'testCount': len(tests),
+            'eventsPath': f"/api/validate/{execution_id}/events"
+        })
     }
+
+
+def get_execution_events(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Long-poll for test result events newer than ?after=<seq>"""
+    if not EVENTS_TABLE:
+        return error_response(404, 'Streaming is not enabled')
+    
+    execution_id = (event.get('pathParameters') or {}).get('executionId')
+    if not execution_id:
+        # /api/validate/{executionId}/events
+        execution_id = event.get('path', '').rstrip('/').split('/')[-2]
+    
+    query_params = event.get('queryStringParameters') or {}
+    try:
+        after = int(query_params.get('after', '0'))
+    except ValueError:
+        return error_response(400, 'after must be an integer')
     
-    s3_key = f"executions/{execution_id}/input.json"
-    s3.put_object(
-        Bucket=VALIDATION_BUCKET,
-        Key=s3_key,
-        Body=json.dumps(execution_data),
-        ServerSideEncryption='AES256'
-    )
-
-
-def start_codebuild_execution(execution_id: str) -> str:
-    """Start CodeBuild project for secure execution"""
-    
-    response = codebuild.start_build(
-        projectName=CODEBUILD_PROJECT,
-        environmentVariablesOverride=[
-            {'name': 'EXECUTION_ID', 'value': execution_id},
-            {'name': 'S3_BUCKET', 'value': VALIDATION_BUCKET}
-        ],
-        timeoutInMinutesOverride=5
-    )
-    
-    return response['build']['id']
-
-
-def wait_for_execution_results(build_id: str, execution_id: str, max_wait: int = 300) -> List[Dict[str, Any]]:
-    """Wait for CodeBuild execution and retrieve results"""
-    
-    start_time = time.time()
-    
-    while time.time() - start_time < max_wait:
-        try:
-            response = codebuild.batch_get_builds(ids=[build_id])
-            build = response['builds'][0]
-            status = build['buildStatus']
-            
-            if status == 'SUCCEEDED':
-                return get_execution_results(execution_id)
-            elif status in ['FAILED', 'STOPPED', 'TIMED_OUT']:
-                return [{'name': 'execution_failed', 'passed': False, 'error': f'Build {status.lower()}'}]
-            
-            time.sleep(2)
-            
-        except Exception as e:
-            print(f"Error checking build status: {e}")
+    events_table = dynamodb.Table(EVENTS_TABLE)
+    deadline = time.time() + LONG_POLL_SECONDS
+    
+    while True:
+        response = events_table.query(
+            KeyConditionExpression=Key('executionId').eq(execution_id) & Key('seq').gt(after),
+            ConsistentRead=True
+        )
+        items = response.get('Items', [])
+        if items or time.time() >= deadline:
             break
+        time.sleep(0.5)
+    
+    events = [{k: v for k, v in item.items() if k not in ('executionId', 'ttl')} for item in items]
+    done_event = next((e for e in events if e.get('type') == 'done'), None)
+    
+    if done_event:
+        finish_streamed_execution(execution_id, done_event)
     
-    return [{'name': 'execution_timeout', 'passed': False, 'error': 'Execution timeout'}]
+    return {
+        'statusCode': 200,
+        'headers': cors_headers(),
+        'body': json.dumps({
+            'executionId': execution_id,
+            'events': events,
+            'nextAfter': int(events[-1]['seq']) if events else after,
+            'done': done_event is not None,
+            'feedback': generate_feedback(done_event.get('results', [])) if done_event else None
+        }, default=decimal_default)
+    }
 
 
-def get_execution_results(execution_id: str) -> List[Dict[str, Any]]:
-    """Retrieve execution results from S3"""
+def finish_streamed_execution(execution_id: str, done_event: Dict[str, Any]) -> None:
+    """Track progress once a streamed run has finished
+    
+    Called by progress_recorder.py when the 'done' event is written, and again
+    when a client reads it.
+    """
     try:
-        s3_key = f"executions/{execution_id}/results.json"
-        response = s3.get_object(Bucket=VALIDATION_BUCKET, Key=s3_key)
-        results = json.loads(response['Body'].read())
-        return results.get('test_results', [])
-    except ClientError:
-        return [{'name': 'results_error', 'passed': False, 'error': 'Could not retrieve results'}]
+        started = dynamodb.Table(EVENTS_TABLE).get_item(
+            Key={'executionId': execution_id, 'seq': 0},
+            ConsistentRead=True
+        ).get('Item', {})
+    except ClientError as e:
+        print(f"Error reading execution start: {e}")
+        return
+    
+    # Safe to repeat: track_progress ignores an execution it has already recorded
+    track_progress(started.get('userId', 'anonymous'), started.get('lessonId'), execution_id,
+                   bool(done_event.get('passed')), started.get('testHashes', {}),
+                   done_event.get('results', []), started.get('language', 'python'))
 
 
-def cleanup_execution_files(execution_id: str) -> None:
-    """Clean up temporary S3 files"""
-    try:
-        response = s3.list_objects_v2(Bucket=VALIDATION_BUCKET, Prefix=f"executions/{execution_id}/")
-        if 'Contents' in response:
-            delete_objects = [{'Key': obj['Key']} for obj in response['Contents']]
-            s3.delete_objects(Bucket=VALIDATION_BUCKET, Delete={'Objects': delete_objects})
-    except Exception as e:
-        print(f"Cleanup error: {e}")
+def decimal_default(value: Any) -> Any:
+    """json.dumps hook for numbers read back from DynamoDB"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dispatch_execution(backend: ExecutionBackend, code: str, tests: List[str], execution_id: str,
+                       runner: str = 'pytest', known_passing: Optional[List[int]] = None,
+                       language: str = 'python') -> Any:
+    """Stage a submission and start (or queue) its run on backend
+    
+    Returns the backend's handle for waiting on the run.
+    """
+    return backend.dispatch(execution_id, build_execution_data(code, tests, runner, known_passing, language))
+
+
+def build_execution_data(code: str, tests: List[str], runner: str = 'pytest',
+                         known_passing: Optional[List[int]] = None, language: str = 'python') -> Dict[str, Any]:
+    """Input for validator_script.py, whichever backend runs it"""
+    return {
+        'code': code,
+        'tests': tests,
+        'language': language,
+        'runner': runner,
+        'knownPassing': known_passing or [],
+        'timestamp': int(time.time())
+    }
 
 
-def track_progress(user_id: str, lesson_id: str) -> None:
-    """Track lesson completion in DynamoDB"""
+def track_progress(user_id: str, lesson_id: Optional[str], execution_id: str, passed: bool,
+                   test_hashes: Dict[str, str], results: List[Dict[str, Any]],
+                   language: str = 'python') -> None:
+    """Record one attempt at a lesson and roll it into the user's summary
+    
+    The lesson item and the summary item are updated in one transaction.
+    Attempts and first-attempt success are counted up to the first
+    completion, and pass/fail per test hash is stored for the next
+    submission. Once a lesson is completed, or if this execution was
+    already recorded, the condition fails and neither item is written.
+    """
+    if not lesson_id or user_id == 'anonymous':
+        return
+    
+    # Cached results were skipped, not run: they never complete a lesson or
+    # carry a pass over to the next submission, which runs those tests again
+    if any(r.get('cached') for r in results):
+        passed = False
+    
+    now = int(time.time())
+    updates = [
+        'firstAttemptSuccess = if_not_exists(firstAttemptSuccess, :passed)',
+        'lastExecutionId = :execution',
+        'testResults = :results'
+    ]
+    values = {
+        ':passed': passed,
+        ':execution': execution_id,
+        ':results': {test_hashes[r['name']]: bool(r.get('passed'))
+                     for r in results if r.get('name') in test_hashes and not r.get('cached')},
+        ':one': 1
+    }
+    # Rendered by the progress views and projected into CompletedIndex
+    updates.append('#language = :language')
+    names = {'#language': 'language'}
+    values[':language'] = language
+    topic = lesson_topic(lesson_id)
+    if topic:
+        updates.append('#topic = :topic')
+        names['#topic'] = 'topic'
+        values[':topic'] = topic
+    if passed:
+        updates += ['#completed = :passed', '#status = :status', 'completedAt = :now']
+        names.update({'#completed': 'completed', '#status': 'status'})
+        values.update({':status': 'completed', ':now': now})
+    
+    lesson_update = {
+        'TableName': PROGRESS_TABLE,
+        'Key': {'userId': user_id, 'lessonId': lesson_id},
+        'UpdateExpression': f"SET {', '.join(updates)} ADD attempts :one",
+        'ConditionExpression': (
+            'attribute_not_exists(completedAt) AND '
+            '(attribute_not_exists(lastExecutionId) OR lastExecutionId <> :execution)'
+        ),
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values
+    }
+    
     try:
-        table = dynamodb.Table(PROGRESS_TABLE)
-        table.put_item(Item={
-            'userId': user_id,
-            'lessonId': lesson_id,
-            'completedAt': int(time.time()),
-            'status': 'completed'
-        })
+        # The resource's client serializes plain Python values, as Table methods do
+        dynamodb.meta.client.transact_write_items(TransactItems=[
+            {'Update': lesson_update},
+            {'Update': summary_update(user_id, lesson_id, passed, language, now)}
+        ])
+    except ClientError as e:
+        reasons = e.response.get('CancellationReasons', [])
+        if not any(reason.get('Code') == 'ConditionalCheckFailed' for reason in reasons):
+            print(f"Progress tracking error: {e}")
     except Exception as e:
         print(f"Progress tracking error: {e}")
 
 
+def summary_update(user_id: str, lesson_id: str, passed: bool, language: str, now: int) -> Dict[str, Any]:
+    """Update for the per-user progress summary item (see docs/dynamodb-schemas.md)
+    
+    Counters only ever ADD, so concurrent submissions never overwrite each
+    other; active days are a number set that streaks are computed from.
+    """
+    adds = ['totalAttempts :one', 'activeDays :day']
+    names = {}
+    values = {':one': 1, ':day': {now // 86400}, ':now': now, ':lesson': lesson_id}
+    
+    if passed:
+        adds += ['completedLessons :one', '#language :one']
+        names['#language'] = f'completedLanguage#{language}'
+        level = lesson_level(lesson_id)
+        if level:
+            adds.append('#level :one')
+            names['#level'] = f'completedLevel#{level}'
+    
+    update = {
+        'TableName': PROGRESS_TABLE,
+        'Key': summary_key(user_id),
+        'UpdateExpression': f"SET lastActivityAt = :now, lastLessonId = :lesson ADD {', '.join(adds)}",
+        'ExpressionAttributeValues': values
+    }
+    if names:
+        update['ExpressionAttributeNames'] = names
+    return update
+
+
+def summary_key(user_id: str) -> Dict[str, str]:
+    """The summary has its own partition, so lesson queries never return it"""
+    return {'userId': f'{user_id}#summary', 'lessonId': 'summary'}
+
+
+def lesson_level(lesson_id: str) -> Optional[str]:
+    """Level encoded in a lesson ID, if it has one"""
+    parts = lesson_id.split('_')
+    return parts[1] if len(parts) > 1 and parts[1] in LESSON_LEVELS else None
+
+
+def lesson_topic(lesson_id: str) -> Optional[str]:
+    """Topic encoded in a lesson ID (spaces were replaced with underscores), if it has one"""
+    parts = lesson_id.split('_')
+    if len(parts) < 4 or parts[1] not in LESSON_LEVELS or not parts[-1].isdigit():
+        return None
+    return ' '.join(parts[2:-1])
+
+
 def generate_feedback(results: List[Dict[str, Any]]) -> str:
     """Generate helpful feedback based on results"""
     passed_count = sum(1 for r in results if r.get('passed', False))
@@ -249,7 +539,7 @@ def cors_headers() -> Dict[str, str]:
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        'Access-Control-Allow-Methods': 'POST,OPTIONS'
+        'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
     }
 
 
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Progress tracking for streamed validations
+Triggered by the events table's DynamoDB stream; records progress as soon as
+the validator writes a run's 'done' event, so it counts even if the client
+stops polling GET .../events before it sees the result
+"""
+
+from typing import Dict, Any
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from handler import finish_streamed_execution
+
+deserializer = TypeDeserializer()
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Track progress for every 'done' event inserted in this batch of stream records"""
+    recorded = 0
+    
+    for record in event.get('Records', []):
+        if record.get('eventName') != 'INSERT':
+            continue
+        image = record['dynamodb'].get('NewImage', {})
+        item = {name: deserializer.deserialize(value) for name, value in image.items()}
+        if item.get('type') != 'done':
+            continue
+        
+        # Safe to repeat (stream retries, client reads): each execution is recorded once
+        finish_streamed_execution(item['executionId'], item)
+        recorded += 1
+    
+    return {'recorded': recorded}